@@ -13,7 +13,7 @@ class APIKeyService:
     async def create_key(self, project_id: int, data: APIKeyCreate) -> tuple[dict, str]:
         """Create a new API key"""
         # Verify project exists and is active
-        project = await self.project_repo.get_by_id(project_id)
+        project = await self.project_repo.get_metadata(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         if not project.is_active:
@@ -40,7 +40,7 @@ class APIKeyService:
     async def list_project_keys(self, project_id: int):
         """List all API keys for a project"""
         # Verify project exists
-        project = await self.project_repo.get_by_id(project_id)
+        project = await self.project_repo.get_metadata(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
@@ -49,7 +49,7 @@ class APIKeyService:
     async def deactivate_key(self, project_id: int, key_id: int):
         """Deactivate an API key"""
         # Verify project exists
-        project = await self.project_repo.get_by_id(project_id)
+        project = await self.project_repo.get_metadata(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
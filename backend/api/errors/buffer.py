@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+QUEUE_DEPTH = Gauge("ingest_buffer_queue_depth", "Errors waiting in the ingest buffer")
+FLUSHES = Counter("ingest_buffer_flushes_total", "Ingest buffer flushes")
+FLUSH_ERRORS = Counter("ingest_buffer_flush_errors_total", "Failed ingest buffer flushes")
+REJECTED = Counter("ingest_buffer_rejected_total", "Errors rejected because the buffer was full")
+FLUSH_SIZE = Histogram(
+    "ingest_buffer_flush_size",
+    "Errors written per ingest buffer flush",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+FLUSH_LATENCY = Histogram("ingest_buffer_flush_latency_seconds", "Time spent writing one ingest buffer batch")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class IngestBuffer(Generic[T, R]):
+    """
+    Write-behind buffer for ingested errors.
+    Requests enqueue an item and wait for its result; a single background
+    task drains the queue into batches that are flushed when they reach
+    ``flush_size`` items or when the oldest item is ``flush_interval``
+    seconds old. Each item's result is resolved once its batch is flushed.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], Awaitable[List[R]]],
+        flush_size: int,
+        flush_interval: float,
+        max_queue: int,
+    ):
+        self.flush = flush
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._collecting: List[Tuple[T, asyncio.Future]] = []
+        self._flushing: Optional[asyncio.Future] = None
+
+        QUEUE_DEPTH.set_function(lambda: self._queue.qsize() if self._queue else 0)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._collecting = []
+            self._flushing = None
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop accepting work and flush everything already queued"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if self._flushing is not None:
+            await self._flushing
+        batch, self._collecting = self._collecting, []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        for start in range(0, len(batch), self.flush_size):
+            await self._flush_batch(batch[start:start + self.flush_size])
+
+    async def submit(self, item: T) -> R:
+        """Enqueue an item and wait until it has been flushed"""
+        if self._task is None:
+            raise HTTPException(status_code=503, detail="Ingest buffer is not running")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            REJECTED.inc()
+            raise HTTPException(status_code=503, detail="Ingest buffer is full, retry later")
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Items are held on the instance so stop() can flush a partial batch
+            self._collecting = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(self._collecting) < self.flush_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._collecting.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._collecting = self._collecting, []
+            # Shielded so shutdown never abandons a batch halfway through
+            self._flushing = asyncio.ensure_future(self._flush_batch(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    async def _flush_batch(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        started = time.perf_counter()
+        try:
+            results = await self.flush(items)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(items)} buffered errors: {e}")
+            FLUSH_ERRORS.inc()
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            FLUSH_LATENCY.observe(time.perf_counter() - started)
+
+        FLUSHES.inc()
+        FLUSH_SIZE.observe(len(items))
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
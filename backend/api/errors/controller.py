@@ -1,29 +1,118 @@
 # api/errors/controller.py
 
-from fastapi import Depends, status, Path, HTTPException
+from typing import Optional
+
+from fastapi import Depends, status, Path, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.exceptions import RequestValidationError
 from fastapi_utils.inferring_router import InferringRouter
 from fastapi_utils.cbv import cbv
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.session import get_db_session
+from config import settings
+from db.session import get_db_session, read_session_factory
+from temporal_client import TemporalClientManager, get_temporal_client
 from api.auth import validate_api_key
-from .schema import ErrorPayload
+from api.filters import parse_tag_filters
+from api.pagination import NEXT_CURSOR_HEADER
+from .schema import ErrorPayload, RawErrorOut
 from .service import ErrorService
 
 router = InferringRouter(prefix="/projects/{project_id}/errors", tags=["errors"])
 
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+_payload_list_adapter = TypeAdapter(list[ErrorPayload])
+
+
+def _parse_error_batch(body: bytes, content_type: str) -> list[ErrorPayload]:
+    """Parse a JSON array or NDJSON body into error payloads"""
+    if content_type.split(";")[0].strip().lower() not in NDJSON_CONTENT_TYPES:
+        try:
+            return _payload_list_adapter.validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+
+    payloads = []
+    for line_no, line in enumerate(body.splitlines()):
+        if not line.strip():
+            continue
+        try:
+            payloads.append(ErrorPayload.model_validate_json(line))
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**error, "loc": ("body", line_no, *error["loc"])}
+                for error in e.errors(include_url=False)
+            ])
+    return payloads
+
+
 @cbv(router)
 class ErrorController:
     def __init__(
         self,
         session: AsyncSession = Depends(get_db_session),
+        temporal_client: TemporalClientManager = Depends(get_temporal_client),
     ):
-        self.service = ErrorService(session=session)
+        self.session = session
+        self.temporal_client = temporal_client
+        self.service = ErrorService(session=session, temporal_client=temporal_client)
+
+    def _read_service(self, read_session: AsyncSession) -> ErrorService:
+        """Service whose reads go to the replica; only read routes take the read session"""
+        return ErrorService(session=self.session, temporal_client=self.temporal_client, read_session=read_session)
 
-    @router.get("/", status_code=status.HTTP_200_OK)
-    async def get_errors(self, project_id: int = Path(..., description="Project ID")):
-        """Get errors for a specific project"""
-        return await self.service.get_errors(project_id)
+    @router.get("/", response_model=list[RawErrorOut], status_code=status.HTTP_200_OK)
+    async def get_errors(
+        self,
+        request: Request,
+        response: Response,
+        project_id: int = Path(..., description="Project ID"),
+        since: Optional[str] = Query(None, description="ISO datetime, inclusive"),
+        until: Optional[str] = Query(None, description="ISO datetime, inclusive"),
+        level: Optional[str] = Query(None, description="Filter by level"),
+        environment: Optional[str] = Query(None, description="Filter by environment"),
+        release: Optional[str] = Query(None, description="Filter by release"),
+        group: Optional[str] = Query(None, description="Filter by group fingerprint"),
+        q: Optional[str] = Query(None, min_length=1, max_length=200, description="Search message and exception text, best matches first"),
+        limit: int = Query(100, ge=1, le=1000, description="Number of errors to return"),
+        cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    ):
+        """
+        Get errors for a specific project, newest first.
+        Tag filters are given as tags[key]=value; all of them must match.
+        Pages are limited and chained through the X-Next-Cursor header.
+        With an NDJSON Accept header every matching error is streamed
+        instead, one JSON object per line, and limit is not applied.
+        The stream opens its own read session, so the read session is only
+        taken here on the paged branch.
+        """
+        filters = dict(
+            since=since,
+            until=until,
+            level=level,
+            environment=environment,
+            release=release,
+            group=group,
+            tags=parse_tag_filters(request.query_params),
+            q=q,
+            cursor=cursor,
+        )
+        
+        accept = request.headers.get("accept", "")
+        if any(content_type in accept for content_type in NDJSON_CONTENT_TYPES):
+            return StreamingResponse(
+                self.service.stream_errors(project_id, **filters),
+                media_type="application/x-ndjson",
+            )
+        
+        factory = await read_session_factory()
+        async with factory() as read_session:
+            errors, next_cursor = await self._read_service(read_session).get_errors(project_id, limit=limit, **filters)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return errors
 
     @router.post("/", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(validate_api_key)])
     async def ingest_error(
@@ -39,3 +128,26 @@ class ErrorController:
                 detail="Project ID in path must match project_id in payload"
             )
         return await self.service.ingest_error(payload)
+
+    @router.post("/batch", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(validate_api_key)])
+    async def ingest_error_batch(
+        self,
+        request: Request,
+        project_id: int = Path(..., description="Project ID")
+    ):
+        """Ingest a batch of errors sent as a JSON array or NDJSON"""
+        payloads = _parse_error_batch(await request.body(), request.headers.get("content-type", ""))
+        if not payloads:
+            raise HTTPException(status_code=400, detail="Batch must contain at least one error")
+        if len(payloads) > settings.ingest_batch_max_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch exceeds maximum size of {settings.ingest_batch_max_size} errors"
+            )
+        # Ensure project_id in path matches every payload
+        if any(payload.project_id != project_id for payload in payloads):
+            raise HTTPException(
+                status_code=400,
+                detail="Project ID in path must match project_id in every payload"
+            )
+        return await self.service.ingest_errors(project_id, payloads)
@@ -34,6 +34,42 @@ class ErrorFingerprinter:
         fingerprint_string = "|".join(filter(None, fingerprint_parts))
         return hashlib.md5(fingerprint_string.encode()).hexdigest()
     
+    def workflow_inputs(self, error: ErrorPayload) -> dict:
+        """
+        Extract the fields processing workflows read: those the
+        fingerprint, title, culprit and grouping key are derived from,
+        plus the tags and user identifiers counted per group. The full
+        payload stays in the raw_errors table.
+        """
+        return error.model_dump(
+            mode="json",
+            include={
+                "project_id": True,
+                "service": True,
+                "environment": True,
+                "message": True,
+                "level": True,
+                "exception": {"type": True, "value": True},
+                "tags": True,
+                "user": {"id": True, "ip_address": True},
+            },
+        )
+    
+    def generate_content_hash(self, error: ErrorPayload) -> str:
+        """
+        Generate a hash of the error's exact content.
+        Errors with the same hash in the same project are duplicates.
+        """
+        content_parts = [
+            error.service or "",
+            error.environment,
+            error.exception.type if error.exception else "",
+            error.exception.value if error.exception else "",
+            error.message,
+            error.stack_trace or "",
+        ]
+        return hashlib.md5("\x00".join(content_parts).encode()).hexdigest()
+    
     def generate_title(self, error: ErrorPayload) -> str:
         """
         Generate a human-readable title for the error group.
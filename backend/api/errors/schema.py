@@ -66,4 +66,48 @@ class ErrorPayload(BaseModel):
     # Legacy fields for backward compatibility
     error_type: Optional[str] = Field(None, description="Error type (legacy)")
     stack_trace: Optional[str] = Field(None, description="Stack trace as string (legacy)")
-    error_metadata: Optional[Dict[str, Any]] = Field(None, description="Error metadata (legacy)")
\ No newline at end of file
+    error_metadata: Optional[Dict[str, Any]] = Field(None, description="Error metadata (legacy)")
+
+class RawErrorOut(ErrorPayload):
+    """Stored error as returned by the listing endpoint"""
+    id: int
+    received_at: datetime
+    is_duplicate: bool = False
+
+    @classmethod
+    def from_model(cls, error) -> "RawErrorOut":
+        """Rebuild the nested payload structure from a RawError row"""
+        return cls(
+            id=error.id,
+            project_id=error.project_id,
+            service=error.service,
+            environment=error.environment,
+            message=error.message,
+            level=error.level,
+            exception=ExceptionInfo(
+                type=error.exception_type,
+                value=error.exception_value or "",
+                module=error.exception_module,
+            ) if error.exception_type else None,
+            tags=error.tags or {},
+            extra=error.extra or {},
+            user=UserContext(
+                id=error.user_id,
+                username=error.user_username,
+                email=error.user_email,
+                ip_address=error.user_ip,
+            ) if error.user_id or error.user_username or error.user_email or error.user_ip else None,
+            request=RequestContext(
+                method=error.request_method,
+                url=error.request_url,
+                headers=error.request_headers,
+                data=error.request_data,
+            ) if error.request_method or error.request_url else None,
+            timestamp=error.timestamp,
+            release=error.release,
+            error_type=error.error_type,
+            stack_trace=error.stack_trace,
+            error_metadata=error.error_metadata,
+            received_at=error.received_at,
+            is_duplicate=error.is_duplicate,
+        )
@@ -1,42 +1,158 @@
-from datetime import datetime, timedelta
-from temporalio.client import Client
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from db.repositories.errors import ErrorRepository
 from db.repositories.groups import GroupRepository
 from db.repositories.projects import ProjectRepository
-from .schema import ErrorPayload
+from db.repositories.workflows import PendingWorkflowStartRepository
+from .schema import ErrorPayload, RawErrorOut
+from .fingerprinting import ErrorFingerprinter
 from db.models.errors import RawError
+from db.models.workflows import PendingWorkflowStart
+from db.session import async_session, read_session_factory
+from cache.tenants import ProjectMetadata
+from config import settings
 from sqlalchemy.ext.asyncio import AsyncSession
 from temporal_config import temporal_settings
-from workflows.error_processing import ErrorProcessingWorkflow
+from temporal_client import TemporalClientManager, temporal_client as shared_temporal_client
+from .buffer import IngestBuffer
+from api.pagination import encode_cursor, decode_cursor
+from workflows.error_processing import (
+    ErrorProcessingWorkflow,
+    ErrorBatchProcessingWorkflow,
+    ErrorGroupProcessingWorkflow,
+)
 from fastapi import HTTPException
 
+logger = logging.getLogger(__name__)
+
 
 class ErrorService:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        temporal_client: TemporalClientManager,
+        read_session: Optional[AsyncSession] = None,
+    ):
+        self.temporal_client = temporal_client
         self.error_repository = ErrorRepository(session=session)
+        # Dashboard reads, on the replica when one is configured
+        self.error_read_repository = ErrorRepository(session=read_session or session)
         self.group_repository = GroupRepository(session=session)
         self.project_repository = ProjectRepository(session=session)
+        self.pending_start_repository = PendingWorkflowStartRepository(session=session)
+        self.fingerprinter = ErrorFingerprinter()
+        
+    def _error_filters(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        level: Optional[str] = None,
+        environment: Optional[str] = None,
+        release: Optional[str] = None,
+        group: Optional[str] = None,
+        tags: Optional[Dict[str, str]] = None,
+        q: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Validate listing filters into ErrorRepository query arguments"""
+        since_dt = None
+        until_dt = None
+        if since:
+            try:
+                since_dt = datetime.fromisoformat(since.replace('Z', '+00:00'))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid since date format")
+        if until:
+            try:
+                until_dt = datetime.fromisoformat(until.replace('Z', '+00:00'))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid until date format")
+        
+        return dict(
+            since=since_dt,
+            until=until_dt,
+            level=level,
+            environment=environment,
+            release=release,
+            group_fingerprint=group,
+            tags=tags,
+            q=q,
+            # Search results are ordered by rank first
+            cursor=decode_cursor(cursor, (float, datetime, int) if q else (datetime, int)) if cursor else None,
+        )
+
+    async def get_errors(
+        self,
+        project_id: int,
+        limit: int = 100,
+        **filters
+    ) -> Tuple[List[RawErrorOut], Optional[str]]:
+        """Get one page of errors for a project, returning the cursor of the next page"""
+        query_filters = self._error_filters(**filters)
+        errors = await self.error_read_repository.get_errors_by_project(project_id, limit=limit, **query_filters)
         
-    async def get_errors(self, project_id: int):
-        """Get errors for a specific project"""
-        errors = await self.error_repository.get_errors_by_project(project_id)
-        return [ErrorPayload(**error.model_dump()) for error in errors]
+        # A full page means there may be more errors after it
+        next_cursor = None
+        if len(errors) == limit:
+            last = errors[-1]
+            if query_filters["q"]:
+                next_cursor = encode_cursor(last.search_rank, last.timestamp, last.id)
+            else:
+                next_cursor = encode_cursor(last.timestamp, last.id)
+        return [RawErrorOut.from_model(error) for error in errors], next_cursor
 
-    async def ingest_error(self, payload: ErrorPayload):
-        # Verify project exists and is active
-        project = await self.project_repository.get_by_id(payload.project_id)
+    def stream_errors(self, project_id: int, **filters) -> AsyncIterator[str]:
+        """
+        Stream every matching error as NDJSON.
+        Filters are validated up front so bad input still gets a 400; the
+        rows are read on a session owned by the stream, since the request's
+        session is closed before a streaming response is sent.
+        """
+        query_filters = self._error_filters(**filters)
+        
+        async def lines() -> AsyncIterator[str]:
+            factory = await read_session_factory()
+            async with factory() as session:
+                repository = ErrorRepository(session=session)
+                async for error in repository.stream_errors_by_project(
+                    project_id, chunk_size=settings.raw_error_stream_chunk_size, **query_filters
+                ):
+                    yield RawErrorOut.from_model(error).model_dump_json() + "\n"
+        
+        return lines()
+
+    async def _get_active_project(self, project_id: int) -> ProjectMetadata:
+        """Verify project exists and is active"""
+        project = await self.project_repository.get_metadata(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         if not project.is_active:
             raise HTTPException(status_code=400, detail="Project is not active")
+        return project
 
-        # Calculate expiration based on project retention
-        expires_at = None
+    def _expires_at(self, project: ProjectMetadata) -> Optional[datetime]:
+        """Calculate expiration based on project retention"""
         if project.retention_days > 0:
-            expires_at = datetime.utcnow() + timedelta(days=project.retention_days)
+            return datetime.utcnow() + timedelta(days=project.retention_days)
+        return None
 
-        # Create raw error record
-        raw_error = RawError(
+    def _raw_error_values(
+        self,
+        payload: ErrorPayload,
+        project: ProjectMetadata,
+        expires_at: Optional[datetime],
+    ) -> Dict[str, Any]:
+        """Map an ingested payload onto RawError column values"""
+        received_at = datetime.now(timezone.utc)
+        timestamp = payload.timestamp or received_at
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return dict(
+            # Partition key, set here so workflows can be given it
+            received_at=received_at,
+            
             # Project info
             project_id=payload.project_id,
             service=payload.service or project.name,
@@ -67,8 +183,9 @@ class ErrorService:
             request_headers=payload.request.headers if payload.request else None,
             request_data=payload.request.data if payload.request else None,
             
-            # Metadata
-            timestamp=payload.timestamp or datetime.utcnow(),
+            # Metadata. Timestamps from clocks running ahead are clamped to
+            # received_at, so a timestamp bound also bounds received_at
+            timestamp=min(timestamp, received_at),
             release=payload.release,
             expires_at=expires_at,
             
@@ -76,28 +193,197 @@ class ErrorService:
             error_type=payload.error_type,
             stack_trace=payload.stack_trace,
             error_metadata=payload.error_metadata,
+            
+            # Deduplication
+            content_hash=self.fingerprinter.generate_content_hash(payload),
         )
+
+    async def ingest_error(self, payload: ErrorPayload):
+        project = await self._get_active_project(payload.project_id)
+
+        if ingest_buffer.running:
+            # Resolves once the buffered row has been flushed to the database
+            values = self._raw_error_values(payload, project, self._expires_at(project))
+            return await ingest_buffer.submit((values, payload))
+
+        # Create raw error record
+        raw_error = RawError(**self._raw_error_values(payload, project, self._expires_at(project)))
         
         # Save the error
         await self.error_repository.ingest_error(raw_error)
         
-        # Start Temporal workflow
-        client = await Client.connect(temporal_settings.host_port)
+        if settings.processing_coalesce_enabled:
+            results = await self.signal_group_workflows([raw_error.id], [raw_error.received_at], [payload])
+            return results[0]
         
+        # Start Temporal workflow
         error_data = {
             "raw_error_id": raw_error.id,
-            "payload": payload.model_dump(),
+            "raw_error_received_at": raw_error.received_at.isoformat(),
+            "payload": self.fingerprinter.workflow_inputs(payload),
+            "mode": settings.processing_mode,
         }
         
-        workflow_handle = await client.start_workflow(
-            ErrorProcessingWorkflow.run,
-            error_data,
-            id=f"error-processing-{raw_error.id}",
-            task_queue=temporal_settings.task_queue,
-        )
+        started = await self._start_workflows([
+            dict(workflow=ErrorProcessingWorkflow, arg=error_data, id=f"error-processing-{raw_error.id}"),
+        ])
         
+        return {"raw_error_id": raw_error.id, **started[0]}
+
+    async def ingest_errors(self, project_id: int, payloads: List[ErrorPayload]):
+        """Ingest a batch of errors with one INSERT and one processing workflow"""
+        project = await self._get_active_project(project_id)
+        expires_at = self._expires_at(project)
+
+        results = await self.persist_batch(
+            [self._raw_error_values(payload, project, expires_at) for payload in payloads],
+            payloads,
+        )
+
         return {
-            "raw_error_id": raw_error.id,
-            "workflow_id": workflow_handle.id,
-            "workflow_run_id": workflow_handle.run_id
+            "raw_error_ids": [result["raw_error_id"] for result in results],
+            "workflow_id": results[0]["workflow_id"],
+            "workflow_run_id": results[0]["workflow_run_id"]
         }
+
+    async def persist_batch(
+        self,
+        values: List[Dict[str, Any]],
+        payloads: List[ErrorPayload],
+    ) -> List[Dict[str, Any]]:
+        """Insert already validated rows and start one processing workflow for them"""
+        raw_error_ids = await self.error_repository.ingest_errors(values)
+        received_ats = [row["received_at"] for row in values]
+
+        if settings.processing_coalesce_enabled:
+            return await self.signal_group_workflows(raw_error_ids, received_ats, payloads)
+
+        batch_data = {
+            "errors": [
+                {
+                    "raw_error_id": raw_error_id,
+                    "raw_error_received_at": received_at.isoformat(),
+                    "payload": self.fingerprinter.workflow_inputs(payload),
+                }
+                for raw_error_id, received_at, payload in zip(raw_error_ids, received_ats, payloads)
+            ],
+            "mode": settings.processing_mode,
+        }
+
+        started = await self._start_workflows([
+            dict(
+                workflow=ErrorBatchProcessingWorkflow,
+                arg=batch_data,
+                id=f"error-batch-processing-{raw_error_ids[0]}-{len(raw_error_ids)}",
+            ),
+        ])
+
+        return [{"raw_error_id": raw_error_id, **started[0]} for raw_error_id in raw_error_ids]
+
+    async def signal_group_workflows(
+        self,
+        raw_error_ids: List[int],
+        received_ats: List[datetime],
+        payloads: List[ErrorPayload],
+    ) -> List[Dict[str, Any]]:
+        """Signal saved errors into their group's workflow, starting it if it is not running"""
+        errors_by_fingerprint: Dict[str, List[Dict[str, Any]]] = {}
+        fingerprints = []
+        for raw_error_id, received_at, payload in zip(raw_error_ids, received_ats, payloads):
+            fingerprint = self.fingerprinter.generate_fingerprint(payload)
+            fingerprints.append(fingerprint)
+            errors_by_fingerprint.setdefault(fingerprint, []).append({
+                "raw_error_id": raw_error_id,
+                "raw_error_received_at": received_at.isoformat(),
+                "payload": self.fingerprinter.workflow_inputs(payload),
+            })
+
+        started = await self._start_workflows([
+            dict(
+                workflow=ErrorGroupProcessingWorkflow,
+                arg={
+                    "fingerprint": fingerprint,
+                    "window_seconds": settings.processing_coalesce_window_seconds,
+                    "windows_per_run": settings.processing_coalesce_windows_per_run,
+                    "idle_timeout_seconds": settings.processing_coalesce_idle_timeout_seconds,
+                },
+                id=f"error-group-{fingerprint}",
+                start_signal="add_errors",
+                start_signal_args=[errors],
+            )
+            for fingerprint, errors in errors_by_fingerprint.items()
+        ])
+        started_by_fingerprint = dict(zip(errors_by_fingerprint, started))
+
+        return [
+            {"raw_error_id": raw_error_id, **started_by_fingerprint[fingerprint]}
+            for raw_error_id, fingerprint in zip(raw_error_ids, fingerprints)
+        ]
+
+    async def _start_workflows(self, starts: List[Dict[str, Any]]) -> List[Dict[str, Optional[str]]]:
+        """
+        Start processing workflows for errors that are already committed.
+        Each start gives workflow (the class), arg, id and optionally
+        start_signal / start_signal_args. Starts that fail are saved to
+        pending_workflow_starts and re-driven by the worker, so the errors
+        are still processed and the client is not asked to send them
+        again; their run ID is None. The errors are committed either way,
+        so a failed save is logged rather than failing the request.
+        """
+        outcomes = await asyncio.gather(*[
+            self.temporal_client.start_workflow(
+                start["workflow"].run,
+                start["arg"],
+                id=start["id"],
+                task_queue=temporal_settings.task_queue,
+                start_signal=start.get("start_signal"),
+                start_signal_args=start.get("start_signal_args", []),
+            )
+            for start in starts
+        ], return_exceptions=True)
+
+        started = []
+        pending = []
+        for start, outcome in zip(starts, outcomes):
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome
+                logger.warning(f"Could not start workflow {start['id']}, saving it for re-drive: {outcome!r}")
+                pending.append(PendingWorkflowStart(
+                    workflow=start["workflow"].__name__,
+                    workflow_id=start["id"],
+                    task_queue=temporal_settings.task_queue,
+                    arg=start["arg"],
+                    start_signal=start.get("start_signal"),
+                    start_signal_args=start.get("start_signal_args"),
+                ))
+                started.append({"workflow_id": start["id"], "workflow_run_id": None})
+            else:
+                started.append({"workflow_id": outcome.id, "workflow_run_id": outcome.run_id})
+
+        if pending:
+            try:
+                await self.pending_start_repository.record(pending)
+            except Exception:
+                logger.exception(
+                    f"Could not save workflow starts for re-drive: {[start.workflow_id for start in pending]}"
+                )
+        return started
+
+
+async def flush_buffered_errors(items: List[Tuple[Dict[str, Any], ErrorPayload]]) -> List[Dict[str, Any]]:
+    """Write one batch from the ingest buffer using its own session"""
+    async with async_session() as session:
+        service = ErrorService(session=session, temporal_client=shared_temporal_client)
+        return await service.persist_batch(
+            [values for values, _ in items],
+            [payload for _, payload in items],
+        )
+
+
+ingest_buffer: IngestBuffer = IngestBuffer(
+    flush=flush_buffered_errors,
+    flush_size=settings.ingest_buffer_flush_size,
+    flush_interval=settings.ingest_buffer_flush_interval_seconds,
+    max_queue=settings.ingest_buffer_max_queue,
+)
@@ -0,0 +1,28 @@
+import re
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+from starlette.datastructures import QueryParams
+
+MAX_TAG_FILTERS = 10
+
+_TAG_PARAM = re.compile(r"^tags\[(.+)\]$")
+
+
+def parse_tag_filters(query_params: QueryParams) -> Optional[Dict[str, str]]:
+    """
+    Collect ``tags[key]=value`` query parameters into the tags every
+    result must carry. None when no tag filter is given.
+    """
+    tags: Dict[str, str] = {}
+    for name, value in query_params.multi_items():
+        match = _TAG_PARAM.match(name)
+        if match is None:
+            continue
+        key = match.group(1)
+        if key in tags and tags[key] != value:
+            raise HTTPException(status_code=400, detail=f"Conflicting values for tag {key}")
+        tags[key] = value
+    if len(tags) > MAX_TAG_FILTERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_TAG_FILTERS} tag filters are allowed")
+    return tags or None
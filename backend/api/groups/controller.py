@@ -1,52 +1,141 @@
-from fastapi import status, Depends, Query, Path
+from fastapi import status, Depends, Query, Path, Request, Response
 from fastapi_utils.inferring_router import InferringRouter
 from fastapi_utils.cbv import cbv
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from db.session import get_db_session
+from db.session import get_db_session, get_read_session
 from api.groups.service import GroupService
-from api.groups.schema import GroupOut, GroupDetailOut, GroupStatusUpdate, GroupStats
+from api.groups.schema import GroupOut, GroupDetailOut, GroupEventOut, GroupStatusUpdate, GroupStats, GroupTagOut
+from api.filters import parse_tag_filters
+from api.pagination import NEXT_CURSOR_HEADER
 
 router = InferringRouter(prefix="/projects/{project_id}/groups", tags=["groups"])
 
 @cbv(router)
 class GroupController:
-    def __init__(self, session: AsyncSession = Depends(get_db_session)):
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_db_session),
+    ):
+        self.session = session
         self.service = GroupService(session=session)
 
+    def _read_service(self, read_session: AsyncSession) -> GroupService:
+        """Service whose reads go to the replica; only read routes take the read session"""
+        return GroupService(session=self.session, read_session=read_session)
+
     @router.get("/", response_model=list[GroupOut], status_code=status.HTTP_200_OK)
     async def list_groups(
         self,
+        request: Request,
+        response: Response,
         project_id: int = Path(..., description="Project ID"),
         service: Optional[str] = Query(None, description="Filter by service name"),
         environment: Optional[str] = Query(None, description="Filter by environment"),
         status: Optional[str] = Query(None, description="Filter by status (unresolved, resolved, ignored)"),
         since: Optional[str] = Query(None, description="ISO datetime, inclusive"),
         until: Optional[str] = Query(None, description="ISO datetime, inclusive"),
+        q: Optional[str] = Query(None, min_length=1, max_length=200, description="Search titles and messages, best matches first"),
         limit: int = Query(100, ge=1, le=1000, description="Number of groups to return"),
-        offset: int = Query(0, ge=0, description="Number of groups to skip")
+        offset: int = Query(0, ge=0, description="Number of groups to skip (ignored with cursor)"),
+        cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+        read_session: AsyncSession = Depends(get_read_session),
     ):
-        """List error groups with enhanced filtering"""
-        return await self.service.list_groups(
+        """
+        List error groups with enhanced filtering.
+        Tag filters are given as tags[key]=value and must all match one
+        error of the group. When more groups may follow, the cursor for the next page is
+        returned in the X-Next-Cursor response header.
+        """
+        groups, next_cursor = await self._read_service(read_session).list_groups(
             project_id=project_id,
             service=service,
             environment=environment,
             status=status,
             since=since,
             until=until,
+            tags=parse_tag_filters(request.query_params),
+            q=q,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
+        )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return groups
+
+    @router.get("/stats", response_model=GroupStats, status_code=status.HTTP_200_OK)
+    async def get_group_stats(
+        self,
+        project_id: int = Path(..., description="Project ID"),
+        service: Optional[str] = Query(None, description="Filter by service name"),
+        environment: Optional[str] = Query(None, description="Filter by environment"),
+        since: Optional[str] = Query(None, description="ISO datetime, inclusive"),
+        until: Optional[str] = Query(None, description="ISO datetime, inclusive"),
+        read_session: AsyncSession = Depends(get_read_session),
+    ):
+        """Get error group statistics"""
+        return await self._read_service(read_session).get_group_stats(
+            project_id=project_id,
+            service=service,
+            environment=environment,
+            since=since,
+            until=until
         )
 
     @router.get("/{fingerprint}", response_model=GroupDetailOut, status_code=status.HTTP_200_OK)
     async def get_group(
         self,
         project_id: int = Path(..., description="Project ID"),
-        fingerprint: str = Path(..., description="Group fingerprint")
+        fingerprint: str = Path(..., description="Group fingerprint"),
+        read_session: AsyncSession = Depends(get_read_session),
     ):
         """Get error group details by fingerprint"""
-        return await self.service.get_group(project_id, fingerprint)
+        return await self._read_service(read_session).get_group(project_id, fingerprint)
+    
+    @router.get("/{fingerprint}/events", response_model=list[GroupEventOut], status_code=status.HTTP_200_OK)
+    async def list_group_events(
+        self,
+        response: Response,
+        project_id: int = Path(..., description="Project ID"),
+        fingerprint: str = Path(..., description="Group fingerprint"),
+        limit: int = Query(50, ge=1, le=500, description="Number of events to return"),
+        cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+        include_context: bool = Query(False, description="Include tags, extra and request context"),
+        read_session: AsyncSession = Depends(get_read_session),
+    ):
+        """
+        List the events of a group, newest first, with a summary of each
+        raw error. When more events may follow, the cursor for the next
+        page is returned in the X-Next-Cursor response header.
+        """
+        events, next_cursor = await self._read_service(read_session).list_group_events(
+            project_id,
+            fingerprint,
+            limit=limit,
+            cursor=cursor,
+            include_context=include_context
+        )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return events
+    
+    @router.get("/{fingerprint}/tags", response_model=list[GroupTagOut], status_code=status.HTTP_200_OK)
+    async def get_group_tags(
+        self,
+        project_id: int = Path(..., description="Project ID"),
+        fingerprint: str = Path(..., description="Group fingerprint"),
+        key: Optional[str] = Query(None, description="Only this tag key"),
+        limit: int = Query(10, ge=1, le=100, description="Values to return per tag key"),
+        read_session: AsyncSession = Depends(get_read_session),
+    ):
+        """
+        Get the most frequent values of each tag key of a group.
+        Counts come from a capped per-key sketch: they never undercount,
+        and each is at most its error field above the true count.
+        """
+        return await self._read_service(read_session).get_group_tags(project_id, fingerprint, key=key, limit=limit)
     
     @router.put("/{fingerprint}/status", response_model=GroupOut, status_code=status.HTTP_200_OK)
     async def update_group_status(
@@ -57,21 +146,3 @@ class GroupController:
     ):
         """Update the status of an error group"""
         return await self.service.update_group_status(project_id, fingerprint, status_update.status)
-    
-    @router.get("/stats", response_model=GroupStats, status_code=status.HTTP_200_OK)
-    async def get_group_stats(
-        self,
-        project_id: int = Path(..., description="Project ID"),
-        service: Optional[str] = Query(None, description="Filter by service name"),
-        environment: Optional[str] = Query(None, description="Filter by environment"),
-        since: Optional[str] = Query(None, description="ISO datetime, inclusive"),
-        until: Optional[str] = Query(None, description="ISO datetime, inclusive")
-    ):
-        """Get error group statistics"""
-        return await self.service.get_group_stats(
-            project_id=project_id,
-            service=service,
-            environment=environment,
-            since=since,
-            until=until
-        )
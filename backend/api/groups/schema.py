@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from enum import Enum
 
 
@@ -41,9 +41,37 @@ class GroupOut(GroupBase):
     """Used for listing groups"""
 
 
+class GroupEventOut(BaseModel):
+    """One event of a group with a summary of its raw error"""
+    id: int
+    timestamp: datetime
+    event_type: str
+    raw_error_id: int
+    
+    # Raw error summary, None once the raw error has expired
+    service: Optional[str] = None
+    environment: Optional[str] = None
+    release: Optional[str] = None
+    level: Optional[str] = None
+    message: Optional[str] = None
+    exception_type: Optional[str] = None
+    exception_value: Optional[str] = None
+    user_id: Optional[str] = None
+    received_at: Optional[datetime] = None
+    
+    # Context, only filled when requested
+    tags: Optional[Dict[str, str]] = None
+    extra: Optional[Dict[str, Any]] = None
+    request_method: Optional[str] = None
+    request_url: Optional[str] = None
+    request_headers: Optional[Dict[str, str]] = None
+    request_data: Optional[Any] = None
+
+
 class GroupDetailOut(GroupBase):
     """Same fields plus recent raw events"""
-    recent_events: Optional[List[dict]] = None
+    recent_events: Optional[List[GroupEventOut]] = None
+    users_last_24h: int = Field(0, description="Estimated distinct users in the last 24 hours")
 
 
 class GroupStatusUpdate(BaseModel):
@@ -56,3 +84,19 @@ class GroupStats(BaseModel):
     total_groups: int
     unresolved_groups: int
     resolved_groups: int
+    total_events: int = 0
+
+
+class TagValueOut(BaseModel):
+    """One tracked value of a tag"""
+    value: str
+    count: int = Field(..., description="Events with this value, possibly overcounted by up to error")
+    error: int = Field(0, description="Upper bound of the overcount")
+    first_seen: datetime
+    last_seen: datetime
+
+
+class GroupTagOut(BaseModel):
+    """Most frequent values of one tag key in a group"""
+    key: str
+    values: List[TagValueOut]
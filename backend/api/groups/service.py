@@ -1,20 +1,26 @@
-from datetime import datetime
-from typing import Optional, List
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, List, Tuple
 from db.repositories.groups import GroupRepository
 from db.repositories.projects import ProjectRepository
+from db.repositories.tag_values import TagValueRepository
 from db.models.groups import GroupStatus
-from api.groups.schema import GroupOut, GroupDetailOut
+from api.groups.schema import GroupOut, GroupDetailOut, GroupEventOut, GroupTagOut, TagValueOut
+from api.pagination import encode_cursor, decode_cursor
+from config import settings
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 class GroupService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
         self.repo = GroupRepository(session=session)
+        # Dashboard reads, on the replica when one is configured
+        self.read_repo = GroupRepository(session=read_session or session)
+        self.tag_value_repo = TagValueRepository(session=read_session or session)
         self.project_repo = ProjectRepository(session=session)
 
     async def _verify_project(self, project_id: int) -> None:
         """Verify project exists and is active"""
-        project = await self.project_repo.get_by_id(project_id)
+        project = await self.project_repo.get_metadata(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         if not project.is_active:
@@ -28,10 +34,13 @@ class GroupService:
         status: Optional[str] = None,
         since: Optional[str] = None, 
         until: Optional[str] = None,
+        tags: Optional[Dict[str, str]] = None,
+        q: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> List[GroupOut]:
-        """List error groups with enhanced filtering"""
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[GroupOut], Optional[str]]:
+        """List error groups with enhanced filtering, returning the cursor of the next page"""
         await self._verify_project(project_id)
         
         # Parse datetime strings
@@ -56,29 +65,96 @@ class GroupService:
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid status")
         
-        groups = await self.repo.list(
+        groups = await self.read_repo.list(
             project_id=project_id,
             service=service,
             environment=environment,
             status=status_enum,
             since=since_dt,
             until=until_dt,
+            tags=tags,
+            q=q,
             limit=limit,
-            offset=offset
+            offset=offset,
+            # Search results are ordered by rank first
+            cursor=decode_cursor(cursor, (float, datetime, int) if q else (datetime, int)) if cursor else None
         )
-        return [GroupOut(**g.model_dump()) for g in groups]
+        
+        # A full page means there may be more groups after it
+        next_cursor = None
+        if len(groups) == limit:
+            last = groups[-1]
+            if q:
+                next_cursor = encode_cursor(last.search_rank, last.last_seen, last.id)
+            else:
+                next_cursor = encode_cursor(last.last_seen, last.id)
+        return [GroupOut(**g.model_dump()) for g in groups], next_cursor
 
     async def get_group(self, project_id: int, fingerprint: str) -> GroupDetailOut:
         """Get error group by fingerprint"""
         await self._verify_project(project_id)
         
-        group = await self.repo.get_by_fingerprint(project_id, fingerprint)
+        group = await self.read_repo.get_by_fingerprint(project_id, fingerprint)
+        if not group:
+            raise HTTPException(status_code=404, detail="Group not found")
+        
+        recent_events = await self.read_repo.list_events(group.fingerprint, limit=settings.group_recent_events)
+        users_last_24h = await self.read_repo.count_unique_users(
+            group.id, since=datetime.now(timezone.utc) - timedelta(days=1)
+        )
+        return GroupDetailOut(
+            **group.model_dump(),
+            recent_events=[GroupEventOut(**event) for event in recent_events],
+            users_last_24h=users_last_24h
+        )
+    
+    async def list_group_events(
+        self,
+        project_id: int,
+        fingerprint: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_context: bool = False
+    ) -> Tuple[List[GroupEventOut], Optional[str]]:
+        """List the events of a group newest first, returning the cursor of the next page"""
+        await self._verify_project(project_id)
+        
+        group = await self.read_repo.get_by_fingerprint(project_id, fingerprint)
+        if not group:
+            raise HTTPException(status_code=404, detail="Group not found")
+        
+        events = await self.read_repo.list_events(
+            group.fingerprint,
+            limit=limit,
+            cursor=decode_cursor(cursor, (datetime, int)) if cursor else None,
+            include_context=include_context
+        )
+        
+        # A full page means there may be more events after it
+        next_cursor = None
+        if len(events) == limit:
+            next_cursor = encode_cursor(events[-1]["timestamp"], events[-1]["id"])
+        return [GroupEventOut(**event) for event in events], next_cursor
+    
+    async def get_group_tags(
+        self,
+        project_id: int,
+        fingerprint: str,
+        key: Optional[str] = None,
+        limit: int = 10
+    ) -> List[GroupTagOut]:
+        """Get the most frequent values of each tag key of a group"""
+        await self._verify_project(project_id)
+        
+        group = await self.read_repo.get_by_fingerprint(project_id, fingerprint)
         if not group:
             raise HTTPException(status_code=404, detail="Group not found")
         
-        # For MVP, we'll leave recent_events empty
-        # In a full implementation, you'd fetch recent errors for this group
-        return GroupDetailOut(**group.model_dump())
+        tags: Dict[str, GroupTagOut] = {}
+        for tag_value in await self.tag_value_repo.top_values(group.id, key=key, limit=limit):
+            tag = tags.setdefault(tag_value.key, GroupTagOut(key=tag_value.key, values=[]))
+            tag.values.append(TagValueOut(**tag_value.model_dump()))
+        return list(tags.values())
     
     async def update_group_status(self, project_id: int, fingerprint: str, status: str) -> GroupOut:
         """Update the status of an error group"""
@@ -121,7 +197,7 @@ class GroupService:
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid until date format")
         
-        return await self.repo.get_stats(
+        return await self.read_repo.get_stats(
             project_id=project_id,
             service=service,
             environment=environment,
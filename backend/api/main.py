@@ -4,7 +4,13 @@ import logging
 import pkgutil
 import importlib
 import pathlib
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from temporal_client import temporal_client
+from cache.api_keys import api_key_usage
+from config import settings
+from api.errors.service import ingest_buffer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -54,9 +60,41 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["health"])
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.on_event("startup")
 async def list_routes():
     for route in app.routes:
         if hasattr(route, "methods"):
             methods = ",".join(route.methods)
             logger.info(f"🛣️  {methods:10s} -> {route.path}")
+
+
+@app.on_event("startup")
+async def start_api_key_usage_flush():
+    api_key_usage.start()
+
+
+@app.on_event("startup")
+async def start_ingest_buffer():
+    if settings.ingest_buffer_enabled:
+        ingest_buffer.start()
+
+
+@app.on_event("shutdown")
+async def stop_ingest_buffer():
+    # Flush buffered errors before the Temporal client goes away
+    await ingest_buffer.stop()
+
+
+@app.on_event("shutdown")
+async def close_temporal_client():
+    await temporal_client.close()
+
+
+@app.on_event("shutdown")
+async def stop_api_key_usage_flush():
+    await api_key_usage.stop()
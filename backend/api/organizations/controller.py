@@ -3,7 +3,7 @@ from fastapi_utils.inferring_router import InferringRouter
 from fastapi_utils.cbv import cbv
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.session import get_db_session
+from db.session import get_db_session, get_read_session
 from .service import OrganizationService
 from .schema import OrganizationCreate, OrganizationUpdate, OrganizationOut
 
@@ -11,27 +11,40 @@ router = InferringRouter(prefix="/organizations", tags=["organizations"])
 
 @cbv(router)
 class OrganizationController:
-    def __init__(self, session: AsyncSession = Depends(get_db_session)):
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_db_session),
+    ):
+        self.session = session
         self.service = OrganizationService(session=session)
 
+    def _read_service(self, read_session: AsyncSession) -> OrganizationService:
+        """Service whose reads go to the replica; only read routes take the read session"""
+        return OrganizationService(session=self.session, read_session=read_session)
+
     @router.post("/", response_model=OrganizationOut, status_code=status.HTTP_201_CREATED)
     async def create_organization(self, data: OrganizationCreate):
         """Create a new organization"""
         return await self.service.create_organization(data)
 
     @router.get("/{org_id}", response_model=OrganizationOut)
-    async def get_organization(self, org_id: int = Path(..., description="Organization ID")):
+    async def get_organization(
+        self,
+        org_id: int = Path(..., description="Organization ID"),
+        read_session: AsyncSession = Depends(get_read_session),
+    ):
         """Get organization by ID"""
-        return await self.service.get_organization(org_id)
+        return await self._read_service(read_session).get_organization(org_id)
 
     @router.get("/", response_model=list[OrganizationOut])
     async def list_organizations(
         self,
         limit: int = Query(100, ge=1, le=1000, description="Number of organizations to return"),
-        offset: int = Query(0, ge=0, description="Number of organizations to skip")
+        offset: int = Query(0, ge=0, description="Number of organizations to skip"),
+        read_session: AsyncSession = Depends(get_read_session),
     ):
         """List active organizations"""
-        return await self.service.list_organizations(limit=limit, offset=offset)
+        return await self._read_service(read_session).list_organizations(limit=limit, offset=offset)
 
     @router.patch("/{org_id}", response_model=OrganizationOut)
     async def update_organization(
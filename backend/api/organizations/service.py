@@ -1,14 +1,18 @@
+from typing import Optional
 from uuid import UUID
 from slugify import slugify
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from db.repositories.organizations import OrganizationRepository
+from cache.tenants import organization_cache
 from .schema import OrganizationCreate, OrganizationOut, OrganizationUpdate
 
 
 class OrganizationService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
         self.repo = OrganizationRepository(session=session)
+        # Dashboard reads, on the replica when one is configured
+        self.read_repo = OrganizationRepository(session=read_session or session)
 
     async def create_organization(self, data: OrganizationCreate) -> OrganizationOut:
         """Create a new organization"""
@@ -21,18 +25,19 @@ class OrganizationService:
             raise HTTPException(status_code=400, detail="Organization slug already exists")
         
         org = await self.repo.create(name=data.name, slug=slug)
+        organization_cache.invalidate(org.id)
         return OrganizationOut.model_validate(org)
 
     async def get_organization(self, org_id: int):
         """Get organization by ID"""
-        org = await self.repo.get_by_id(org_id)
+        org = await self.read_repo.get_by_id(org_id)
         if not org:
             raise HTTPException(status_code=404, detail="Organization not found")
         return org
 
     async def list_organizations(self, limit: int = 100, offset: int = 0):
         """List active organizations"""
-        return await self.repo.list_active(limit=limit, offset=offset)
+        return await self.read_repo.list_active(limit=limit, offset=offset)
 
     async def update_organization(self, org_id: int, data: OrganizationUpdate):
         """Update organization details"""
@@ -50,4 +55,5 @@ class OrganizationService:
                 raise HTTPException(status_code=400, detail="Organization slug already exists")
         
         updated_org = await self.repo.update(org_id, **update_data)
+        organization_cache.invalidate(org_id)
         return updated_org 
\ No newline at end of file
@@ -3,7 +3,7 @@ from fastapi_utils.inferring_router import InferringRouter
 from fastapi_utils.cbv import cbv
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.session import get_db_session
+from db.session import get_db_session, get_read_session
 from .service import ProjectService
 from .schema import ProjectCreate, ProjectUpdate, ProjectOut
 
@@ -11,9 +11,17 @@ router = InferringRouter(prefix="/organizations/{org_id}/projects", tags=["proje
 
 @cbv(router)
 class ProjectController:
-    def __init__(self, session: AsyncSession = Depends(get_db_session)):
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_db_session),
+    ):
+        self.session = session
         self.service = ProjectService(session=session)
 
+    def _read_service(self, read_session: AsyncSession) -> ProjectService:
+        """Service whose reads go to the replica; only read routes take the read session"""
+        return ProjectService(session=self.session, read_session=read_session)
+
     @router.post("/", response_model=ProjectOut, status_code=status.HTTP_201_CREATED)
     async def create_project(
         self,
@@ -27,18 +35,20 @@ class ProjectController:
     async def get_project(
         self,
         org_id: int = Path(..., description="Organization ID"),
-        project_id: int = Path(..., description="Project ID")
+        project_id: int = Path(..., description="Project ID"),
+        read_session: AsyncSession = Depends(get_read_session),
     ):
         """Get project by ID"""
-        return await self.service.get_project(org_id, project_id)
+        return await self._read_service(read_session).get_project(org_id, project_id)
 
     @router.get("/", response_model=list[ProjectOut])
     async def list_projects(
         self,
-        org_id: int = Path(..., description="Organization ID")
+        org_id: int = Path(..., description="Organization ID"),
+        read_session: AsyncSession = Depends(get_read_session),
     ):
         """List all projects for an organization"""
-        return await self.service.list_projects(org_id)
+        return await self._read_service(read_session).list_projects(org_id)
 
     @router.patch("/{project_id}", response_model=ProjectOut)
     async def update_project(
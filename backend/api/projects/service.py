@@ -1,19 +1,23 @@
+from typing import Optional
 from slugify import slugify
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from db.repositories.projects import ProjectRepository
 from db.repositories.organizations import OrganizationRepository
+from cache.tenants import project_cache
 from .schema import ProjectCreate, ProjectUpdate
 
 
 class ProjectService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
         self.repo = ProjectRepository(session=session)
+        # Dashboard reads, on the replica when one is configured
+        self.read_repo = ProjectRepository(session=read_session or session)
         self.org_repo = OrganizationRepository(session=session)
 
     async def _verify_organization(self, org_id: int) -> None:
         """Verify organization exists and is active"""
-        org = await self.org_repo.get_by_id(org_id)
+        org = await self.org_repo.get_metadata(org_id)
         if not org:
             raise HTTPException(status_code=404, detail="Organization not found")
         if not org.is_active:
@@ -40,6 +44,7 @@ class ProjectService:
             platform=data.platform,
             retention_days=data.retention_days or 90
         )
+        project_cache.invalidate(project.id)
         return project
 
     async def get_project(self, org_id: int, project_id: int):
@@ -47,7 +52,7 @@ class ProjectService:
         # Verify organization exists and is active
         await self._verify_organization(org_id)
         
-        project = await self.repo.get_by_id(project_id)
+        project = await self.read_repo.get_by_id(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         if project.organization_id != org_id:
@@ -59,7 +64,7 @@ class ProjectService:
         # Verify organization exists and is active
         await self._verify_organization(org_id)
         
-        return await self.repo.list_by_organization(org_id)
+        return await self.read_repo.list_by_organization(org_id)
 
     async def update_project(self, org_id: int, project_id: int, data: ProjectUpdate):
         """Update project details"""
@@ -83,4 +88,5 @@ class ProjectService:
                 raise HTTPException(status_code=400, detail="Project slug already exists in this organization")
         
         updated_project = await self.repo.update(project_id, **update_data)
+        project_cache.invalidate(project_id)
         return updated_project 
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""
+In-process caches shared by the API.
+"""
+
+from .ttl import TTLCache
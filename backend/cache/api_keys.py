@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import update
+
+from config import settings
+from db.models.api_keys import APIKey
+from db.session import async_session
+from .ttl import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedAPIKey:
+    """Immutable snapshot of the API key fields needed to authenticate a request"""
+    id: int
+    project_id: int
+    key_hash: str
+    is_active: bool
+    expires_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, api_key: APIKey) -> "CachedAPIKey":
+        return cls(
+            id=api_key.id,
+            project_id=api_key.project_id,
+            key_hash=api_key.key_hash,
+            is_active=api_key.is_active,
+            expires_at=api_key.expires_at,
+        )
+
+    def is_expired(self, now: datetime) -> bool:
+        return self.expires_at is not None and self.expires_at <= now
+
+
+class APIKeyUsageTracker:
+    """
+    Coalesces ``last_used_at`` writes. Validations only record the time in
+    memory; a background task writes the latest value per key in one bulk
+    UPDATE every ``interval`` seconds.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def touch(self, key_id: int, used_at: datetime) -> None:
+        self._pending[key_id] = used_at
+
+    async def flush(self) -> int:
+        """Write all pending last_used_at values and return how many keys were updated"""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        try:
+            async with async_session() as session:
+                await session.execute(
+                    update(APIKey),
+                    [{"id": key_id, "last_used_at": used_at} for key_id, used_at in pending.items()],
+                )
+                await session.commit()
+        except Exception:
+            # Keep the newest timestamps so the next flush retries them
+            for key_id, used_at in pending.items():
+                self._pending[key_id] = max(used_at, self._pending.get(key_id, used_at))
+            raise
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush API key usage: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush API key usage on shutdown: {e}")
+
+
+# Keyed by API key hash. Entries are per process; deactivation invalidates
+# the local entry immediately and other processes within the TTL.
+api_key_cache: TTLCache[str, CachedAPIKey] = TTLCache(
+    maxsize=settings.api_key_cache_size,
+    ttl=settings.api_key_cache_ttl_seconds,
+    negative_ttl=settings.api_key_negative_cache_ttl_seconds,
+)
+
+api_key_usage = APIKeyUsageTracker(interval=settings.api_key_usage_flush_seconds)
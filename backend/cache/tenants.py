@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+
+from config import settings
+from db.models.organizations import Organization
+from db.models.projects import Project
+from .ttl import TTLCache
+
+
+@dataclass(frozen=True)
+class ProjectMetadata:
+    """Immutable snapshot of the project fields checked on every request"""
+    id: int
+    organization_id: int
+    name: str
+    is_active: bool
+    retention_days: int
+
+    @classmethod
+    def from_model(cls, project: Project) -> "ProjectMetadata":
+        return cls(
+            id=project.id,
+            organization_id=project.organization_id,
+            name=project.name,
+            is_active=project.is_active,
+            retention_days=project.retention_days,
+        )
+
+
+@dataclass(frozen=True)
+class OrganizationMetadata:
+    """Immutable snapshot of the organization fields checked on every request"""
+    id: int
+    is_active: bool
+
+    @classmethod
+    def from_model(cls, org: Organization) -> "OrganizationMetadata":
+        return cls(id=org.id, is_active=org.is_active)
+
+
+# Keyed by ID. Entries are per process; writes through the project and
+# organization services invalidate them locally, other processes catch
+# up within the TTL.
+project_cache: TTLCache[int, ProjectMetadata] = TTLCache(
+    maxsize=settings.tenant_cache_size,
+    ttl=settings.tenant_cache_ttl_seconds,
+    negative_ttl=settings.tenant_negative_cache_ttl_seconds,
+)
+
+organization_cache: TTLCache[int, OrganizationMetadata] = TTLCache(
+    maxsize=settings.tenant_cache_size,
+    ttl=settings.tenant_cache_ttl_seconds,
+    negative_ttl=settings.tenant_negative_cache_ttl_seconds,
+)
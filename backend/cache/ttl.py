@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+    A cached ``None`` is a negative entry and uses ``negative_ttl``.
+    Concurrent misses for the same key share a single load.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._entries: "OrderedDict[K, tuple[float, Optional[V]]]" = OrderedDict()
+        self._inflight: dict[K, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: K) -> tuple[bool, Optional[V]]:
+        """Return (hit, value) without loading"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: K, value: Optional[V]) -> None:
+        """Store a value, or a negative entry when value is None"""
+        ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Drop a key, including any load that is still in flight"""
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[Optional[V]]]) -> Optional[V]:
+        """Return the cached value or load it once for all concurrent callers"""
+        hit, value = self.lookup(key)
+        if hit:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The request that owned the load was cancelled, load it ourselves
+                return await self.get_or_load(key, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark retrieved so a failure nobody waited on is not logged
+                future.exception()
+            raise
+        # Only store the result if the key was not invalidated mid-load
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+            self.set(key, value)
+        future.set_result(value)
+        return value
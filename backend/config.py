@@ -1,13 +1,91 @@
 from pydantic_settings import BaseSettings
 import os
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     database_url: str
+    # Optional read replica for dashboard queries; reads fall back to the
+    # primary while the replica is unreachable or lags too far behind
+    database_read_url: Optional[str] = None
+    db_read_max_lag_seconds: float = 30
+    db_read_lag_check_seconds: float = 5
     redis_url: str
     temporal_host_port: str = "temporal:7233"
     temporal_namespace: str = "default"
     temporal_task_queue: str = "error-processing"
 
+    # Database engine. The worker profile overrides pool size and
+    # statement timeout; see db.session.create_engine
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    db_statement_timeout_ms: int = 10000
+    # Per worker process, see WORKER_PROCESSES in workflow_config
+    db_worker_pool_size: int = 20
+    db_worker_max_overflow: int = 10
+    db_worker_statement_timeout_ms: int = 300000
+
+    # Ingest
+    ingest_batch_max_size: int = 1000
+
+    # Rows fetched per round trip when streaming raw errors as NDJSON
+    raw_error_stream_chunk_size: int = 500
+
+    # Write-behind ingest buffer (opt-in)
+    ingest_buffer_enabled: bool = False
+    ingest_buffer_flush_size: int = 500
+    ingest_buffer_flush_interval_seconds: float = 0.05
+    ingest_buffer_max_queue: int = 10000
+
+    # Error processing, for single errors and batches: "single" runs every
+    # step in one activity and transaction, "local" uses local activities,
+    # "split" schedules separate activities (slowest, easiest to debug)
+    processing_mode: Literal["single", "local", "split"] = "single"
+
+    # Coalesced processing (opt-in): events are signalled into one workflow
+    # per fingerprint, which processes them at most once per window
+    processing_coalesce_enabled: bool = False
+    processing_coalesce_window_seconds: float = 10
+    processing_coalesce_windows_per_run: int = 100
+    processing_coalesce_idle_timeout_seconds: float = 300
+
+    # Workflow starts that failed after their errors were saved are kept
+    # in pending_workflow_starts and re-driven in batches of this size
+    workflow_start_redrive_batch_size: int = 100
+
+    # Group rollups: minute buckets are compacted into hours, hours into days
+    rollup_minute_retention_hours: int = 3
+    rollup_hour_retention_days: int = 7
+    rollup_compaction_batch_size: int = 10000
+
+    # Events embedded in a group's detail response
+    group_recent_events: int = 10
+
+    # Group tag values: distinct values tracked per group and tag key
+    group_tag_values_per_key: int = 100
+
+    # Daily partitions of raw_errors / error_events created ahead of time
+    partition_precreate_days: int = 14
+
+    # Retention sweep: rows per delete batch and pause between batches
+    retention_batch_size: int = 5000
+    retention_batch_pause_ms: int = 100
+
+    # API key validation cache
+    api_key_cache_size: int = 10000
+    api_key_cache_ttl_seconds: float = 60
+    api_key_negative_cache_ttl_seconds: float = 10
+    api_key_usage_flush_seconds: float = 30
+
+    # Project / organization metadata cache
+    tenant_cache_size: int = 10000
+    tenant_cache_ttl_seconds: float = 30
+    tenant_negative_cache_ttl_seconds: float = 5
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
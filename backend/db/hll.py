@@ -0,0 +1,47 @@
+import hashlib
+import math
+from typing import Iterable, Optional
+
+# HyperLogLog sketches of distinct users. A sketch is a bytea of
+# 2^HLL_PRECISION one-byte registers, about 3% standard error. Workers
+# merge and count them here, on rows their upsert has already locked;
+# the hll_merge, hll_union and hll_cardinality SQL functions do the same
+# for rollup compaction and windowed counts, off the ingest path.
+HLL_PRECISION = 10
+HLL_REGISTERS = 1 << HLL_PRECISION
+
+_HASH_BITS = 64
+_RANK_BITS = _HASH_BITS - HLL_PRECISION
+
+
+def hll_sketch(items: Iterable[str]) -> Optional[bytes]:
+    """Sketch of the given items, None when there are none"""
+    registers = bytearray(HLL_REGISTERS)
+    empty = True
+    for item in items:
+        hashed = int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), "big")
+        index = hashed >> _RANK_BITS
+        # Position of the first set bit in the remaining bits
+        rank = _RANK_BITS - (hashed & ((1 << _RANK_BITS) - 1)).bit_length() + 1
+        registers[index] = max(registers[index], rank)
+        empty = False
+    return None if empty else bytes(registers)
+
+
+def hll_merge(a: Optional[bytes], b: Optional[bytes]) -> Optional[bytes]:
+    """Register-wise maximum of two sketches, either of which may be None"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return bytes(map(max, a, b))
+
+
+def hll_cardinality(sketch: bytes) -> int:
+    """HyperLogLog estimate with the small-range (linear counting) correction"""
+    m = len(sketch)
+    raw = (0.7213 / (1 + 1.079 / m)) * m * m / sum(2.0 ** -register for register in sketch)
+    zeros = sketch.count(0)
+    if raw <= 2.5 * m and zeros > 0:
+        return round(m * math.log(m / zeros))
+    return round(raw)
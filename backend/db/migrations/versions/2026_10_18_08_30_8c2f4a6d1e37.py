@@ -0,0 +1,45 @@
+"""add pending workflow starts
+
+Revision ID: 8c2f4a6d1e37
+Revises: 2f0ade56ac21
+Create Date: 2026-10-18 08:30:31.804415
+
+Workflows the API could not start after committing their raw errors are
+kept here and re-driven by the workflow-start-redrive schedule.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2f4a6d1e37'
+down_revision = '2f0ade56ac21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('pending_workflow_starts',
+    sa.Column('workflow', sa.String(length=255), nullable=False),
+    sa.Column('workflow_id', sa.String(length=255), nullable=False),
+    sa.Column('task_queue', sa.String(length=255), nullable=False),
+    sa.Column('arg', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('start_signal', sa.String(length=255), nullable=True),
+    sa.Column('start_signal_args', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('last_attempt_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pending_workflow_starts_id'), 'pending_workflow_starts', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pending_workflow_starts_id'), table_name='pending_workflow_starts')
+    op.drop_table('pending_workflow_starts')
@@ -0,0 +1,53 @@
+"""add error group rollups
+
+Revision ID: 9257957dacb5
+Revises: 8c2f4a6d1e37
+Create Date: 2026-10-18 09:12:31.408227
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9257957dacb5'
+down_revision = '8c2f4a6d1e37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('error_group_rollups',
+    sa.Column('group_id', sa.BigInteger(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('granularity', sa.String(length=10), nullable=False),
+    sa.Column('bucket_start', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['error_groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('group_id', 'granularity', 'bucket_start', name='uq_error_group_rollups_bucket')
+    )
+    op.create_index('idx_error_group_rollups_project_bucket', 'error_group_rollups', ['project_id', 'granularity', 'bucket_start'], unique=False)
+    op.create_index(op.f('ix_error_group_rollups_id'), 'error_group_rollups', ['id'], unique=False)
+
+    # Backfill hourly buckets from the events recorded so far
+    op.execute("""
+        INSERT INTO error_group_rollups (group_id, project_id, granularity, bucket_start, count)
+        SELECT g.id, g.project_id, 'hour',
+               date_trunc('hour', e.timestamp AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+               count(*)
+        FROM error_events e
+        JOIN error_groups g ON g.fingerprint = e.group_fingerprint
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_error_group_rollups_id'), table_name='error_group_rollups')
+    op.drop_index('idx_error_group_rollups_project_bucket', table_name='error_group_rollups')
+    op.drop_table('error_group_rollups')
@@ -0,0 +1,25 @@
+"""index rollups by granularity for compaction
+
+Revision ID: 6a21f39f71ce
+Revises: 9257957dacb5
+Create Date: 2026-10-18 10:05:12.771904
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a21f39f71ce'
+down_revision = '9257957dacb5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_error_group_rollups_granularity_bucket', 'error_group_rollups', ['granularity', 'bucket_start'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_error_group_rollups_granularity_bucket', table_name='error_group_rollups')
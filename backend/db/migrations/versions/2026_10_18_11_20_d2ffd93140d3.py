@@ -0,0 +1,31 @@
+"""add raw error content hash for deduplication
+
+Revision ID: d2ffd93140d3
+Revises: 6a21f39f71ce
+Create Date: 2026-10-18 11:20:04.115382
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2ffd93140d3'
+down_revision = '6a21f39f71ce'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('raw_errors', sa.Column('content_hash', sa.String(length=32), nullable=True))
+    op.add_column('raw_errors', sa.Column('is_duplicate', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.add_column('raw_errors', sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+    op.create_index('idx_raw_errors_project_content_hash', 'raw_errors', ['project_id', 'content_hash', 'received_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_raw_errors_project_content_hash', table_name='raw_errors')
+    op.drop_column('raw_errors', 'duplicate_of_id')
+    op.drop_column('raw_errors', 'is_duplicate')
+    op.drop_column('raw_errors', 'content_hash')
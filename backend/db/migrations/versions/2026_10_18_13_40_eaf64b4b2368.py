@@ -0,0 +1,27 @@
+"""add keyset pagination indexes for error groups
+
+Revision ID: eaf64b4b2368
+Revises: d2ffd93140d3
+Create Date: 2026-10-18 13:40:52.630914
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'eaf64b4b2368'
+down_revision = 'd2ffd93140d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_error_groups_project_last_seen', 'error_groups', ['project_id', 'last_seen', 'id'], unique=False)
+    op.create_index('idx_error_groups_project_status_last_seen', 'error_groups', ['project_id', 'status', 'last_seen', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_error_groups_project_status_last_seen', table_name='error_groups')
+    op.drop_index('idx_error_groups_project_last_seen', table_name='error_groups')
@@ -0,0 +1,151 @@
+"""partition raw_errors and error_events by day
+
+Revision ID: 62352c5a10cb
+Revises: eaf64b4b2368
+Create Date: 2026-10-18 15:05:27.904163
+
+The existing tables are renamed to <table>_legacy and attached to new
+range-partitioned parents as the partition for everything before the
+cutover (the next UTC midnight); daily partitions are created from the
+cutover on. Attaching builds the (id, partition key) primary key index
+on the legacy table under an exclusive lock, so plan a short ingest
+pause on large installations.
+
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '62352c5a10cb'
+down_revision = 'eaf64b4b2368'
+branch_labels = None
+depends_on = None
+
+PRECREATE_DAYS = 14
+
+INDEXES = {
+    'raw_errors': [
+        ('ix_raw_errors_service', ['service']),
+        ('ix_raw_errors_environment', ['environment']),
+        ('ix_raw_errors_user_id', ['user_id']),
+        ('idx_service_env_timestamp', ['service', 'environment', 'timestamp']),
+        ('idx_level_timestamp', ['level', 'timestamp']),
+        ('idx_raw_errors_project_timestamp', ['project_id', 'timestamp']),
+        ('idx_raw_errors_expires_at', ['expires_at']),
+        ('idx_raw_errors_project_content_hash', ['project_id', 'content_hash', 'received_at']),
+    ],
+    'error_events': [
+        ('ix_error_events_group_fingerprint', ['group_fingerprint']),
+        ('idx_group_timestamp', ['group_fingerprint', 'timestamp']),
+        ('idx_raw_error_id', ['raw_error_id']),
+    ],
+}
+
+PARTITION_KEYS = {
+    'raw_errors': 'received_at',
+    'error_events': 'timestamp',
+}
+
+
+def _partition_table(table: str, key: str, cutover: datetime) -> None:
+    legacy = f'{table}_legacy'
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+
+    # Free the index names for the partitioned parent
+    op.execute(f"""
+        DO $$
+        DECLARE idx record;
+        BEGIN
+            FOR idx IN SELECT indexname FROM pg_indexes
+                       WHERE schemaname = current_schema() AND tablename = '{legacy}' LOOP
+                EXECUTE format('ALTER INDEX %I RENAME TO %I', idx.indexname, left(idx.indexname, 56) || '_legacy');
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ({key})'
+    )
+    # Keep the ID sequence when the legacy partition is eventually dropped
+    op.execute(f"""
+        DO $$
+        DECLARE seq text := pg_get_serial_sequence('{legacy}', 'id');
+        BEGIN
+            IF seq IS NOT NULL THEN
+                EXECUTE format('ALTER SEQUENCE %s OWNED BY {table}.id', seq);
+            END IF;
+        END $$
+    """)
+    op.create_primary_key(f'{table}_pkey', table, ['id', key])
+    for name, columns in INDEXES[table]:
+        op.create_index(name, table, columns, unique=False)
+    if table == 'raw_errors':
+        op.create_foreign_key('raw_errors_project_id_fkey', 'raw_errors', 'projects', ['project_id'], ['id'])
+
+    # A validated CHECK lets SET NOT NULL and ATTACH skip their scans of the legacy rows
+    op.execute(f"ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_range CHECK ({key} IS NOT NULL AND {key} < '{cutover.isoformat()}+00') NOT VALID")
+    op.execute(f'ALTER TABLE {legacy} VALIDATE CONSTRAINT {legacy}_range')
+    op.execute(f'ALTER TABLE {legacy} ALTER COLUMN {key} SET NOT NULL')
+    op.execute(f"ALTER TABLE {table} ATTACH PARTITION {legacy} FOR VALUES FROM (MINVALUE) TO ('{cutover.isoformat()}+00')")
+    op.execute(f'ALTER TABLE {legacy} DROP CONSTRAINT {legacy}_range')
+
+    for offset in range(PRECREATE_DAYS):
+        start = cutover + timedelta(days=offset)
+        end = start + timedelta(days=1)
+        op.execute(
+            f"CREATE TABLE {table}_p{start:%Y%m%d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}+00') TO ('{end.isoformat()}+00')"
+        )
+
+
+def _unpartition_table(table: str, key: str) -> None:
+    legacy = f'{table}_legacy'
+    op.execute(f'ALTER TABLE {table} DETACH PARTITION {legacy}')
+    op.execute(f'INSERT INTO {legacy} SELECT * FROM {table}')
+    op.execute(f"""
+        DO $$
+        DECLARE seq text := pg_get_serial_sequence('{table}', 'id');
+        BEGIN
+            IF seq IS NOT NULL THEN
+                EXECUTE format('ALTER SEQUENCE %s OWNED BY {legacy}.id', seq);
+            END IF;
+        END $$
+    """)
+    op.execute(f'DROP TABLE {table}')
+
+    # Drop the indexes created for the partitioned parent, restore the old names
+    op.execute(f"""
+        DO $$
+        DECLARE idx record;
+        BEGIN
+            FOR idx IN SELECT indexname FROM pg_indexes
+                       WHERE schemaname = current_schema() AND tablename = '{legacy}'
+                         AND indexname NOT LIKE '%\\_legacy' LOOP
+                EXECUTE format('DROP INDEX %I', idx.indexname);
+            END LOOP;
+            FOR idx IN SELECT indexname FROM pg_indexes
+                       WHERE schemaname = current_schema() AND tablename = '{legacy}' LOOP
+                EXECUTE format('ALTER INDEX %I RENAME TO %I', idx.indexname, left(idx.indexname, length(idx.indexname) - 7));
+            END LOOP;
+        END $$
+    """)
+    op.execute(f'ALTER TABLE {legacy} RENAME TO {table}')
+
+
+def upgrade() -> None:
+    op.drop_constraint('error_events_raw_error_id_fkey', 'error_events', type_='foreignkey')
+
+    now = datetime.utcnow()
+    cutover = datetime(now.year, now.month, now.day) + timedelta(days=1)
+    for table, key in PARTITION_KEYS.items():
+        _partition_table(table, key, cutover)
+
+
+def downgrade() -> None:
+    for table, key in PARTITION_KEYS.items():
+        _unpartition_table(table, key)
+
+    op.create_foreign_key('error_events_raw_error_id_fkey', 'error_events', 'raw_errors', ['raw_error_id'], ['id'])
@@ -0,0 +1,42 @@
+"""carry the raw error partition key on events, add default partitions
+
+Revision ID: 5b0e7d2c4a19
+Revises: 62352c5a10cb
+Create Date: 2026-10-18 15:30:09.640152
+
+error_events.raw_error_received_at holds the received_at of the event's
+raw error, so joins to raw_errors can match on the whole primary key and
+prune partitions. Existing events are backfilled in one UPDATE, which
+rewrites error_events; events whose raw error is already gone keep NULL.
+
+Rows outside every daily partition, e.g. when partition maintenance
+stopped running, go to <table>_default instead of failing the insert.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b0e7d2c4a19'
+down_revision = '62352c5a10cb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('error_events', sa.Column('raw_error_received_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.execute(
+        'UPDATE error_events SET raw_error_received_at = raw_errors.received_at '
+        'FROM raw_errors WHERE raw_errors.id = error_events.raw_error_id'
+    )
+
+    op.execute('CREATE TABLE raw_errors_default PARTITION OF raw_errors DEFAULT')
+    op.execute('CREATE TABLE error_events_default PARTITION OF error_events DEFAULT')
+
+
+def downgrade() -> None:
+    op.execute('DROP TABLE error_events_default')
+    op.execute('DROP TABLE raw_errors_default')
+    op.drop_column('error_events', 'raw_error_received_at')
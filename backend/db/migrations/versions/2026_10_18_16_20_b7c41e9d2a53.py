@@ -0,0 +1,38 @@
+"""store raw error context as jsonb and index tags
+
+Revision ID: b7c41e9d2a53
+Revises: 5b0e7d2c4a19
+Create Date: 2026-10-18 16:20:11.482395
+
+Changing the type rewrites every raw_errors partition, so all columns
+change in one ALTER TABLE to rewrite them once.
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c41e9d2a53'
+down_revision = '5b0e7d2c4a19'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ['tags', 'extra', 'request_headers', 'request_data', 'error_metadata']
+
+
+def upgrade() -> None:
+    op.execute('ALTER TABLE raw_errors ' + ', '.join(
+        f'ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb' for column in COLUMNS
+    ))
+    op.create_index(
+        'idx_raw_errors_tags', 'raw_errors', ['tags'], unique=False,
+        postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_raw_errors_tags', table_name='raw_errors', postgresql_using='gin')
+    op.execute('ALTER TABLE raw_errors ' + ', '.join(
+        f'ALTER COLUMN {column} TYPE JSON USING {column}::json' for column in COLUMNS
+    ))
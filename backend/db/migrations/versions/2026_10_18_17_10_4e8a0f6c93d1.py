@@ -0,0 +1,45 @@
+"""add group tag values
+
+Revision ID: 4e8a0f6c93d1
+Revises: b7c41e9d2a53
+Create Date: 2026-10-18 17:10:44.219870
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e8a0f6c93d1'
+down_revision = 'b7c41e9d2a53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('group_tag_values',
+    sa.Column('group_id', sa.BigInteger(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=200), nullable=False),
+    sa.Column('value', sa.String(length=200), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.Column('error', sa.BigInteger(), nullable=False),
+    sa.Column('first_seen', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('last_seen', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['error_groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('group_id', 'key', 'value', name='uq_group_tag_values_value')
+    )
+    op.create_index('idx_group_tag_values_group_key_count', 'group_tag_values', ['group_id', 'key', 'count'], unique=False)
+    op.create_index(op.f('ix_group_tag_values_id'), 'group_tag_values', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_group_tag_values_id'), table_name='group_tag_values')
+    op.drop_index('idx_group_tag_values_group_key_count', table_name='group_tag_values')
+    op.drop_table('group_tag_values')
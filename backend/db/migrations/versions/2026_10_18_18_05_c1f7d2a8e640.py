@@ -0,0 +1,74 @@
+"""add hyperloglog users sketches to groups and rollups
+
+Revision ID: c1f7d2a8e640
+Revises: 4e8a0f6c93d1
+Create Date: 2026-10-18 18:05:37.661042
+
+Sketches are bytea registers written by db.hll; these functions merge
+and count them without an extension:
+
+- hll_merge(a, b): register-wise maximum, NULL-tolerant
+- hll_union(sketch): aggregate of hll_merge, for windowed counts
+- hll_cardinality(sketch): HyperLogLog estimate with the small-range
+  (linear counting) correction
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1f7d2a8e640'
+down_revision = '4e8a0f6c93d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE FUNCTION hll_merge(a bytea, b bytea) RETURNS bytea
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT CASE
+                WHEN a IS NULL THEN b
+                WHEN b IS NULL THEN a
+                ELSE (
+                    SELECT string_agg(set_byte(decode('00', 'hex'), 0, greatest(get_byte(a, i), get_byte(b, i))), ''::bytea ORDER BY i)
+                    FROM generate_series(0, length(a) - 1) AS i
+                )
+            END
+        $$
+    """)
+    op.execute("""
+        CREATE AGGREGATE hll_union(bytea) (SFUNC = hll_merge, STYPE = bytea, COMBINEFUNC = hll_merge, PARALLEL = SAFE)
+    """)
+    op.execute("""
+        CREATE FUNCTION hll_cardinality(sketch bytea) RETURNS bigint
+        LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+            SELECT round(CASE
+                WHEN raw <= 2.5 * m AND zeros > 0 THEN m * ln(m / zeros)
+                ELSE raw
+            END)::bigint
+            FROM (
+                SELECT m,
+                       (0.7213 / (1 + 1.079 / m)) * m * m / sum(power(2.0::float8, -register)) AS raw,
+                       count(*) FILTER (WHERE register = 0)::float8 AS zeros
+                FROM (
+                    SELECT length(sketch)::float8 AS m, get_byte(sketch, i) AS register
+                    FROM generate_series(0, length(sketch) - 1) AS i
+                ) AS registers
+                GROUP BY m
+            ) AS estimate
+        $$
+    """)
+
+    op.add_column('error_groups', sa.Column('users_sketch', sa.LargeBinary(), nullable=True))
+    op.add_column('error_group_rollups', sa.Column('users_sketch', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('error_group_rollups', 'users_sketch')
+    op.drop_column('error_groups', 'users_sketch')
+    op.execute('DROP FUNCTION hll_cardinality(bytea)')
+    op.execute('DROP AGGREGATE hll_union(bytea)')
+    op.execute('DROP FUNCTION hll_merge(bytea, bytea)')
@@ -0,0 +1,68 @@
+"""add full-text search columns for groups and raw errors
+
+Revision ID: 7d93b5e2f1a4
+Revises: c1f7d2a8e640
+Create Date: 2026-10-18 19:00:18.305716
+
+Adding a stored generated column rewrites the table, every partition
+of raw_errors included. pg_trgm is a trusted extension from Postgres
+13 on, so the database owner can create it.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7d93b5e2f1a4'
+down_revision = 'c1f7d2a8e640'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.add_column('error_groups', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(example_message, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('idx_error_groups_search', 'error_groups', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'idx_error_groups_title_trgm', 'error_groups', ['title'], unique=False,
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+    op.add_column('raw_errors', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(exception_type, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(exception_value, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(message, '')), 'C')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('idx_raw_errors_search', 'raw_errors', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'idx_raw_errors_exception_type_trgm', 'raw_errors', ['exception_type'], unique=False,
+        postgresql_using='gin', postgresql_ops={'exception_type': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_raw_errors_exception_type_trgm', table_name='raw_errors', postgresql_using='gin')
+    op.drop_index('idx_raw_errors_search', table_name='raw_errors', postgresql_using='gin')
+    op.drop_column('raw_errors', 'search_vector')
+    op.drop_index('idx_error_groups_title_trgm', table_name='error_groups', postgresql_using='gin')
+    op.drop_index('idx_error_groups_search', table_name='error_groups', postgresql_using='gin')
+    op.drop_column('error_groups', 'search_vector')
@@ -0,0 +1,35 @@
+"""cover recent group events with one index
+
+Revision ID: 3a6e1c9b8f52
+Revises: 7d93b5e2f1a4
+Create Date: 2026-10-18 20:10:42.518203
+
+idx_error_events_group_recent replaces idx_group_timestamp. It adds id
+to the key, so keyset pages stay in index order, and it carries
+raw_error_id and event_type, so listing a group's events never visits
+the error_events heap.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a6e1c9b8f52'
+down_revision = '7d93b5e2f1a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_error_events_group_recent', 'error_events', ['group_fingerprint', 'timestamp', 'id'], unique=False,
+        postgresql_include=['raw_error_id', 'event_type'],
+    )
+    op.drop_index('idx_group_timestamp', table_name='error_events')
+
+
+def downgrade() -> None:
+    op.create_index('idx_group_timestamp', 'error_events', ['group_fingerprint', 'timestamp'], unique=False)
+    op.drop_index('idx_error_events_group_recent', table_name='error_events')
@@ -3,6 +3,9 @@ from .groups import ErrorGroup, GroupStatus
 from .projects import Project
 from .organizations import Organization
 from .api_keys import APIKey
+from .rollups import ErrorGroupRollup, RollupGranularity
+from .tag_values import GroupTagValue
+from .workflows import PendingWorkflowStart
 
 __all__ = [
     'RawError',
@@ -12,4 +15,8 @@ __all__ = [
     'Project',
     'Organization',
     'APIKey',
+    'ErrorGroupRollup',
+    'RollupGranularity',
+    'GroupTagValue',
+    'PendingWorkflowStart',
 ] 
\ No newline at end of file
@@ -1,15 +1,17 @@
 from datetime import datetime
-from sqlalchemy import JSON, TIMESTAMP, Boolean, Text, String, func, Index, ForeignKey, Integer
+from sqlalchemy import JSON, TIMESTAMP, Boolean, Text, String, func, and_, Index, ForeignKey, Integer, Computed
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from db.base import Base
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, foreign, query_expression
 from .projects import Project
 
 
 class RawError(Base):
     __tablename__ = "raw_errors"
     
-    # Primary key
+    # Primary key; the partition key has to be part of it
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    received_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True, server_default=func.now())
     
     # Project relationship
     project_id: Mapped[int] = mapped_column(Integer, ForeignKey('projects.id'), nullable=False)
@@ -29,8 +31,8 @@ class RawError(Base):
     exception_module: Mapped[str | None] = mapped_column(String(255), nullable=True)
     
     # Context
-    tags: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    extra: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    tags: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    extra: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     
     # User context
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
@@ -41,24 +43,42 @@ class RawError(Base):
     # Request context
     request_method: Mapped[str | None] = mapped_column(String(10), nullable=True)
     request_url: Mapped[str | None] = mapped_column(Text, nullable=True)
-    request_headers: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    request_data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    request_headers: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    request_data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     
     # Metadata
     timestamp: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
-    received_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     release: Mapped[str | None] = mapped_column(String(100), nullable=True)
     
     # Processing flags
     processed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
+    # Deduplication
+    content_hash: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    is_duplicate: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
+    duplicate_of_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    
     # Data retention
     expires_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
     
     # Legacy fields for backward compatibility
     error_type: Mapped[str | None] = mapped_column(Text, nullable=True)
     stack_trace: Mapped[str | None] = mapped_column(Text, nullable=True)
-    error_metadata: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error_metadata: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    
+    # Full-text search, see db.search
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(exception_type, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(exception_value, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(message, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    # Relevance to the search of the query that loaded the row
+    search_rank: Mapped[float | None] = query_expression()
     
     # Indexes for performance
     __table_args__ = (
@@ -66,24 +86,43 @@ class RawError(Base):
         Index('idx_level_timestamp', 'level', 'timestamp'),
         Index('idx_raw_errors_project_timestamp', 'project_id', 'timestamp'),
         Index('idx_raw_errors_expires_at', 'expires_at'),
+        Index('idx_raw_errors_project_content_hash', 'project_id', 'content_hash', 'received_at'),
+        # Containment (tags @> '{"region": "eu"}') lookups for tag filters
+        Index('idx_raw_errors_tags', 'tags', postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}),
+        Index('idx_raw_errors_search', 'search_vector', postgresql_using='gin'),
+        # Substring (ILIKE '%...%') search on exception types, needs pg_trgm
+        Index('idx_raw_errors_exception_type_trgm', 'exception_type', postgresql_using='gin', postgresql_ops={'exception_type': 'gin_trgm_ops'}),
+        # Daily partitions, see db.repositories.partitions
+        {'postgresql_partition_by': 'RANGE (received_at)'},
     )
 
 
 class ErrorEvent(Base):
     __tablename__ = "error_events"
     
-    # Primary key
+    # Primary key; the partition key has to be part of it
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     
-    # Foreign key to raw error
-    raw_error_id: Mapped[int] = mapped_column(Integer, ForeignKey('raw_errors.id'), nullable=False)
-    raw_error: Mapped[RawError] = relationship("RawError", backref="events")
+    # Raw error reference. Partitioned tables cannot hold a foreign key to
+    # raw_errors.id alone, so the join is declared without one; the raw
+    # error's partition key is kept alongside so lookups prune partitions
+    raw_error_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    raw_error_received_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    raw_error: Mapped[RawError] = relationship(
+        "RawError",
+        primaryjoin=lambda: and_(
+            foreign(ErrorEvent.raw_error_id) == RawError.id,
+            foreign(ErrorEvent.raw_error_received_at) == RawError.received_at,
+        ),
+        backref="events",
+        viewonly=True,
+    )
     
     # Group fingerprint for error grouping
     group_fingerprint: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     
     # Event metadata
-    timestamp: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    timestamp: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True, server_default=func.now())
     processed_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     
     # Event details
@@ -92,6 +131,13 @@ class ErrorEvent(Base):
     
     # Indexes for performance
     __table_args__ = (
-        Index('idx_group_timestamp', 'group_fingerprint', 'timestamp'),
+        # Newest events of a group as an index-only scan, see
+        # GroupRepository.list_events
+        Index(
+            'idx_error_events_group_recent', 'group_fingerprint', 'timestamp', 'id',
+            postgresql_include=['raw_error_id', 'raw_error_received_at', 'event_type'],
+        ),
         Index('idx_raw_error_id', 'raw_error_id'),
+        # Daily partitions, see db.repositories.partitions
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
\ No newline at end of file
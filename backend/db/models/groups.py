@@ -1,6 +1,7 @@
 from db.base import Base
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import BigInteger, Text, TIMESTAMP, String, func, Index, Integer, ForeignKey, Float
+from sqlalchemy.orm import Mapped, mapped_column, relationship, query_expression
+from sqlalchemy import BigInteger, Text, TIMESTAMP, String, func, Index, Integer, ForeignKey, Float, LargeBinary, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from datetime import datetime
 from enum import Enum
 from .projects import Project
@@ -50,15 +51,35 @@ class ErrorGroup(Base):
     users_affected: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
     last_user_seen: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
     unique_users_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # HyperLogLog sketch of distinct users, see db.hll
+    users_sketch: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
     avg_events_per_day: Mapped[float | None] = mapped_column(Float, nullable=True)
     
     # Legacy field for backward compatibility
     example_message: Mapped[str] = mapped_column(Text, nullable=False)
     
+    # Full-text search, see db.search
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(example_message, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    # Relevance to the search of the query that loaded the row
+    search_rank: Mapped[float | None] = query_expression()
+    
     # Indexes for performance
     __table_args__ = (
         Index('idx_service_env_status', 'service', 'environment', 'status'),
         Index('idx_fingerprint_status', 'fingerprint', 'status'),
         Index('idx_last_seen_status', 'last_seen', 'status'),
         Index('idx_error_groups_project_status', 'project_id', 'status'),
+        Index('idx_error_groups_project_last_seen', 'project_id', 'last_seen', 'id'),
+        Index('idx_error_groups_project_status_last_seen', 'project_id', 'status', 'last_seen', 'id'),
+        Index('idx_error_groups_search', 'search_vector', postgresql_using='gin'),
+        # Substring (ILIKE '%...%') search on titles, needs pg_trgm
+        Index('idx_error_groups_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
     )
\ No newline at end of file
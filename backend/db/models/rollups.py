@@ -0,0 +1,35 @@
+from datetime import datetime
+from enum import Enum
+from sqlalchemy import BigInteger, Integer, String, TIMESTAMP, ForeignKey, Index, UniqueConstraint, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+
+class RollupGranularity(str, Enum):
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+
+class ErrorGroupRollup(Base):
+    __tablename__ = "error_group_rollups"
+
+    # Group and project the bucket belongs to
+    group_id: Mapped[int] = mapped_column(BigInteger, ForeignKey('error_groups.id', ondelete='CASCADE'), nullable=False)
+    project_id: Mapped[int] = mapped_column(Integer, ForeignKey('projects.id'), nullable=False)
+
+    # Bucket
+    granularity: Mapped[str] = mapped_column(String(10), nullable=False)
+    bucket_start: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+
+    # Aggregates
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # HyperLogLog sketch of the bucket's distinct users, see db.hll
+    users_sketch: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+
+    # Indexes and constraints
+    __table_args__ = (
+        UniqueConstraint('group_id', 'granularity', 'bucket_start', name='uq_error_group_rollups_bucket'),
+        Index('idx_error_group_rollups_project_bucket', 'project_id', 'granularity', 'bucket_start'),
+        Index('idx_error_group_rollups_granularity_bucket', 'granularity', 'bucket_start'),
+    )
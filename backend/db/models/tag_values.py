@@ -0,0 +1,29 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Integer, String, TIMESTAMP, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+
+class GroupTagValue(Base):
+    __tablename__ = "group_tag_values"
+
+    # Group and project the value was seen in
+    group_id: Mapped[int] = mapped_column(BigInteger, ForeignKey('error_groups.id', ondelete='CASCADE'), nullable=False)
+    project_id: Mapped[int] = mapped_column(Integer, ForeignKey('projects.id'), nullable=False)
+
+    # Tag
+    key: Mapped[str] = mapped_column(String(200), nullable=False)
+    value: Mapped[str] = mapped_column(String(200), nullable=False)
+
+    # Space-saving counters: count never undercounts, and count - error is
+    # a lower bound of the true number of events with this value
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    error: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    first_seen: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    last_seen: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+
+    # Indexes and constraints
+    __table_args__ = (
+        UniqueConstraint('group_id', 'key', 'value', name='uq_group_tag_values_value'),
+        Index('idx_group_tag_values_group_key_count', 'group_id', 'key', 'count'),
+    )
@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, Text, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+
+class PendingWorkflowStart(Base):
+    __tablename__ = "pending_workflow_starts"
+
+    # Workflow the API could not start after its rows were saved
+    workflow: Mapped[str] = mapped_column(String(255), nullable=False)
+    workflow_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    task_queue: Mapped[str] = mapped_column(String(255), nullable=False)
+    arg: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # Set for signal-with-start, e.g. coalesced group workflows
+    start_signal: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    start_signal_args: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+
+    # Re-drive attempts, see workflows.maintenance
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_attempt_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
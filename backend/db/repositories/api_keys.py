@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from db.models.api_keys import APIKey
+from cache.api_keys import CachedAPIKey, api_key_cache, api_key_usage
 
 
 class APIKeyRepository:
@@ -56,14 +57,8 @@ class APIKeyRepository:
         )
         return list(result.scalars().all())
 
-    async def validate_key(self, key: str) -> APIKey | None:
-        """Validate an API key and update last_used_at if valid"""
-        if len(key) < 8:
-            return None
-            
-        prefix = key[:8]
-        key_hash = self._hash_key(key)
-        
+    async def _load_active_key(self, prefix: str, key_hash: str) -> CachedAPIKey | None:
+        """Load an active API key by prefix and hash"""
         result = await self.session.execute(
             select(APIKey).where(
                 and_(
@@ -74,12 +69,31 @@ class APIKeyRepository:
                 )
             )
         )
-        
         api_key = result.scalar_one_or_none()
-        if api_key:
-            api_key.last_used_at = datetime.now(timezone.utc)
-            await self.session.commit()
+        return CachedAPIKey.from_model(api_key) if api_key else None
+
+    async def validate_key(self, key: str) -> CachedAPIKey | None:
+        """
+        Validate an API key and record its use.
+        Lookups are served from the in-process cache (including negative
+        entries for unknown keys) and last_used_at is written by the
+        periodic usage flush rather than per request.
+        """
+        if len(key) < 8:
+            return None
+            
+        prefix = key[:8]
+        key_hash = self._hash_key(key)
+        
+        api_key = await api_key_cache.get_or_load(
+            key_hash, lambda: self._load_active_key(prefix, key_hash)
+        )
+        
+        now = datetime.now(timezone.utc)
+        if api_key is None or api_key.is_expired(now):
+            return None
         
+        api_key_usage.touch(api_key.id, now)
         return api_key
 
     async def deactivate(self, key_id: int) -> APIKey | None:
@@ -88,4 +102,5 @@ class APIKeyRepository:
         if api_key:
             api_key.is_active = False
             await self.session.commit()
+            api_key_cache.invalidate(api_key.key_hash)
         return api_key 
\ No newline at end of file
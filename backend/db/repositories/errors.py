@@ -1,23 +1,178 @@
-from sqlalchemy import select
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from sqlalchemy import select, insert, update, func, true, tuple_
+from sqlalchemy.orm import aliased, with_expression
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.models.errors import RawError
+from db.models.errors import RawError, ErrorEvent
+from db.search import search_condition, search_query
 
 
 class ErrorRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_errors_by_project(self, project_id: int) -> list[RawError]:
-        """Get all errors for a specific project"""
-        result = await self.session.execute(
-            select(RawError)
-            .where(RawError.project_id == project_id)
-            .order_by(RawError.timestamp.desc())
-        )
+    def _errors_query(
+        self,
+        project_id: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        level: Optional[str] = None,
+        environment: Optional[str] = None,
+        release: Optional[str] = None,
+        group_fingerprint: Optional[str] = None,
+        tags: Optional[Dict[str, str]] = None,
+        q: Optional[str] = None,
+        cursor: Optional[tuple] = None
+    ):
+        """
+        Filtered errors of a project, newest first. With a search string
+        ``q`` the best matches come first and search_rank is loaded.
+        """
+        query = select(RawError).where(RawError.project_id == project_id)
+        
+        if since:
+            # received_at is never before timestamp, see ErrorService, so
+            # the same bound on the partition key prunes older partitions
+            query = query.where(RawError.timestamp >= since, RawError.received_at >= since)
+        if until:
+            query = query.where(RawError.timestamp <= until)
+        if level:
+            query = query.where(RawError.level == level)
+        if environment:
+            query = query.where(RawError.environment == environment)
+        if release:
+            query = query.where(RawError.release == release)
+        if tags:
+            # Containment is answered by idx_raw_errors_tags
+            query = query.where(RawError.tags.contains(tags))
+        if group_fingerprint:
+            # The group's events come from idx_error_events_group_recent,
+            # their raw errors by full primary key
+            query = query.where(
+                tuple_(RawError.id, RawError.received_at).in_(
+                    select(ErrorEvent.raw_error_id, ErrorEvent.raw_error_received_at)
+                    .where(ErrorEvent.group_fingerprint == group_fingerprint)
+                )
+            )
+        if q:
+            # Words through idx_raw_errors_search, exception type
+            # substrings of three or more characters through
+            # idx_raw_errors_exception_type_trgm
+            tsquery = search_query(q)
+            query = query.where(search_condition(RawError.search_vector, RawError.exception_type, q))
+            rank = func.ts_rank(RawError.search_vector, tsquery)
+            query = query.options(with_expression(RawError.search_rank, rank))
+            if cursor:
+                query = query.where(tuple_(rank, RawError.timestamp, RawError.id) < tuple_(*cursor))
+            return query.order_by(rank.desc(), RawError.timestamp.desc(), RawError.id.desc())
+        
+        if cursor:
+            query = query.where(tuple_(RawError.timestamp, RawError.id) < tuple_(*cursor))
+        
+        # id breaks ties so keyset pages never skip or repeat errors
+        return query.order_by(RawError.timestamp.desc(), RawError.id.desc())
+
+    async def get_errors_by_project(self, project_id: int, limit: int = 100, **filters) -> list[RawError]:
+        """
+        Get one page of errors for a project. ``filters`` are passed to
+        _errors_query; ``cursor`` is the (timestamp, id) of the last error
+        of the previous page, or its (search_rank, timestamp, id) when
+        searching.
+        """
+        result = await self.session.execute(self._errors_query(project_id, **filters).limit(limit))
         return list(result.scalars().all())
+
+    async def stream_errors_by_project(self, project_id: int, chunk_size: int, **filters) -> AsyncIterator[RawError]:
+        """
+        Iterate over every matching error through a server-side cursor,
+        fetching ``chunk_size`` rows at a time so memory stays flat.
+        """
+        result = await self.session.stream_scalars(
+            self._errors_query(project_id, **filters).execution_options(yield_per=chunk_size)
+        )
+        async for error in result:
+            yield error
+            # Rows are not needed once serialized
+            self.session.expunge(error)
     
     async def ingest_error(self, error: RawError) -> RawError:
         """Save a new error"""
         self.session.add(error)
         await self.session.commit()
-        return error
\ No newline at end of file
+        return error
+
+    async def ingest_errors(self, errors: list[dict[str, Any]]) -> list[int]:
+        """Save a batch of errors with a single multi-row INSERT and return their IDs in order"""
+        result = await self.session.execute(
+            insert(RawError).returning(RawError.id, sort_by_parameter_order=True),
+            errors,
+        )
+        raw_error_ids = list(result.scalars().all())
+        await self.session.commit()
+        return raw_error_ids
+
+    async def mark_duplicates(
+        self,
+        raw_error_ids: list[int],
+        window: timedelta,
+        received_between: Optional[Tuple[datetime, datetime]] = None,
+    ) -> list[int]:
+        """
+        Mark errors as duplicates of the earliest error with the same
+        content hash in the same project received within the window.
+        Runs as one set-based UPDATE; each error costs one probe of
+        idx_raw_errors_project_content_hash per partition the window
+        spans. ``received_between`` is the earliest and latest received_at
+        of the errors; without it every partition is searched. Returns
+        the IDs marked.
+        """
+        if not raw_error_ids:
+            return []
+        
+        error = aliased(RawError, name="error")
+        earlier = aliased(RawError, name="earlier")
+        first_copy = (
+            select(earlier.id)
+            .where(
+                earlier.project_id == error.project_id,
+                earlier.content_hash == error.content_hash,
+                earlier.received_at >= error.received_at - window,
+                earlier.id < error.id,
+            )
+            .order_by(earlier.received_at, earlier.id)
+            .limit(1)
+        )
+        duplicates = (
+            select(error.id, error.received_at)
+            .where(error.id.in_(raw_error_ids))
+        )
+        if received_between:
+            # Constant bounds on the partition key prune at plan time
+            lower, upper = received_between
+            first_copy = first_copy.where(earlier.received_at >= lower - window)
+            duplicates = duplicates.where(error.received_at.between(lower, upper))
+        first_copy = first_copy.lateral("first_copy")
+        duplicates = (
+            duplicates.add_columns(first_copy.c.id.label("primary_id"))
+            .join(first_copy, true())
+            .subquery("duplicates")
+        )
+        result = await self.session.execute(
+            update(RawError)
+            .where(
+                RawError.id == duplicates.c.id,
+                RawError.received_at == duplicates.c.received_at,
+            )
+            .values(is_duplicate=True, duplicate_of_id=duplicates.c.primary_id)
+            .returning(RawError.id)
+        )
+        return list(result.scalars().all())
+
+    async def get_received_at(self, raw_error_ids: list[int]) -> Dict[int, datetime]:
+        """received_at of raw errors by ID, for callers that were not given it"""
+        if not raw_error_ids:
+            return {}
+        result = await self.session.execute(
+            select(RawError.id, RawError.received_at).where(RawError.id.in_(raw_error_ids))
+        )
+        return {raw_error_id: received_at for raw_error_id, received_at in result.all()}
@@ -1,9 +1,34 @@
 from datetime import datetime
-from typing import Optional, List
-from sqlalchemy import select, func, and_
+from typing import Dict, Optional, List, Tuple
+from sqlalchemy import select, func, and_, tuple_
+from sqlalchemy.orm import with_expression
 from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.errors import RawError, ErrorEvent
 from db.models.groups import ErrorGroup, GroupStatus
+from db.models.rollups import ErrorGroupRollup
+from db.search import search_condition, search_query
 
+# Raw error columns listed with group events. The JSON context columns
+# are only read when asked for
+EVENT_ERROR_COLUMNS = (
+    RawError.service,
+    RawError.environment,
+    RawError.release,
+    RawError.level,
+    RawError.message,
+    RawError.exception_type,
+    RawError.exception_value,
+    RawError.user_id,
+    RawError.received_at,
+)
+EVENT_CONTEXT_COLUMNS = (
+    RawError.tags,
+    RawError.extra,
+    RawError.request_method,
+    RawError.request_url,
+    RawError.request_headers,
+    RawError.request_data,
+)
 
 class GroupRepository:
     def __init__(self, session: AsyncSession):
@@ -17,10 +42,21 @@ class GroupRepository:
         status: Optional[GroupStatus] = None,
         since: Optional[datetime] = None, 
         until: Optional[datetime] = None,
+        tags: Optional[Dict[str, str]] = None,
+        q: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple] = None
     ) -> List[ErrorGroup]:
-        """List error groups with filtering"""
+        """
+        List error groups with filtering, most recently seen first.
+        ``tags`` keeps groups with at least one error carrying all of them.
+        With a search string ``q`` the best matches come first and
+        search_rank is loaded.
+        ``cursor`` is the (last_seen, id) of the last group of the previous
+        page, or its (search_rank, last_seen, id) when searching; when
+        given, the page starts right after it and ``offset`` is not applied.
+        """
         query = select(ErrorGroup).where(ErrorGroup.project_id == project_id)
         
         if service:
@@ -33,9 +69,37 @@ class GroupRepository:
             query = query.where(ErrorGroup.last_seen >= since)
         if until:
             query = query.where(ErrorGroup.last_seen <= until)
+        if tags:
+            # Matching errors come from idx_raw_errors_tags, their groups
+            # from the raw_error_id index of error_events
+            tagged_groups = (
+                select(ErrorEvent.group_fingerprint)
+                .join(RawError, and_(
+                    RawError.id == ErrorEvent.raw_error_id,
+                    RawError.received_at == ErrorEvent.raw_error_received_at,
+                ))
+                .where(RawError.project_id == project_id, RawError.tags.contains(tags))
+            )
+            query = query.where(ErrorGroup.fingerprint.in_(tagged_groups))
         
-        query = query.order_by(ErrorGroup.last_seen.desc())
-        query = query.limit(limit).offset(offset)
+        if q:
+            # Words through idx_error_groups_search, title substrings of
+            # three or more characters through idx_error_groups_title_trgm
+            tsquery = search_query(q)
+            query = query.where(search_condition(ErrorGroup.search_vector, ErrorGroup.title, q))
+            rank = func.ts_rank(ErrorGroup.search_vector, tsquery)
+            query = query.options(with_expression(ErrorGroup.search_rank, rank))
+            if cursor:
+                query = query.where(tuple_(rank, ErrorGroup.last_seen, ErrorGroup.id) < tuple_(*cursor))
+            query = query.order_by(rank.desc(), ErrorGroup.last_seen.desc(), ErrorGroup.id.desc())
+        else:
+            if cursor:
+                query = query.where(tuple_(ErrorGroup.last_seen, ErrorGroup.id) < tuple_(*cursor))
+            # id breaks ties so keyset pages never skip or repeat groups
+            query = query.order_by(ErrorGroup.last_seen.desc(), ErrorGroup.id.desc())
+        query = query.limit(limit)
+        if not cursor:
+            query = query.offset(offset)
         
         result = await self.session.execute(query)
         return list(result.scalars().all())
@@ -58,6 +122,57 @@ class GroupRepository:
         result = await self.session.execute(q)
         return result.scalars().first()
     
+    async def list_events(
+        self,
+        fingerprint: str,
+        limit: int = 10,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        include_context: bool = False
+    ) -> List[dict]:
+        """
+        Newest events of a group with a narrow projection of their raw
+        errors, as dicts. The page is cut from idx_error_events_group_recent
+        with an index-only scan. Each event carries its raw error's full
+        primary key, so the raw error is one probe of one partition's
+        primary key index. ``cursor`` is the (timestamp, id) of the last
+        event of the previous page. ``include_context`` adds the tags,
+        extra and request columns.
+        """
+        events = select(
+            ErrorEvent.id,
+            ErrorEvent.timestamp,
+            ErrorEvent.event_type,
+            ErrorEvent.raw_error_id,
+            ErrorEvent.raw_error_received_at,
+        ).where(ErrorEvent.group_fingerprint == fingerprint)
+        if cursor:
+            events = events.where(tuple_(ErrorEvent.timestamp, ErrorEvent.id) < tuple_(*cursor))
+        events = (
+            events.order_by(ErrorEvent.timestamp.desc(), ErrorEvent.id.desc())
+            .limit(limit)
+            .subquery("events")
+        )
+        
+        columns = EVENT_ERROR_COLUMNS + (EVENT_CONTEXT_COLUMNS if include_context else ())
+        query = (
+            select(
+                events.c.id,
+                events.c.timestamp,
+                events.c.event_type,
+                events.c.raw_error_id,
+                *columns,
+            )
+            # Outer join so pages keep their size even if a raw error is gone
+            .outerjoin(RawError, and_(
+                RawError.id == events.c.raw_error_id,
+                RawError.received_at == events.c.raw_error_received_at,
+            ))
+            .order_by(events.c.timestamp.desc(), events.c.id.desc())
+        )
+        
+        result = await self.session.execute(query)
+        return [dict(row) for row in result.mappings().all()]
+    
     async def update_status(self, group_id: int, status: GroupStatus) -> Optional[ErrorGroup]:
         """Update error group status"""
         group = await self.session.get(ErrorGroup, group_id)
@@ -66,6 +181,28 @@ class GroupRepository:
             await self.session.commit()
         return group
     
+    async def count_unique_users(
+        self,
+        group_id: int,
+        since: datetime,
+        until: Optional[datetime] = None
+    ) -> int:
+        """
+        Estimate the distinct users of a group in a time window by merging
+        the users sketches of its rollup buckets, at bucket granularity.
+        """
+        query = select(
+            func.coalesce(func.hll_cardinality(func.hll_union(ErrorGroupRollup.users_sketch)), 0)
+        ).where(
+            ErrorGroupRollup.group_id == group_id,
+            ErrorGroupRollup.bucket_start >= since,
+        )
+        if until:
+            query = query.where(ErrorGroupRollup.bucket_start <= until)
+        
+        result = await self.session.execute(query)
+        return result.scalar_one()
+    
     async def get_stats(
         self,
         project_id: int,
@@ -92,8 +229,27 @@ class GroupRepository:
         
         result = await self.session.execute(query)
         row = result.one()
+        
+        # Event volume comes from the rollup buckets rather than error_events
+        events_query = select(
+            func.coalesce(func.sum(ErrorGroupRollup.count), 0)
+        ).where(ErrorGroupRollup.project_id == project_id)
+        
+        if service or environment:
+            events_query = events_query.join(ErrorGroup, ErrorGroup.id == ErrorGroupRollup.group_id)
+        if service:
+            events_query = events_query.where(ErrorGroup.service == service)
+        if environment:
+            events_query = events_query.where(ErrorGroup.environment == environment)
+        if since:
+            events_query = events_query.where(ErrorGroupRollup.bucket_start >= since)
+        if until:
+            events_query = events_query.where(ErrorGroupRollup.bucket_start <= until)
+        
+        total_events = (await self.session.execute(events_query)).scalar_one()
         return {
             'total_groups': row.total_groups,
             'unresolved_groups': row.unresolved_groups,
-            'resolved_groups': row.resolved_groups
+            'resolved_groups': row.resolved_groups,
+            'total_events': total_events
         }
@@ -1,6 +1,7 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from db.models.organizations import Organization
+from cache.tenants import OrganizationMetadata, organization_cache
 
 
 class OrganizationRepository:
@@ -21,6 +22,14 @@ class OrganizationRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_metadata(self, org_id: int) -> OrganizationMetadata | None:
+        """Get cached organization metadata, loading it on a miss"""
+        async def load() -> OrganizationMetadata | None:
+            org = await self.get_by_id(org_id)
+            return OrganizationMetadata.from_model(org) if org else None
+
+        return await organization_cache.get_or_load(org_id, load)
+
     async def get_by_slug(self, slug: str) -> Organization | None:
         """Get organization by slug"""
         result = await self.session.execute(
@@ -0,0 +1,147 @@
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Range-partitioned tables and their partition key. Both are split into
+# one partition per UTC day named <table>_pYYYYMMDD; rows from before
+# partitioning was introduced live in <table>_legacy, rows of days
+# without a partition in <table>_default.
+PARTITIONED_TABLES: Dict[str, str] = {
+    "raw_errors": "received_at",
+    "error_events": "timestamp",
+}
+
+
+_BOUND_PATTERN = re.compile(r"FROM \((?:MINVALUE|'([^']+)')\) TO \((?:MAXVALUE|'([^']+)')\)")
+
+
+def partition_name(table: str, day: date) -> str:
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+@dataclass
+class Partition:
+    name: str
+    # None for an open (MINVALUE / MAXVALUE) bound
+    lower: Optional[datetime]
+    upper: Optional[datetime]
+
+
+class PartitionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_daily_partitions(self, table: str, start: date, days: int) -> List[str]:
+        """
+        Create the daily partitions of a table for ``days`` days from
+        ``start`` and return the names of those that were missing.
+        Days already covered by an existing partition are skipped. Rows
+        that went to the default partition while a day had none are moved
+        into the new partition.
+        """
+        if table not in PARTITIONED_TABLES:
+            raise ValueError(f"{table} is not partitioned")
+        key = PARTITIONED_TABLES[table]
+        default = default_partition_name(table)
+        await self.session.execute(text(f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {table} DEFAULT"))
+
+        created = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            name = partition_name(table, day)
+            exists = await self.session.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+            if exists:
+                continue
+            lower = f"'{day.isoformat()} 00:00:00+00'"
+            upper = f"'{(day + timedelta(days=1)).isoformat()} 00:00:00+00'"
+            in_range = f"{key} >= {lower} AND {key} < {upper}"
+            try:
+                # Savepoint so a range overlapping the legacy partition
+                # only skips that day
+                async with self.session.begin_nested():
+                    stranded = await self.session.scalar(text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})"))
+                    if stranded:
+                        await self._move_from_default(table, name, lower, upper, in_range)
+                    else:
+                        await self.session.execute(text(
+                            f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM ({lower}) TO ({upper})"
+                        ))
+            except DBAPIError as e:
+                if "would overlap partition" not in str(e.orig):
+                    raise
+                continue
+            created.append(name)
+
+        await self.session.commit()
+        return created
+
+    async def _move_from_default(self, table: str, name: str, lower: str, upper: str, in_range: str) -> None:
+        """
+        Create a daily partition for rows already in the default partition.
+        The default partition is detached while its rows of the day are
+        reinserted through the parent, so the table is locked meanwhile.
+        """
+        default = default_partition_name(table)
+        # Generated columns are recomputed on insert
+        columns = await self.session.scalar(text(
+            "SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) FROM pg_attribute "
+            "WHERE attrelid = to_regclass(:table) AND attnum > 0 AND NOT attisdropped AND attgenerated = ''"
+        ), {"table": table})
+        await self.session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+        await self.session.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM ({lower}) TO ({upper})"
+        ))
+        moved = await self.session.execute(text(
+            f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {default} WHERE {in_range}"
+        ))
+        await self.session.execute(text(f"DELETE FROM {default} WHERE {in_range}"))
+        await self.session.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+        logger.warning(
+            f"Moved {moved.rowcount} rows of {table} from {default} to {name}; "
+            f"partition maintenance fell behind"
+        )
+
+    async def list_partitions(self, table: str) -> List[Partition]:
+        """Range partitions of a table, oldest first"""
+        if table not in PARTITIONED_TABLES:
+            raise ValueError(f"{table} is not partitioned")
+
+        result = await self.session.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table)"
+            ),
+            {"table": table},
+        )
+        partitions = []
+        for name, bound in result:
+            match = _BOUND_PATTERN.search(bound or "")
+            if match is None:
+                continue
+            lower, upper = match.groups()
+            partitions.append(Partition(
+                name=name,
+                lower=datetime.fromisoformat(lower) if lower else None,
+                upper=datetime.fromisoformat(upper) if upper else None,
+            ))
+        partitions.sort(key=lambda partition: (partition.lower is not None, partition.lower))
+        return partitions
+
+    async def drop_partition(self, table: str, name: str) -> None:
+        """Drop one partition of a table with all its rows"""
+        if table not in PARTITIONED_TABLES or not name.startswith(f"{table}_"):
+            raise ValueError(f"{name} is not a partition of {table}")
+        await self.session.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+        await self.session.commit()
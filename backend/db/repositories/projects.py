@@ -1,6 +1,7 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from db.models.projects import Project
+from cache.tenants import ProjectMetadata, project_cache
 
 
 class ProjectRepository:
@@ -14,6 +15,14 @@ class ProjectRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_metadata(self, project_id: int) -> ProjectMetadata | None:
+        """Get cached project metadata, loading it on a miss"""
+        async def load() -> ProjectMetadata | None:
+            project = await self.get_by_id(project_id)
+            return ProjectMetadata.from_model(project) if project else None
+
+        return await project_cache.get_or_load(project_id, load)
+
     async def get_by_slug(self, organization_id: int, slug: str) -> Project | None:
         """Get a project by organization ID and slug"""
         result = await self.session.execute(
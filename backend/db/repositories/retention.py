@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import select, delete, exists, func, literal, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.errors import RawError, ErrorEvent
+from db.models.groups import ErrorGroup
+from db.models.projects import Project
+
+# Sort key of the last row of a batch, (expires_at or last_seen, id)
+RetentionKey = Tuple[datetime, int]
+
+
+class RetentionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def partition_expired(self, name: str, now: datetime) -> bool:
+        """
+        True when no row of a raw_errors partition is kept past now.
+        Both probes are answered from the partition's expires_at index.
+        """
+        keep = await self.session.scalar(text(
+            f'SELECT EXISTS (SELECT 1 FROM "{name}" WHERE expires_at IS NULL) '
+            f'OR EXISTS (SELECT 1 FROM "{name}" WHERE expires_at >= :now)'
+        ), {"now": now})
+        return not keep
+
+    async def delete_expired_raw_errors(
+        self,
+        now: datetime,
+        batch_size: int,
+        after: Optional[RetentionKey] = None,
+    ) -> Tuple[int, int, Optional[RetentionKey]]:
+        """
+        Delete up to batch_size raw errors that expired before now, and
+        their events, in (expires_at, id) order after the given key.
+        Rows locked by another transaction are skipped and left for the
+        next run. Returns the raw errors and events deleted and the key to
+        continue from, None once nothing is left.
+        """
+        batch = (
+            select(RawError.id, RawError.received_at, RawError.expires_at)
+            .where(RawError.expires_at < now)
+            .order_by(RawError.expires_at, RawError.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        if after is not None:
+            batch = batch.where(tuple_(RawError.expires_at, RawError.id) > tuple_(
+                literal(after[0], RawError.expires_at.type), literal(after[1]),
+            ))
+        batch = batch.cte("batch")
+
+        # Events are recorded after their raw error is received, within a
+        # day as the partition sweep assumes, so the batch's received_at
+        # range bounds their timestamps and prunes error_events
+        # partitions at execution; the hour allows for clock skew between
+        # the API and the workers. Later events go with their partition
+        deleted_events = (
+            delete(ErrorEvent)
+            .where(
+                ErrorEvent.raw_error_id.in_(select(batch.c.id)),
+                ErrorEvent.timestamp >= select(func.min(batch.c.received_at)).scalar_subquery() - timedelta(hours=1),
+                ErrorEvent.timestamp < select(func.max(batch.c.received_at)).scalar_subquery() + timedelta(days=1),
+            )
+            .returning(ErrorEvent.id)
+            .cte("deleted_events")
+        )
+        deleted = (
+            delete(RawError)
+            .where(
+                RawError.id == batch.c.id,
+                RawError.received_at == batch.c.received_at,
+            )
+            .returning(RawError.id)
+            .cte("deleted")
+        )
+        last = (
+            select(batch.c.expires_at, batch.c.id)
+            .order_by(batch.c.expires_at.desc(), batch.c.id.desc())
+            .limit(1)
+            .subquery("last")
+        )
+        statement = select(
+            select(func.count()).select_from(deleted).scalar_subquery(),
+            select(func.count()).select_from(deleted_events).scalar_subquery(),
+            select(last.c.expires_at).scalar_subquery(),
+            select(last.c.id).scalar_subquery(),
+        )
+        result = await self.session.execute(statement)
+        raw_count, event_count, last_expires_at, last_id = result.one()
+        await self.session.commit()
+
+        if last_id is None:
+            return raw_count, event_count, None
+        return raw_count, event_count, (last_expires_at, last_id)
+
+    async def delete_orphaned_groups(
+        self,
+        now: datetime,
+        batch_size: int,
+        after: Optional[RetentionKey] = None,
+    ) -> Tuple[int, Optional[RetentionKey]]:
+        """
+        Delete up to batch_size groups not seen within their project's
+        retention that have no events left, in (last_seen, id) order after
+        the given key. Rollups go with them through their foreign key.
+        Returns the groups deleted and the key to continue from.
+        """
+        batch = (
+            select(ErrorGroup.id, ErrorGroup.last_seen)
+            .join(Project, Project.id == ErrorGroup.project_id)
+            .where(
+                Project.retention_days > 0,
+                ErrorGroup.last_seen < literal(now, ErrorGroup.last_seen.type) - func.make_interval(0, 0, 0, Project.retention_days),
+            )
+            .order_by(ErrorGroup.last_seen, ErrorGroup.id)
+            .limit(batch_size)
+            .with_for_update(of=ErrorGroup, skip_locked=True)
+        )
+        if after is not None:
+            batch = batch.where(tuple_(ErrorGroup.last_seen, ErrorGroup.id) > tuple_(
+                literal(after[0], ErrorGroup.last_seen.type), literal(after[1]),
+            ))
+        batch = batch.cte("batch")
+
+        deleted = (
+            delete(ErrorGroup)
+            .where(
+                ErrorGroup.id == batch.c.id,
+                ~exists().where(ErrorEvent.group_fingerprint == ErrorGroup.fingerprint),
+            )
+            .returning(ErrorGroup.id)
+            .cte("deleted")
+        )
+        last = (
+            select(batch.c.last_seen, batch.c.id)
+            .order_by(batch.c.last_seen.desc(), batch.c.id.desc())
+            .limit(1)
+            .subquery("last")
+        )
+        statement = select(
+            select(func.count()).select_from(deleted).scalar_subquery(),
+            select(last.c.last_seen).scalar_subquery(),
+            select(last.c.id).scalar_subquery(),
+        )
+        result = await self.session.execute(statement)
+        count, last_seen, last_id = result.one()
+        await self.session.commit()
+
+        if last_id is None:
+            return count, None
+        return count, (last_seen, last_id)
@@ -0,0 +1,85 @@
+from datetime import datetime
+from sqlalchemy import select, delete, func, literal, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.rollups import ErrorGroupRollup, RollupGranularity
+
+
+def truncate_bucket(moment: datetime, granularity: RollupGranularity) -> datetime:
+    """Start of the bucket of the given granularity containing moment"""
+    moment = moment.replace(second=0, microsecond=0)
+    if granularity in (RollupGranularity.HOUR, RollupGranularity.DAY):
+        moment = moment.replace(minute=0)
+    if granularity == RollupGranularity.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+class RollupRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def compact(
+        self,
+        source: RollupGranularity,
+        target: RollupGranularity,
+        older_than: datetime,
+        batch_size: int,
+    ) -> int:
+        """
+        Move up to batch_size buckets of the source granularity that start
+        before older_than into buckets of the target granularity. The
+        delete and the merge happen in one statement, so counts are never
+        lost or double counted; users sketches are merged register-wise.
+        Returns the number of source rows moved.
+        """
+        cutoff = truncate_bucket(older_than, target)
+        batch = (
+            select(ErrorGroupRollup.id)
+            .where(
+                ErrorGroupRollup.granularity == source.value,
+                ErrorGroupRollup.bucket_start < cutoff,
+            )
+            .order_by(ErrorGroupRollup.bucket_start)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(ErrorGroupRollup)
+            .where(ErrorGroupRollup.id.in_(batch.scalar_subquery()))
+            .returning(
+                ErrorGroupRollup.group_id,
+                ErrorGroupRollup.project_id,
+                ErrorGroupRollup.bucket_start,
+                ErrorGroupRollup.count,
+                ErrorGroupRollup.users_sketch,
+            )
+            .cte("moved")
+        )
+        target_bucket = literal_column(
+            f"date_trunc('{target.value}', moved.bucket_start AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+        )
+        merge = pg_insert(ErrorGroupRollup).from_select(
+            ["group_id", "project_id", "granularity", "bucket_start", "count", "users_sketch"],
+            select(
+                moved.c.group_id,
+                moved.c.project_id,
+                literal(target.value),
+                target_bucket,
+                func.sum(moved.c.count),
+                func.hll_union(moved.c.users_sketch),
+            ).group_by(moved.c.group_id, moved.c.project_id, target_bucket),
+        )
+        merge = merge.on_conflict_do_update(
+            constraint="uq_error_group_rollups_bucket",
+            set_={
+                "count": ErrorGroupRollup.count + merge.excluded.count,
+                "users_sketch": func.hll_merge(ErrorGroupRollup.users_sketch, merge.excluded.users_sketch),
+                "updated_at": func.now(),
+            },
+        )
+        statement = select(func.count()).select_from(moved).add_cte(merge.cte("merged"))
+        result = await self.session.execute(statement)
+        moved_count = result.scalar_one()
+        await self.session.commit()
+        return moved_count
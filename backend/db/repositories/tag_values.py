@@ -0,0 +1,152 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, delete, func, case, and_, tuple_, values, column
+from sqlalchemy import BigInteger, Integer, String, TIMESTAMP
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.tag_values import GroupTagValue
+
+# Longer tag keys and values are truncated to the column size
+MAX_TAG_LENGTH = 200
+
+# (group ID, project ID, tags, seen at) of one recorded event
+TaggedEvent = Tuple[int, int, Dict[str, str], datetime]
+
+
+class TagValueRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record(self, events: List[TaggedEvent], values_per_key: int) -> None:
+        """
+        Count the tag values of recorded events, without committing.
+        Each (group, key) keeps at most values_per_key values as a
+        space-saving sketch: a value that is not tracked yet while the key
+        is full starts from the smallest count of the key, and the values
+        with the lowest counts are dropped, so frequent values survive
+        high-cardinality keys such as request IDs.
+        """
+        counted: Dict[Tuple[int, str, str], Dict] = {}
+        for group_id, project_id, tags, seen_at in events:
+            for key, value in (tags or {}).items():
+                key, value = key[:MAX_TAG_LENGTH], str(value)[:MAX_TAG_LENGTH]
+                row = counted.get((group_id, key, value))
+                if row is None:
+                    counted[(group_id, key, value)] = {
+                        "group_id": group_id,
+                        "project_id": project_id,
+                        "key": key,
+                        "value": value,
+                        "n": 1,
+                        "first_seen": seen_at,
+                        "last_seen": seen_at,
+                    }
+                else:
+                    row["n"] += 1
+                    row["first_seen"] = min(row["first_seen"], seen_at)
+                    row["last_seen"] = max(row["last_seen"], seen_at)
+        if not counted:
+            return
+
+        incoming_values = values(
+            column("group_id", BigInteger),
+            column("project_id", Integer),
+            column("key", String),
+            column("value", String),
+            column("n", BigInteger),
+            column("first_seen", TIMESTAMP(timezone=True)),
+            column("last_seen", TIMESTAMP(timezone=True)),
+            name="rows",
+        ).data([
+            (row["group_id"], row["project_id"], row["key"], row["value"], row["n"], row["first_seen"], row["last_seen"])
+            # Sorted so concurrent batches lock shared rows in the same order
+            for _, row in sorted(counted.items())
+        ])
+        incoming = select(incoming_values).cte("incoming")
+
+        # Count a new value inherits when its key is already full
+        keys = select(incoming.c.group_id, incoming.c.key).distinct().subquery("keys")
+        floor = (
+            select(
+                keys.c.group_id,
+                keys.c.key,
+                case(
+                    (func.count(GroupTagValue.id) >= values_per_key, func.min(GroupTagValue.count)),
+                    else_=0,
+                ).label("base"),
+            )
+            .select_from(keys)
+            .outerjoin(
+                GroupTagValue,
+                and_(GroupTagValue.group_id == keys.c.group_id, GroupTagValue.key == keys.c.key),
+            )
+            .group_by(keys.c.group_id, keys.c.key)
+            .subquery("floor")
+        )
+        upsert = pg_insert(GroupTagValue).from_select(
+            ["group_id", "project_id", "key", "value", "count", "error", "first_seen", "last_seen"],
+            select(
+                incoming.c.group_id,
+                incoming.c.project_id,
+                incoming.c.key,
+                incoming.c.value,
+                floor.c.base + incoming.c.n,
+                floor.c.base,
+                incoming.c.first_seen,
+                incoming.c.last_seen,
+            )
+            .join(floor, and_(floor.c.group_id == incoming.c.group_id, floor.c.key == incoming.c.key))
+            .order_by(incoming.c.group_id, incoming.c.key, incoming.c.value),
+        )
+        await self.session.execute(
+            upsert.on_conflict_do_update(
+                constraint="uq_group_tag_values_value",
+                set_={
+                    # Tracked values only add this batch's events
+                    "count": GroupTagValue.count + upsert.excluded.count - upsert.excluded.error,
+                    "last_seen": func.greatest(GroupTagValue.last_seen, upsert.excluded.last_seen),
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+        # Drop the lowest counts of keys that went over the cap
+        touched = sorted({(row["group_id"], row["key"]) for row in counted.values()})
+        ranked = (
+            select(
+                GroupTagValue.id,
+                func.row_number().over(
+                    partition_by=(GroupTagValue.group_id, GroupTagValue.key),
+                    order_by=(GroupTagValue.count.desc(), GroupTagValue.last_seen.desc()),
+                ).label("rank"),
+            )
+            .where(tuple_(GroupTagValue.group_id, GroupTagValue.key).in_(touched))
+            .subquery("ranked")
+        )
+        await self.session.execute(
+            delete(GroupTagValue).where(
+                GroupTagValue.id.in_(select(ranked.c.id).where(ranked.c.rank > values_per_key))
+            )
+        )
+
+    async def top_values(self, group_id: int, key: Optional[str] = None, limit: int = 10) -> List[GroupTagValue]:
+        """Most frequent values of each tag key of a group, ordered by key then count"""
+        ranked = select(
+            GroupTagValue,
+            func.row_number().over(
+                partition_by=GroupTagValue.key,
+                order_by=(GroupTagValue.count.desc(), GroupTagValue.value),
+            ).label("rank"),
+        ).where(GroupTagValue.group_id == group_id)
+        if key is not None:
+            ranked = ranked.where(GroupTagValue.key == key)
+        ranked = ranked.subquery("ranked")
+
+        tag_value = aliased(GroupTagValue, ranked)
+        result = await self.session.execute(
+            select(tag_value)
+            .where(ranked.c.rank <= limit)
+            .order_by(tag_value.key, tag_value.count.desc(), tag_value.value)
+        )
+        return list(result.scalars().all())
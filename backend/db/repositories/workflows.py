@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import List
+from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.workflows import PendingWorkflowStart
+
+
+class PendingWorkflowStartRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record(self, starts: List[PendingWorkflowStart]) -> None:
+        """Keep workflow starts that failed so they can be re-driven"""
+        self.session.add_all(starts)
+        await self.session.commit()
+
+    async def claim(self, limit: int) -> List[PendingWorkflowStart]:
+        """
+        Lock up to limit pending starts, oldest first, without committing.
+        Starts locked by another re-drive are skipped.
+        """
+        result = await self.session.execute(
+            select(PendingWorkflowStart)
+            .order_by(PendingWorkflowStart.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars())
+
+    async def delete(self, ids: List[int]) -> None:
+        """Drop started workflows, without committing"""
+        if ids:
+            await self.session.execute(delete(PendingWorkflowStart).where(PendingWorkflowStart.id.in_(ids)))
+
+    async def record_failure(self, id: int, error: str, now: datetime) -> None:
+        """Count a failed re-drive attempt, without committing"""
+        await self.session.execute(
+            update(PendingWorkflowStart)
+            .where(PendingWorkflowStart.id == id)
+            .values(
+                attempts=PendingWorkflowStart.attempts + 1,
+                last_error=error,
+                last_attempt_at=now,
+            )
+        )
@@ -0,0 +1,32 @@
+from sqlalchemy import func, literal_column, or_
+
+# Error text is mostly identifiers, paths and codes, so it is indexed
+# without stemming or stop words. Generated search_vector columns use the
+# same configuration.
+SEARCH_CONFIG = "simple"
+
+# pg_trgm indexes three-character trigrams; a shorter ILIKE pattern has
+# none to look up and falls back to scanning every row
+TRIGRAM_MIN_LENGTH = 3
+
+
+def search_query(q: str):
+    """tsquery for a web-style search string (quoted phrases, OR, -word)"""
+    return func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), q)
+
+
+def substring_pattern(q: str) -> str:
+    """ILIKE pattern matching q anywhere, with LIKE wildcards in q escaped"""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search_condition(search_vector, substring_column, q: str):
+    """
+    Match q as words in search_vector, or as a substring of
+    substring_column when q is long enough for its trigram index.
+    """
+    matches_words = search_vector.op("@@")(search_query(q))
+    if len(q) < TRIGRAM_MIN_LENGTH:
+        return matches_words
+    return or_(matches_words, substring_column.ilike(substring_pattern(q), escape="\\"))
@@ -1,10 +1,127 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from config import settings
 
-engine = create_async_engine(settings.database_url, echo=True)
+logger = logging.getLogger(__name__)
+
+
+def create_engine(profile: str = "api", url: Optional[str] = None) -> AsyncEngine:
+    """
+    Create the database engine for a process profile.
+    The API serves many short requests, the Temporal worker runs fewer but
+    longer activities, so pool size and statement timeout are set per
+    profile; everything else is shared. The read profile uses the API
+    pool on the replica URL with read-only transactions.
+    """
+    if profile == "worker":
+        pool_size = settings.db_worker_pool_size
+        max_overflow = settings.db_worker_max_overflow
+        statement_timeout_ms = settings.db_worker_statement_timeout_ms
+    else:
+        pool_size = settings.db_pool_size
+        max_overflow = settings.db_max_overflow
+        statement_timeout_ms = settings.db_statement_timeout_ms
+
+    server_settings = {
+        "statement_timeout": str(statement_timeout_ms),
+        "application_name": f"fault-watch-{profile}",
+    }
+    if profile == "read":
+        server_settings["default_transaction_read_only"] = "on"
+
+    return create_async_engine(
+        url or settings.database_url,
+        echo=settings.db_echo,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            # Set both to 0 when connecting through PgBouncer in transaction mode
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "statement_cache_size": settings.db_statement_cache_size,
+            "server_settings": server_settings,
+        },
+    )
+
+
+engine = create_engine("api")
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+
+def configure_engine(profile: str) -> AsyncEngine:
+    """Switch this process to another engine profile before it opens any connection"""
+    global engine
+    engine = create_engine(profile)
+    async_session.configure(bind=engine)
+    return engine
+
+
+class ReplicaLagCheck:
+    """
+    Decides whether the read replica may serve queries.
+    Replication lag is measured at most once per ``check_interval``
+    seconds; an unreachable replica counts as lagging.
+    """
+
+    # Zero when the replica has replayed everything it received, so an
+    # idle primary does not look like lag; a server that is not a replica
+    # reports no replay timestamp and also counts as caught up
+    LAG_QUERY = text(
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self, engine: AsyncEngine, max_lag: float, check_interval: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._usable = True
+        self._checked_at: Optional[float] = None
+
+    async def usable(self) -> bool:
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self._usable = await self._check()
+        return self._usable
+
+    async def _measure_lag(self) -> float:
+        async with self.engine.connect() as connection:
+            return float(await connection.scalar(self.LAG_QUERY))
+
+    async def _check(self) -> bool:
+        try:
+            lag = await asyncio.wait_for(self._measure_lag(), timeout=self.check_interval)
+        except Exception as e:
+            logger.warning(f"Read replica unavailable, reading from primary: {e}")
+            return False
+        if lag > self.max_lag:
+            logger.warning(f"Read replica is {lag:.1f}s behind, reading from primary")
+            return False
+        return True
+
+
+read_engine: Optional[AsyncEngine] = None
+async_read_session = async_session
+replica_lag_check: Optional[ReplicaLagCheck] = None
+if settings.database_read_url:
+    read_engine = create_engine("read", url=settings.database_read_url)
+    async_read_session = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    replica_lag_check = ReplicaLagCheck(
+        read_engine,
+        max_lag=settings.db_read_max_lag_seconds,
+        check_interval=settings.db_read_lag_check_seconds,
+    )
+
+
 async def get_db():
     async with async_session() as session:
         yield session
@@ -12,4 +129,16 @@ async def get_db():
 async def get_db_session() -> AsyncSession:
     """Get a database session for dependency injection."""
     async with async_session() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def read_session_factory() -> sessionmaker:
+    """Session factory for reads: the replica when one is configured and caught up, else the primary"""
+    if replica_lag_check is not None and await replica_lag_check.usable():
+        return async_read_session
+    return async_session
+
+async def get_read_session() -> AsyncSession:
+    """Get a read-only session, on the replica when one is configured and caught up."""
+    factory = await read_session_factory()
+    async with factory() as session:
+        yield session
@@ -0,0 +1,33 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict
+from db.session import async_session, configure_engine
+from workflows.maintenance import sweep_retention
+
+logger = logging.getLogger(__name__)
+
+async def run_sweep() -> Dict[str, int]:
+    """Run one retention sweep outside Temporal, logging progress per batch"""
+    engine = configure_engine("worker")
+    deleted: Dict[str, int] = {}
+
+    def on_batch(stage: str, count: int):
+        deleted[stage] = deleted.get(stage, 0) + count
+        if count:
+            logger.info(f"Deleted {count} from {stage} ({deleted[stage]} total)")
+
+    try:
+        async with async_session() as session:
+            await sweep_retention(session, datetime.now(timezone.utc), on_batch)
+    finally:
+        await engine.dispose()
+    return deleted
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    deleted = asyncio.run(run_sweep())
+    logger.info(f"Retention sweep finished: {deleted}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+from temporalio.client import Client, WorkflowHandle
+from temporalio.converter import DataConverter
+from temporalio.exceptions import WorkflowAlreadyStartedError
+from temporalio.service import RPCError, RPCStatusCode
+
+from temporal_codec import build_data_converter
+from temporal_config import temporal_settings
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean the request never reached the server and the
+# connection itself should be rebuilt before retrying. UNKNOWN is left
+# out: the call may have been applied, and retrying it is not safe.
+RECONNECT_STATUS_CODES = {RPCStatusCode.UNAVAILABLE}
+
+
+class TemporalClientManager:
+    """
+    Owns a single long-lived Temporal client for the API process.
+    The client is created lazily on first use, shared by every request
+    and rebuilt when the underlying connection fails.
+    """
+
+    def __init__(self, host_port: str, namespace: str, data_converter: Optional[DataConverter] = None):
+        self.host_port = host_port
+        self.namespace = namespace
+        self.data_converter = data_converter or DataConverter.default
+        self._client: Optional[Client] = None
+        self._lock = asyncio.Lock()
+
+    async def get_client(self) -> Client:
+        """Return the shared client, connecting on first use"""
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    logger.info(f"Connecting Temporal client to {self.host_port}")
+                    self._client = await Client.connect(
+                        self.host_port,
+                        namespace=self.namespace,
+                        data_converter=self.data_converter,
+                    )
+        return self._client
+
+    async def reset(self, stale: Client) -> None:
+        """Drop a broken client so the next call reconnects"""
+        async with self._lock:
+            if self._client is stale:
+                self._client = None
+
+    async def start_workflow(self, workflow: Any, *args: Any, **kwargs: Any) -> WorkflowHandle:
+        """
+        Start a workflow, reconnecting once if the connection is unavailable.
+        Workflow ids are deterministic, so if the first attempt did reach
+        the server the retry finds the workflow already started and the
+        handle of that run is returned.
+        """
+        client = await self.get_client()
+        try:
+            return await client.start_workflow(workflow, *args, **kwargs)
+        except RPCError as e:
+            if e.status not in RECONNECT_STATUS_CODES:
+                raise
+            logger.warning(f"Temporal connection failed ({e.status.name}), reconnecting")
+            await self.reset(client)
+            client = await self.get_client()
+        try:
+            return await client.start_workflow(workflow, *args, **kwargs)
+        except WorkflowAlreadyStartedError as e:
+            logger.info(f"Workflow {e.workflow_id} was started by the failed attempt")
+            return client.get_workflow_handle_for(workflow, e.workflow_id, run_id=e.run_id)
+
+    async def close(self) -> None:
+        """
+        Drop the shared client on shutdown.
+        The SDK client has no close method; its connection is released
+        when the last reference to it goes away.
+        """
+        async with self._lock:
+            if self._client is not None:
+                logger.info("Closing Temporal client")
+                self._client = None
+
+
+temporal_client = TemporalClientManager(
+    host_port=temporal_settings.host_port,
+    namespace=temporal_settings.namespace,
+    data_converter=build_data_converter(
+        temporal_settings.payload_compression,
+        min_size=temporal_settings.payload_compression_min_bytes,
+    ),
+)
+
+
+async def get_temporal_client() -> TemporalClientManager:
+    """Get the shared Temporal client for dependency injection."""
+    return temporal_client
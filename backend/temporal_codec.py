@@ -0,0 +1,78 @@
+import dataclasses
+import zlib
+from typing import List, Optional, Sequence
+
+import temporalio.converter
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter, PayloadCodec
+
+ENCODINGS = {
+    "zlib": b"binary/zlib",
+    "zstd": b"binary/zstd",
+}
+
+
+class CompressionCodec(PayloadCodec):
+    """
+    Compresses Temporal payloads before they reach the server.
+    Payloads smaller than ``min_size`` bytes are passed through unchanged.
+    Decoding recognises every supported encoding, so switching the
+    algorithm or turning compression off never breaks existing histories.
+    """
+
+    def __init__(self, algorithm: str, min_size: int = 0, level: Optional[int] = None):
+        if algorithm not in ENCODINGS:
+            raise ValueError(f"Unsupported payload compression: {algorithm}")
+        self.algorithm = algorithm
+        self.min_size = min_size
+        self.level = level
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            import zstandard
+            return zstandard.ZstdCompressor(level=self.level or 3).compress(data)
+        return zlib.compress(data, self.level if self.level is not None else 6)
+
+    def _decompress(self, encoding: bytes, data: bytes) -> bytes:
+        if encoding == ENCODINGS["zstd"]:
+            import zstandard
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        encoded = []
+        for payload in payloads:
+            data = payload.SerializeToString()
+            if len(data) < self.min_size:
+                encoded.append(payload)
+                continue
+            encoded.append(Payload(
+                metadata={"encoding": ENCODINGS[self.algorithm]},
+                data=self._compress(data),
+            ))
+        return encoded
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        decoded = []
+        for payload in payloads:
+            encoding = payload.metadata.get("encoding")
+            if encoding not in ENCODINGS.values():
+                decoded.append(payload)
+                continue
+            decoded.append(Payload.FromString(self._decompress(encoding, payload.data)))
+        return decoded
+
+
+def build_data_converter(compression: str, min_size: int = 0) -> DataConverter:
+    """Default data converter, compressing payloads when ``compression`` is set"""
+    if not compression:
+        return temporalio.converter.default()
+    if compression == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise RuntimeError("zstd payload compression requires the 'zstandard' package")
+    return dataclasses.replace(
+        temporalio.converter.default(),
+        payload_codec=CompressionCodec(compression, min_size=min_size),
+    )
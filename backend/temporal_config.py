@@ -4,5 +4,8 @@ class TemporalSettings:
     host_port: str = os.environ.get("TEMPORAL_HOST_PORT", "temporal:7233")
     namespace: str = os.environ.get("TEMPORAL_NAMESPACE", "default")
     task_queue: str = os.environ.get("TEMPORAL_TASK_QUEUE", "error-processing")
+    # Payload compression: "", "zlib" or "zstd" (needs the zstandard package)
+    payload_compression: str = os.environ.get("TEMPORAL_PAYLOAD_COMPRESSION", "")
+    payload_compression_min_bytes: int = int(os.environ.get("TEMPORAL_PAYLOAD_COMPRESSION_MIN_BYTES", "256"))
 
 temporal_settings = TemporalSettings() 
\ No newline at end of file
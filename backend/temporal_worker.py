@@ -1,33 +1,250 @@
 import asyncio
-from temporalio.client import Client
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+from temporalio.client import (
+    Client,
+    Schedule,
+    ScheduleActionStartWorkflow,
+    ScheduleAlreadyRunningError,
+    ScheduleHandle,
+    ScheduleIntervalSpec,
+    ScheduleOverlapPolicy,
+    SchedulePolicy,
+    ScheduleSpec,
+    ScheduleUpdate,
+    ScheduleUpdateInput,
+)
+from temporalio.runtime import PrometheusConfig, Runtime, TelemetryConfig
 from temporalio.worker import Worker
+from db.session import configure_engine
+from temporal_codec import build_data_converter
 from workflow_config import get_settings
 from workflows.error_processing import (
     ErrorProcessingWorkflow,
+    ErrorBatchProcessingWorkflow,
+    ErrorGroupProcessingWorkflow,
     process_error_activity,
+    process_error_batch,
+    process_error_batch_pipeline_activity,
+    process_error_pipeline_activity,
+    process_error_pipeline_batch,
+    record_group_events_activity,
     deduplicate_errors_activity,
     update_group_statistics_activity
 )
+from workflows.batching import configure_process_error_batcher, configure_process_error_pipeline_batcher
+from workflows.maintenance import (
+    PartitionMaintenanceWorkflow,
+    RetentionSweepWorkflow,
+    RollupCompactionWorkflow,
+    WorkflowStartRedriveWorkflow,
+    compact_rollups_activity,
+    ensure_partitions_activity,
+    redrive_workflow_starts_activity,
+    sweep_retention_activity,
+)
+
+logger = logging.getLogger(__name__)
+
+async def ensure_maintenance_schedules(client: Client, settings: dict):
+    """
+    Create the schedules for periodic maintenance workflows, or update
+    existing ones whose interval differs from the configured one.
+    """
+    schedules = {
+        "rollup-compaction": (
+            RollupCompactionWorkflow.run,
+            timedelta(minutes=settings["rollup_compaction_interval_minutes"]),
+        ),
+        "partition-maintenance": (
+            PartitionMaintenanceWorkflow.run,
+            timedelta(minutes=settings["partition_maintenance_interval_minutes"]),
+        ),
+        "retention-sweep": (
+            RetentionSweepWorkflow.run,
+            timedelta(minutes=settings["retention_sweep_interval_minutes"]),
+        ),
+        "workflow-start-redrive": (
+            WorkflowStartRedriveWorkflow.run,
+            timedelta(minutes=settings["workflow_start_redrive_interval_minutes"]),
+        ),
+    }
+    for schedule_id, (workflow_run, every) in schedules.items():
+        schedule = Schedule(
+            action=ScheduleActionStartWorkflow(
+                workflow_run,
+                id=schedule_id,
+                task_queue=settings["temporal_task_queue"],
+            ),
+            spec=ScheduleSpec(intervals=[ScheduleIntervalSpec(every=every)]),
+            policy=SchedulePolicy(overlap=ScheduleOverlapPolicy.SKIP),
+        )
+        try:
+            await client.create_schedule(schedule_id, schedule)
+        except ScheduleAlreadyRunningError:
+            await _update_schedule_interval(client.get_schedule_handle(schedule_id), schedule, every)
+
+async def _update_schedule_interval(handle: ScheduleHandle, schedule: Schedule, every: timedelta):
+    """Replace an existing schedule whose interval no longer matches the configured one"""
+    def updater(input: ScheduleUpdateInput) -> Optional[ScheduleUpdate]:
+        spec = input.description.schedule.spec
+        if spec.calendars or spec.cron_expressions or [interval.every for interval in spec.intervals] != [every]:
+            logger.info(f"Updating schedule {handle.id} to run every {every}")
+            return ScheduleUpdate(schedule=schedule)
+        return None
+    
+    await handle.update(updater)
 
-async def run_worker():
+def _metrics_bind_address(bind_address: str, worker_index: int) -> str:
+    """Give every worker process its own metrics port, counting up from the configured one"""
+    host, _, port = bind_address.rpartition(":")
+    return f"{host}:{int(port) + worker_index}"
+
+async def run_worker(worker_index: int = 0):
     settings = get_settings()
-    client = await Client.connect(settings["temporal_host_port"])
+    engine = configure_engine("worker")
+    
+    # Worker and batching metrics are served for Prometheus when an address is set
+    runtime = Runtime.default()
+    if settings["temporal_metrics_bind_address"]:
+        runtime = Runtime(telemetry=TelemetryConfig(
+            metrics=PrometheusConfig(
+                bind_address=_metrics_bind_address(settings["temporal_metrics_bind_address"], worker_index)
+            )
+        ))
+    
+    client = await Client.connect(
+        settings["temporal_host_port"],
+        runtime=runtime,
+        # Must match the API's converter so both sides can read the payloads
+        data_converter=build_data_converter(
+            settings["temporal_payload_compression"],
+            min_size=settings["temporal_payload_compression_min_bytes"],
+        ),
+    )
+    
+    # Schedules are shared, one process is enough to maintain them
+    if worker_index == 0:
+        await ensure_maintenance_schedules(client, settings)
+    
+    configure_process_error_batcher(
+        flush=process_error_batch,
+        max_size=settings["process_error_batch_size"],
+        linger=settings["process_error_batch_linger_ms"] / 1000,
+        meter=runtime.metric_meter,
+    )
+    configure_process_error_pipeline_batcher(
+        flush=process_error_pipeline_batch,
+        max_size=settings["process_error_batch_size"],
+        linger=settings["process_error_batch_linger_ms"] / 1000,
+        meter=runtime.metric_meter,
+    )
     
     worker = Worker(
         client,
         task_queue=settings["temporal_task_queue"],
-        workflows=[ErrorProcessingWorkflow],
+        workflows=[
+            ErrorProcessingWorkflow,
+            ErrorBatchProcessingWorkflow,
+            ErrorGroupProcessingWorkflow,
+            RollupCompactionWorkflow,
+            PartitionMaintenanceWorkflow,
+            RetentionSweepWorkflow,
+            WorkflowStartRedriveWorkflow,
+        ],
         activities=[
             process_error_activity,
+            process_error_pipeline_activity,
+            process_error_batch_pipeline_activity,
+            record_group_events_activity,
             deduplicate_errors_activity,
-            update_group_statistics_activity
-        ]
+            update_group_statistics_activity,
+            compact_rollups_activity,
+            ensure_partitions_activity,
+            sweep_retention_activity,
+            redrive_workflow_starts_activity
+        ],
+        max_concurrent_activities=settings["worker_max_concurrent_activities"],
+        max_concurrent_local_activities=settings["worker_max_concurrent_local_activities"],
+        max_concurrent_workflow_tasks=settings["worker_max_concurrent_workflow_tasks"],
+        max_cached_workflows=settings["worker_max_cached_workflows"],
+        max_concurrent_activity_task_polls=settings["worker_max_concurrent_activity_task_polls"],
+        max_concurrent_workflow_task_polls=settings["worker_max_concurrent_workflow_task_polls"],
+        graceful_shutdown_timeout=timedelta(seconds=settings["worker_graceful_shutdown_seconds"]),
     )
     
-    await worker.run()
+    # SIGTERM / SIGINT stop polling and let running tasks finish
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    
+    try:
+        async with worker:
+            await stop.wait()
+            logger.info(f"Worker {worker_index} shutting down")
+    finally:
+        await engine.dispose()
+
+def _worker_process(worker_index: int):
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker(worker_index))
+
+def run_worker_processes(count: int):
+    """
+    Run ``count`` worker processes and restart any that exit unexpectedly.
+    Processes are spawned rather than forked, so each one imports its own
+    SQLAlchemy engine and Temporal runtime. SIGTERM / SIGINT are forwarded
+    to every process and waited on for a graceful shutdown.
+    """
+    context = multiprocessing.get_context("spawn")
+    processes: Dict[int, multiprocessing.Process] = {}
+    stopping = False
+    
+    def start(worker_index: int):
+        process = context.Process(target=_worker_process, args=(worker_index,), name=f"worker-{worker_index}")
+        process.start()
+        processes[worker_index] = process
+    
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    
+    for worker_index in range(count):
+        start(worker_index)
+    logger.info(f"Started {count} worker processes")
+    
+    while not stopping:
+        multiprocessing.connection.wait([process.sentinel for process in processes.values()], timeout=1)
+        for worker_index, process in list(processes.items()):
+            if not process.is_alive() and not stopping:
+                logger.warning(f"Worker {worker_index} exited with code {process.exitcode}, restarting")
+                time.sleep(1)
+                start(worker_index)
+    
+    for process in processes.values():
+        process.join()
 
 def main():
-    asyncio.run(run_worker())
+    settings = get_settings()
+    count = settings["worker_processes"] or os.cpu_count() or 1
+    if count == 1:
+        _worker_process(0)
+    else:
+        logging.basicConfig(level=logging.INFO)
+        run_worker_processes(count)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
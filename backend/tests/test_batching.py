@@ -0,0 +1,42 @@
+import asyncio
+import unittest
+
+from workflows.batching import MicroBatcher
+
+
+class MicroBatcherTest(unittest.IsolatedAsyncioTestCase):
+    async def test_bad_item_only_fails_its_caller(self):
+        flushed = []
+        
+        async def flush(items):
+            if "bad" in items:
+                raise ValueError("bad item")
+            flushed.append(items)
+            return [item.upper() for item in items]
+        
+        batcher = MicroBatcher("test", flush=flush, max_size=4, linger=60, split_on=(ValueError,))
+        results = await asyncio.gather(
+            *[batcher.submit(item) for item in ("a", "bad", "c", "d")],
+            return_exceptions=True,
+        )
+        
+        self.assertEqual(results[0], "A")
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2:], ["C", "D"])
+        self.assertEqual(flushed, [["a"], ["c", "d"]])
+
+    async def test_other_failures_fail_the_whole_batch_once(self):
+        flushes = []
+        
+        async def flush(items):
+            flushes.append(items)
+            raise ConnectionError("database unavailable")
+        
+        batcher = MicroBatcher("test", flush=flush, max_size=4, linger=60, split_on=(ValueError,))
+        results = await asyncio.gather(
+            *[batcher.submit(item) for item in ("a", "b", "c", "d")],
+            return_exceptions=True,
+        )
+        
+        self.assertTrue(all(isinstance(result, ConnectionError) for result in results))
+        self.assertEqual(flushes, [["a", "b", "c", "d"]])
@@ -0,0 +1,159 @@
+"""
+Error processing tests.
+
+Tests that need Postgres run against TEST_DATABASE_URL, a database
+migrated with ``alembic upgrade head``, and are skipped when it is not
+set. Every test rolls back what it wrote. Run from the backend directory:
+
+    TEST_DATABASE_URL=postgresql+asyncpg://... python -m unittest
+"""
+import os
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+os.environ.setdefault("DATABASE_URL", TEST_DATABASE_URL or "postgresql+asyncpg://localhost/fault_watch_test")
+os.environ.setdefault("REDIS_URL", "redis://localhost")
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from api.errors.fingerprinting import ErrorFingerprinter
+from api.errors.schema import ErrorPayload
+from db.models.groups import ErrorGroup
+from db.models.organizations import Organization
+from db.models.projects import Project
+from db.models.tag_values import GroupTagValue
+from db.repositories.groups import GroupRepository
+from workflows.error_processing import (
+    _group_values,
+    _process_error,
+    _process_error_batch,
+    _record_events,
+    _update_group_statistics,
+    _user_key,
+)
+
+
+def error_payload(project_id: int, value: str = None, **fields) -> ErrorPayload:
+    """Payload of a new group, or of the group of ``value`` when given"""
+    return ErrorPayload(
+        project_id=project_id,
+        service="checkout",
+        message="Payment declined",
+        exception={"type": "PaymentError", "value": value or f"declined {uuid.uuid4().hex}"},
+        **fields,
+    )
+
+
+class WorkflowInputsTest(unittest.TestCase):
+    def test_tags_reach_the_workflow(self):
+        payload = error_payload(1, tags={"region": "eu", "plan": "pro"})
+        inputs = ErrorFingerprinter().workflow_inputs(payload)
+        
+        self.assertEqual(ErrorPayload(**inputs).tags, {"region": "eu", "plan": "pro"})
+
+    def test_users_reach_the_workflow(self):
+        fingerprinter = ErrorFingerprinter()
+        by_id = error_payload(1, user={"id": "42", "email": "a@example.com", "ip_address": "10.0.0.1"})
+        by_ip = error_payload(1, user={"ip_address": "10.0.0.1"})
+        
+        self.assertEqual(_user_key(ErrorPayload(**fingerprinter.workflow_inputs(by_id))), "id:42")
+        self.assertEqual(_user_key(ErrorPayload(**fingerprinter.workflow_inputs(by_ip))), "ip:10.0.0.1")
+        self.assertNotIn("email", fingerprinter.workflow_inputs(by_id)["user"])
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class ProcessErrorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_async_engine(TEST_DATABASE_URL)
+        self.session = AsyncSession(self.engine, expire_on_commit=False)
+        
+        organization = Organization(name="Test", slug=f"test-{uuid.uuid4().hex}")
+        self.session.add(organization)
+        await self.session.flush()
+        project = Project(organization_id=organization.id, name="Test", slug="test")
+        self.session.add(project)
+        await self.session.flush()
+        self.project_id = project.id
+        self.fingerprinter = ErrorFingerprinter()
+        self.next_raw_error_id = 1
+
+    async def asyncTearDown(self):
+        await self.session.rollback()
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def process(self, payload: ErrorPayload) -> dict:
+        """Run an error through the workflow inputs and _process_error, as the worker does"""
+        error_data = {
+            "raw_error_id": self.next_raw_error_id,
+            "raw_error_received_at": datetime.now(timezone.utc).isoformat(),
+            "payload": self.fingerprinter.workflow_inputs(payload),
+        }
+        self.next_raw_error_id += 1
+        return await _process_error(self.session, error_data)
+
+    async def test_tags_are_counted_per_group(self):
+        result = await self.process(error_payload(self.project_id, tags={"region": "eu", "plan": "pro"}))
+        
+        rows = (await self.session.execute(
+            select(GroupTagValue.key, GroupTagValue.value, GroupTagValue.count)
+            .where(GroupTagValue.group_id == result["group_id"])
+            .order_by(GroupTagValue.key)
+        )).all()
+        self.assertEqual([tuple(row) for row in rows], [("plan", "pro", 1), ("region", "eu", 1)])
+
+    async def assert_users_counted(self, group_id: int, fingerprint: str, users: int):
+        await _update_group_statistics(self.session, fingerprint)
+        group = (await self.session.execute(
+            select(ErrorGroup.users_affected, ErrorGroup.unique_users_count, ErrorGroup.last_user_seen)
+            .where(ErrorGroup.id == group_id)
+        )).one()
+        self.assertEqual(group.users_affected, users)
+        self.assertEqual(group.unique_users_count, users)
+        self.assertIsNotNone(group.last_user_seen)
+        
+        since = datetime.now(timezone.utc) - timedelta(days=1)
+        self.assertEqual(await GroupRepository(self.session).count_unique_users(group_id, since=since), users)
+
+    async def test_users_are_counted_per_group(self):
+        value = f"declined {uuid.uuid4().hex}"
+        for user_id in ("a", "b", "a"):
+            result = await self.process(error_payload(self.project_id, value, user={"id": user_id}))
+        
+        await self.assert_users_counted(result["group_id"], result["fingerprint"], 2)
+
+    async def test_batched_events_count_users(self):
+        value = f"declined {uuid.uuid4().hex}"
+        seen_at = datetime.now(timezone.utc)
+        events = []
+        for raw_error_id, user_ip in enumerate(("10.0.0.1", "10.0.0.2", "10.0.0.3"), start=1):
+            payload = ErrorPayload(**self.fingerprinter.workflow_inputs(
+                error_payload(self.project_id, value, user={"ip_address": user_ip})
+            ))
+            events.append((_group_values(payload, self.fingerprinter), raw_error_id, seen_at, seen_at, payload))
+        
+        upserted = await _record_events(self.session, events)
+        fingerprint = events[0][0]["fingerprint"]
+        group_id, _ = upserted[fingerprint]
+        await self.assert_users_counted(group_id, fingerprint, 3)
+
+    async def test_batch_results_follow_input_order(self):
+        value = f"declined {uuid.uuid4().hex}"
+        payloads = [error_payload(self.project_id, value), error_payload(self.project_id), error_payload(self.project_id, value)]
+        errors = []
+        for payload in payloads:
+            errors.append({
+                "raw_error_id": self.next_raw_error_id,
+                "raw_error_received_at": datetime.now(timezone.utc).isoformat(),
+                "payload": self.fingerprinter.workflow_inputs(payload),
+            })
+            self.next_raw_error_id += 1
+        
+        results = await _process_error_batch(self.session, errors)
+        
+        self.assertEqual([result["raw_error_id"] for result in results], [error["raw_error_id"] for error in errors])
+        self.assertEqual(results[0]["group_id"], results[2]["group_id"])
+        self.assertNotEqual(results[0]["group_id"], results[1]["group_id"])
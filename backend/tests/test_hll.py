@@ -0,0 +1,29 @@
+import unittest
+
+from db.hll import hll_cardinality, hll_merge, hll_sketch
+
+
+class HyperLogLogTest(unittest.TestCase):
+    def test_small_counts_are_near_exact(self):
+        for users in (1, 10, 50):
+            estimate = hll_cardinality(hll_sketch(f"id:{user}" for user in range(users)))
+            
+            self.assertAlmostEqual(estimate, users, delta=max(1, users * 0.05))
+
+    def test_large_counts_are_within_error(self):
+        estimate = hll_cardinality(hll_sketch(f"id:{user}" for user in range(20000)))
+        
+        self.assertAlmostEqual(estimate, 20000, delta=20000 * 0.1)
+
+    def test_merge_counts_shared_users_once(self):
+        merged = hll_merge(hll_sketch(["id:a", "id:b"]), hll_sketch(["id:b", "id:c"]))
+        
+        self.assertEqual(hll_cardinality(merged), 3)
+        self.assertEqual(merged, hll_sketch(["id:a", "id:b", "id:c"]))
+
+    def test_merge_tolerates_missing_sketches(self):
+        sketch = hll_sketch(["id:a"])
+        
+        self.assertIs(hll_merge(None, sketch), sketch)
+        self.assertIs(hll_merge(sketch, None), sketch)
+        self.assertIsNone(hll_merge(None, None))
@@ -0,0 +1,154 @@
+"""
+Batch ingest tests.
+
+Tests that need Postgres run against TEST_DATABASE_URL, see
+test_error_processing, and are skipped when it is not set.
+"""
+import json
+import os
+import unittest
+import uuid
+from datetime import datetime, timezone
+from unittest import mock
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+os.environ.setdefault("DATABASE_URL", TEST_DATABASE_URL or "postgresql+asyncpg://localhost/fault_watch_test")
+os.environ.setdefault("REDIS_URL", "redis://localhost")
+
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.requests import Request
+
+from api.errors.controller import ErrorController, _parse_error_batch
+from config import settings
+from db.models.errors import RawError
+from db.models.organizations import Organization
+from db.models.projects import Project
+from db.repositories.errors import ErrorRepository
+
+
+def error_json(project_id: int = 1, message: str = "Payment declined") -> dict:
+    return {"project_id": project_id, "service": "checkout", "message": message}
+
+
+def batch_request(body: bytes, content_type: str) -> Request:
+    """Request for the batch route carrying body"""
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/projects/1/errors/batch",
+        "headers": [(b"content-type", content_type.encode())],
+    }
+    return Request(scope, receive)
+
+
+class ParseErrorBatchTest(unittest.TestCase):
+    def test_json_array(self):
+        body = json.dumps([error_json(message="first"), error_json(message="second")]).encode()
+
+        payloads = _parse_error_batch(body, "application/json")
+
+        self.assertEqual([payload.message for payload in payloads], ["first", "second"])
+
+    def test_ndjson_skips_blank_lines(self):
+        body = b"\n".join([
+            json.dumps(error_json(message="first")).encode(),
+            b"",
+            json.dumps(error_json(message="second")).encode(),
+            b"",
+        ])
+
+        payloads = _parse_error_batch(body, "application/x-ndjson; charset=utf-8")
+
+        self.assertEqual([payload.message for payload in payloads], ["first", "second"])
+
+    def test_ndjson_errors_point_at_the_line(self):
+        body = b"\n".join([json.dumps(error_json()).encode(), json.dumps({"project_id": 1}).encode()])
+
+        with self.assertRaises(RequestValidationError) as raised:
+            _parse_error_batch(body, "application/x-ndjson")
+
+        self.assertTrue(all(error["loc"][:2] == ("body", 1) for error in raised.exception.errors()))
+
+    def test_json_body_must_be_an_array(self):
+        with self.assertRaises(RequestValidationError):
+            _parse_error_batch(json.dumps(error_json()).encode(), "application/json")
+
+
+class IngestErrorBatchTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # Both checks answer before the service is used
+        self.controller = ErrorController(session=None, temporal_client=None)
+
+    async def test_empty_batch_is_rejected(self):
+        for body, content_type in ((b"[]", "application/json"), (b"\n\n", "application/x-ndjson")):
+            with self.assertRaises(HTTPException) as raised:
+                await self.controller.ingest_error_batch(batch_request(body, content_type), project_id=1)
+            self.assertEqual(raised.exception.status_code, 400)
+
+    async def test_oversized_batch_is_rejected(self):
+        body = json.dumps([error_json()] * 3).encode()
+
+        with mock.patch.object(settings, "ingest_batch_max_size", 2):
+            with self.assertRaises(HTTPException) as raised:
+                await self.controller.ingest_error_batch(batch_request(body, "application/json"), project_id=1)
+
+        self.assertEqual(raised.exception.status_code, 413)
+
+    async def test_project_must_match_every_payload(self):
+        body = json.dumps([error_json(1), error_json(2)]).encode()
+
+        with self.assertRaises(HTTPException) as raised:
+            await self.controller.ingest_error_batch(batch_request(body, "application/json"), project_id=1)
+
+        self.assertEqual(raised.exception.status_code, 400)
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class IngestErrorsTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # The repository commits, so the test runs in an outer transaction
+        # that its commits only release savepoints of
+        self.engine = create_async_engine(TEST_DATABASE_URL)
+        self.connection = await self.engine.connect()
+        self.transaction = await self.connection.begin()
+        self.session = AsyncSession(bind=self.connection, join_transaction_mode="create_savepoint")
+
+        organization = Organization(name="Test", slug=f"test-{uuid.uuid4().hex}")
+        self.session.add(organization)
+        await self.session.flush()
+        project = Project(organization_id=organization.id, name="Test", slug="test")
+        self.session.add(project)
+        await self.session.flush()
+        self.project_id = project.id
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.transaction.rollback()
+        await self.connection.close()
+        await self.engine.dispose()
+
+    async def test_ids_follow_input_order(self):
+        received_at = datetime.now(timezone.utc)
+        messages = [f"error {index}" for index in range(5)]
+
+        raw_error_ids = await ErrorRepository(self.session).ingest_errors([
+            {
+                "project_id": self.project_id,
+                "service": "checkout",
+                "message": message,
+                "received_at": received_at,
+                "timestamp": received_at,
+            }
+            for message in messages
+        ])
+
+        rows = dict((await self.session.execute(
+            select(RawError.id, RawError.message).where(RawError.id.in_(raw_error_ids))
+        )).all())
+        self.assertEqual([rows[raw_error_id] for raw_error_id in raw_error_ids], messages)
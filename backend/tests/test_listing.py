@@ -0,0 +1,168 @@
+"""
+Error and group listing tests: keyset pages and tag filters.
+
+They run against TEST_DATABASE_URL, see test_ingest, and are skipped
+when it is not set.
+"""
+import os
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+os.environ.setdefault("DATABASE_URL", TEST_DATABASE_URL or "postgresql+asyncpg://localhost/fault_watch_test")
+os.environ.setdefault("REDIS_URL", "redis://localhost")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from api.errors.service import ErrorService
+from api.groups.service import GroupService
+from db.models.errors import ErrorEvent, RawError
+from db.models.groups import ErrorGroup
+from db.models.organizations import Organization
+from db.models.projects import Project
+from db.repositories.errors import ErrorRepository
+from db.repositories.groups import GroupRepository
+from db.repositories.partitions import PARTITIONED_TABLES, default_partition_name
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class ListingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_async_engine(TEST_DATABASE_URL)
+        self.session = AsyncSession(self.engine, expire_on_commit=False)
+
+        organization = Organization(name="Test", slug=f"test-{uuid.uuid4().hex}")
+        self.session.add(organization)
+        await self.session.flush()
+        project = Project(organization_id=organization.id, name="Test", slug="test")
+        self.session.add(project)
+        await self.session.flush()
+        self.project_id = project.id
+        self.now = datetime.now(timezone.utc)
+
+        # Rows of days without a partition go to the default partitions,
+        # which partition maintenance creates
+        for table in PARTITIONED_TABLES:
+            await self.session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {default_partition_name(table)} PARTITION OF {table} DEFAULT"
+            ))
+
+    async def asyncTearDown(self):
+        await self.session.rollback()
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def add_error(self, timestamp: datetime, message: str = "Payment declined", **fields) -> RawError:
+        error = RawError(
+            project_id=self.project_id,
+            service="checkout",
+            message=message,
+            timestamp=timestamp,
+            received_at=self.now,
+            **fields,
+        )
+        self.session.add(error)
+        await self.session.flush()
+        return error
+
+    async def add_group(self, last_seen: datetime, title: str = "PaymentError: declined") -> ErrorGroup:
+        group = ErrorGroup(
+            project_id=self.project_id,
+            fingerprint=uuid.uuid4().hex,
+            grouping_key=uuid.uuid4().hex,
+            service="checkout",
+            title=title,
+            example_message=title,
+            first_seen=last_seen,
+            last_seen=last_seen,
+        )
+        self.session.add(group)
+        await self.session.flush()
+        return group
+
+    async def add_event(self, group: ErrorGroup, error: RawError) -> None:
+        self.session.add(ErrorEvent(
+            raw_error_id=error.id,
+            raw_error_received_at=error.received_at,
+            group_fingerprint=group.fingerprint,
+            timestamp=error.timestamp,
+            event_type="new",
+        ))
+        await self.session.flush()
+
+    async def error_pages(self, limit: int, **filters) -> list:
+        service = ErrorService(session=self.session, temporal_client=None)
+        pages, cursor = [], None
+        while True:
+            errors, cursor = await service.get_errors(self.project_id, limit=limit, cursor=cursor, **filters)
+            pages.append([error.id for error in errors])
+            if cursor is None:
+                return pages
+
+    async def group_pages(self, limit: int, **filters) -> list:
+        service = GroupService(session=self.session)
+        pages, cursor = [], None
+        while True:
+            groups, cursor = await service.list_groups(self.project_id, limit=limit, cursor=cursor, **filters)
+            pages.append([group.id for group in groups])
+            if cursor is None:
+                return pages
+
+    async def test_error_pages_follow_on_without_gaps(self):
+        # Two errors share a timestamp so the id has to break the tie
+        timestamps = [self.now - timedelta(minutes=minutes) for minutes in (1, 2, 2, 3, 4)]
+        errors = [await self.add_error(timestamp) for timestamp in timestamps]
+
+        pages = await self.error_pages(limit=2)
+
+        expected = [error.id for error in sorted(errors, key=lambda error: (error.timestamp, error.id), reverse=True)]
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), expected)
+
+    async def test_search_pages_follow_on_without_gaps(self):
+        for minutes in range(5):
+            await self.add_error(self.now - timedelta(minutes=minutes), message=f"Gateway timeout {minutes}")
+        await self.add_error(self.now, message="Payment declined")
+
+        pages = await self.error_pages(limit=2, q="timeout")
+
+        ids = sum(pages, [])
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+
+    async def test_group_pages_follow_on_without_gaps(self):
+        last_seen = [self.now - timedelta(minutes=minutes) for minutes in (1, 1, 2, 3, 4)]
+        groups = [await self.add_group(seen) for seen in last_seen]
+
+        pages = await self.group_pages(limit=2)
+
+        expected = [group.id for group in sorted(groups, key=lambda group: (group.last_seen, group.id), reverse=True)]
+        self.assertEqual(sum(pages, []), expected)
+
+    async def test_errors_match_every_tag(self):
+        both = await self.add_error(self.now, tags={"region": "eu", "plan": "pro"})
+        region = await self.add_error(self.now, tags={"region": "eu"})
+        await self.add_error(self.now, tags={"region": "us", "plan": "pro"})
+        repository = ErrorRepository(self.session)
+
+        eu = await repository.get_errors_by_project(self.project_id, tags={"region": "eu"})
+        eu_pro = await repository.get_errors_by_project(self.project_id, tags={"region": "eu", "plan": "pro"})
+
+        self.assertEqual({error.id for error in eu}, {both.id, region.id})
+        self.assertEqual([error.id for error in eu_pro], [both.id])
+
+    async def test_groups_match_tags_of_any_of_their_errors(self):
+        eu_group = await self.add_group(self.now)
+        us_group = await self.add_group(self.now)
+        await self.add_event(eu_group, await self.add_error(self.now, tags={"region": "us"}))
+        await self.add_event(eu_group, await self.add_error(self.now, tags={"region": "eu"}))
+        await self.add_event(us_group, await self.add_error(self.now, tags={"region": "us"}))
+        repository = GroupRepository(self.session)
+
+        eu = await repository.list(self.project_id, tags={"region": "eu"})
+        us = await repository.list(self.project_id, tags={"region": "us"})
+
+        self.assertEqual([group.id for group in eu], [eu_group.id])
+        self.assertEqual({group.id for group in us}, {eu_group.id, us_group.id})
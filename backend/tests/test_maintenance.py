@@ -0,0 +1,192 @@
+"""
+Retention and partition maintenance tests.
+
+They run against TEST_DATABASE_URL, see test_error_processing, and are
+skipped when it is not set. The repositories commit, so each test runs
+in an outer transaction that their commits only release savepoints of,
+and everything, partitions included, is rolled back afterwards.
+"""
+import os
+import unittest
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+os.environ.setdefault("DATABASE_URL", TEST_DATABASE_URL or "postgresql+asyncpg://localhost/fault_watch_test")
+os.environ.setdefault("REDIS_URL", "redis://localhost")
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from db.models.errors import ErrorEvent, RawError
+from db.models.groups import ErrorGroup
+from db.models.organizations import Organization
+from db.models.projects import Project
+from db.repositories.partitions import PARTITIONED_TABLES, PartitionRepository, default_partition_name, partition_name
+from db.repositories.retention import RetentionRepository
+
+# Far enough ahead that partition maintenance has not created these days
+FUTURE_DAY = date(2099, 1, 1)
+
+
+class MaintenanceTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_async_engine(TEST_DATABASE_URL)
+        self.connection = await self.engine.connect()
+        self.transaction = await self.connection.begin()
+        self.session = AsyncSession(bind=self.connection, expire_on_commit=False, join_transaction_mode="create_savepoint")
+
+        organization = Organization(name="Test", slug=f"test-{uuid.uuid4().hex}")
+        self.session.add(organization)
+        await self.session.flush()
+        project = Project(organization_id=organization.id, name="Test", slug="test", retention_days=7)
+        self.session.add(project)
+        await self.session.flush()
+        self.project_id = project.id
+        self.now = datetime.now(timezone.utc)
+
+        # Rows of days without a partition go to the default partitions,
+        # which partition maintenance creates
+        for table in PARTITIONED_TABLES:
+            await self.session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {default_partition_name(table)} PARTITION OF {table} DEFAULT"
+            ))
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.transaction.rollback()
+        await self.connection.close()
+        await self.engine.dispose()
+
+    async def add_error(self, received_at: datetime, expires_at: datetime = None) -> RawError:
+        error = RawError(
+            project_id=self.project_id,
+            service="checkout",
+            message="Payment declined",
+            timestamp=received_at,
+            received_at=received_at,
+            expires_at=expires_at,
+        )
+        self.session.add(error)
+        await self.session.flush()
+        return error
+
+    async def add_group(self, last_seen: datetime) -> ErrorGroup:
+        group = ErrorGroup(
+            project_id=self.project_id,
+            fingerprint=uuid.uuid4().hex,
+            grouping_key=uuid.uuid4().hex,
+            service="checkout",
+            title="PaymentError: declined",
+            example_message="Payment declined",
+            first_seen=last_seen,
+            last_seen=last_seen,
+        )
+        self.session.add(group)
+        await self.session.flush()
+        return group
+
+    async def add_event(self, group: ErrorGroup, error: RawError) -> ErrorEvent:
+        event = ErrorEvent(
+            raw_error_id=error.id,
+            raw_error_received_at=error.received_at,
+            group_fingerprint=group.fingerprint,
+            # Events are recorded shortly after their raw error is received
+            timestamp=error.received_at + timedelta(seconds=5),
+            event_type="new",
+        )
+        self.session.add(event)
+        await self.session.flush()
+        return event
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class RetentionTest(MaintenanceTestCase):
+    async def test_expired_errors_go_with_their_events(self):
+        group = await self.add_group(self.now)
+        received_at = self.now - timedelta(days=8)
+        expired = [await self.add_error(received_at, expires_at=self.now - timedelta(days=1)) for _ in range(3)]
+        kept = await self.add_error(received_at, expires_at=self.now + timedelta(days=1))
+        expired_events = [(await self.add_event(group, error)).id for error in expired]
+        kept_event = (await self.add_event(group, kept)).id
+        repository = RetentionRepository(self.session)
+
+        # Small batches so the sweep has to continue from its key
+        after = None
+        while True:
+            _, _, after = await repository.delete_expired_raw_errors(self.now, batch_size=2, after=after)
+            if after is None:
+                break
+
+        raw_error_ids = set((await self.session.scalars(
+            select(RawError.id).where(RawError.id.in_([error.id for error in expired] + [kept.id]))
+        )).all())
+        event_ids = set((await self.session.scalars(
+            select(ErrorEvent.id).where(ErrorEvent.id.in_(expired_events + [kept_event]))
+        )).all())
+        self.assertEqual(raw_error_ids, {kept.id})
+        self.assertEqual(event_ids, {kept_event})
+
+    async def test_only_groups_past_retention_without_events_are_deleted(self):
+        orphaned = await self.add_group(self.now - timedelta(days=8))
+        with_events = await self.add_group(self.now - timedelta(days=8))
+        recent = await self.add_group(self.now - timedelta(days=1))
+        await self.add_event(with_events, await self.add_error(self.now - timedelta(days=8)))
+        repository = RetentionRepository(self.session)
+
+        after = None
+        while True:
+            _, after = await repository.delete_orphaned_groups(self.now, batch_size=1, after=after)
+            if after is None:
+                break
+
+        group_ids = set((await self.session.scalars(
+            select(ErrorGroup.id).where(ErrorGroup.id.in_([orphaned.id, with_events.id, recent.id]))
+        )).all())
+        self.assertEqual(group_ids, {with_events.id, recent.id})
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class PartitionTest(MaintenanceTestCase):
+    async def partition_of(self, error: RawError) -> str:
+        return await self.session.scalar(
+            text("SELECT tableoid::regclass::text FROM raw_errors WHERE id = :id AND received_at = :received_at"),
+            {"id": error.id, "received_at": error.received_at},
+        )
+
+    async def test_missing_days_are_created_once(self):
+        repository = PartitionRepository(self.session)
+
+        created = await repository.create_daily_partitions("raw_errors", FUTURE_DAY, days=2)
+        again = await repository.create_daily_partitions("raw_errors", FUTURE_DAY, days=3)
+
+        names = [partition_name("raw_errors", FUTURE_DAY + timedelta(days=offset)) for offset in range(3)]
+        self.assertEqual(created, names[:2])
+        self.assertEqual(again, names[2:])
+        bounds = {
+            partition.name: (partition.lower, partition.upper)
+            for partition in await repository.list_partitions("raw_errors")
+        }
+        lower = datetime(FUTURE_DAY.year, FUTURE_DAY.month, FUTURE_DAY.day, tzinfo=timezone.utc)
+        self.assertEqual(bounds[names[0]], (lower, lower + timedelta(days=1)))
+
+    async def test_rows_in_the_default_partition_move_to_their_day(self):
+        moment = datetime(FUTURE_DAY.year, FUTURE_DAY.month, FUTURE_DAY.day, 12, tzinfo=timezone.utc)
+        error = await self.add_error(moment)
+        next_day = await self.add_error(moment + timedelta(days=1))
+        self.assertEqual(await self.partition_of(error), "raw_errors_default")
+        repository = PartitionRepository(self.session)
+
+        created = await repository.create_daily_partitions("raw_errors", FUTURE_DAY, days=1)
+
+        self.assertEqual(created, [partition_name("raw_errors", FUTURE_DAY)])
+        self.assertEqual(await self.partition_of(error), partition_name("raw_errors", FUTURE_DAY))
+        self.assertEqual(await self.partition_of(next_day), "raw_errors_default")
+
+    async def test_dropped_partition_is_no_longer_listed(self):
+        repository = PartitionRepository(self.session)
+        name, = await repository.create_daily_partitions("error_events", FUTURE_DAY, days=1)
+
+        await repository.drop_partition("error_events", name)
+
+        self.assertNotIn(name, [partition.name for partition in await repository.list_partitions("error_events")])
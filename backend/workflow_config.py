@@ -11,4 +11,28 @@ def get_settings():
         "temporal_host_port": os.environ.get("TEMPORAL_HOST_PORT", "temporal:7233"),
         "temporal_namespace": os.environ.get("TEMPORAL_NAMESPACE", "default"),
         "temporal_task_queue": os.environ.get("TEMPORAL_TASK_QUEUE", "error-processing"),
+        "temporal_payload_compression": os.environ.get("TEMPORAL_PAYLOAD_COMPRESSION", ""),
+        "temporal_payload_compression_min_bytes": int(os.environ.get("TEMPORAL_PAYLOAD_COMPRESSION_MIN_BYTES", "256")),
+        "temporal_metrics_bind_address": os.environ.get("TEMPORAL_METRICS_BIND_ADDRESS", ""),
+        # Concurrent process_error_activity / process_error_pipeline_activity
+        # calls are written together; a size of 1 disables batching
+        "process_error_batch_size": int(os.environ.get("PROCESS_ERROR_BATCH_SIZE", "100")),
+        "process_error_batch_linger_ms": float(os.environ.get("PROCESS_ERROR_BATCH_LINGER_MS", "5")),
+        # Worker processes (0 = one per CPU) and per-process slots and pollers.
+        # Each process has its own pool of up to DB_WORKER_POOL_SIZE +
+        # DB_WORKER_MAX_OVERFLOW connections (30 by default), so keep the
+        # process count times that below Postgres' max_connections (100 by
+        # default) minus what the API uses
+        "worker_processes": int(os.environ.get("WORKER_PROCESSES", "1")),
+        "worker_max_concurrent_activities": int(os.environ.get("WORKER_MAX_CONCURRENT_ACTIVITIES", "100")),
+        "worker_max_concurrent_local_activities": int(os.environ.get("WORKER_MAX_CONCURRENT_LOCAL_ACTIVITIES", "100")),
+        "worker_max_concurrent_workflow_tasks": int(os.environ.get("WORKER_MAX_CONCURRENT_WORKFLOW_TASKS", "100")),
+        "worker_max_cached_workflows": int(os.environ.get("WORKER_MAX_CACHED_WORKFLOWS", "1000")),
+        "worker_max_concurrent_activity_task_polls": int(os.environ.get("WORKER_MAX_CONCURRENT_ACTIVITY_TASK_POLLS", "5")),
+        "worker_max_concurrent_workflow_task_polls": int(os.environ.get("WORKER_MAX_CONCURRENT_WORKFLOW_TASK_POLLS", "5")),
+        "worker_graceful_shutdown_seconds": float(os.environ.get("WORKER_GRACEFUL_SHUTDOWN_SECONDS", "30")),
+        "rollup_compaction_interval_minutes": int(os.environ.get("ROLLUP_COMPACTION_INTERVAL_MINUTES", "15")),
+        "partition_maintenance_interval_minutes": int(os.environ.get("PARTITION_MAINTENANCE_INTERVAL_MINUTES", "360")),
+        "retention_sweep_interval_minutes": int(os.environ.get("RETENTION_SWEEP_INTERVAL_MINUTES", "60")),
+        "workflow_start_redrive_interval_minutes": int(os.environ.get("WORKFLOW_START_REDRIVE_INTERVAL_MINUTES", "5")),
     } 
\ No newline at end of file
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DataError, IntegrityError
+from temporalio.common import MetricMeter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Failures caused by the items of a batch rather than by the database
+DATA_ERRORS = (DataError, IntegrityError, ValidationError)
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Groups concurrent calls made within a short linger window.
+    The first item of a batch arms a timer; the batch is flushed when the
+    timer fires or when it reaches ``max_size`` items, and every caller
+    receives its own result (or, when its item cannot be flushed, the
+    flush's exception).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List[T]], Awaitable[List[R]]],
+        max_size: int,
+        linger: float,
+        meter: Optional[MetricMeter] = None,
+        split_on: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.name = name
+        self.flush = flush
+        self.max_size = max_size
+        self.linger = linger
+        self.split_on = split_on
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._pending_since = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+
+        self._batch_size = self._batch_linger = self._failures = None
+        if meter is not None:
+            meter.create_gauge(f"{name}_max_size", "Configured maximum batch size").set(max_size)
+            meter.create_gauge_float(f"{name}_linger_seconds", "Configured batch linger time").set(linger)
+            self._batch_size = meter.create_histogram(f"{name}_size", "Items per flushed batch")
+            self._batch_linger = meter.create_histogram_float(
+                f"{name}_wait_seconds", "Time from the first item of a batch to its flush"
+            )
+            self._failures = meter.create_counter(f"{name}_failures", "Failed batch flushes")
+
+    async def submit(self, item: T) -> R:
+        """Add an item to the current batch and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            self._pending_since = time.perf_counter()
+            self._timer = loop.call_later(self.linger, self._flush_pending)
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self._flush_pending()
+        return await future
+
+    def _flush_pending(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        if self._batch_linger is not None:
+            self._batch_linger.record(time.perf_counter() - self._pending_since)
+        task = asyncio.create_task(self._flush_batch(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_batch(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        """
+        Flush a batch. When the flush fails with one of ``split_on``, an
+        error caused by some item, the batch is split in halves and each
+        is flushed again, so a bad item only fails its own caller, at the
+        cost of about log2(size) extra flushes per bad item. Any other
+        failure, such as the database being unreachable, fails the whole
+        batch at once and is left to the callers' retries. The flush must
+        not have written anything when it raises.
+        """
+        try:
+            results = await self.flush([item for item, _ in batch])
+        except Exception as e:
+            logger.error(f"Failed to flush {self.name} batch of {len(batch)}: {e}")
+            if self._failures is not None:
+                self._failures.add(1)
+            if len(batch) > 1 and isinstance(e, self.split_on):
+                middle = len(batch) // 2
+                await self._flush_batch(batch[:middle])
+                await self._flush_batch(batch[middle:])
+                return
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if self._batch_size is not None:
+            self._batch_size.record(len(batch))
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# Set up by the worker at startup; process_error_activity and
+# process_error_pipeline_activity handle each error on its own when these
+# are None.
+process_error_batcher: Optional[MicroBatcher] = None
+process_error_pipeline_batcher: Optional[MicroBatcher] = None
+
+
+def _batcher(
+    name: str,
+    flush: Callable[[List[dict]], Awaitable[List[dict]]],
+    max_size: int,
+    linger: float,
+    meter: Optional[MetricMeter],
+) -> Optional[MicroBatcher]:
+    if max_size <= 1:
+        return None
+    return MicroBatcher(name, flush=flush, max_size=max_size, linger=linger, meter=meter, split_on=DATA_ERRORS)
+
+
+def configure_process_error_batcher(
+    flush: Callable[[List[dict]], Awaitable[List[dict]]],
+    max_size: int,
+    linger: float,
+    meter: Optional[MetricMeter] = None,
+) -> None:
+    """Enable batching of process_error_activity calls for this worker"""
+    global process_error_batcher
+    process_error_batcher = _batcher("process_error_batch", flush, max_size, linger, meter)
+
+
+def configure_process_error_pipeline_batcher(
+    flush: Callable[[List[dict]], Awaitable[List[dict]]],
+    max_size: int,
+    linger: float,
+    meter: Optional[MetricMeter] = None,
+) -> None:
+    """Enable batching of process_error_pipeline_activity calls for this worker"""
+    global process_error_pipeline_batcher
+    process_error_pipeline_batcher = _batcher("process_error_pipeline_batch", flush, max_size, linger, meter)
@@ -1,126 +1,660 @@
 from temporalio import workflow, activity
 
 with workflow.unsafe.imports_passed_through():
+    import asyncio
     from datetime import timedelta, datetime
-    from typing import Dict, Any, List
+    from collections import Counter
+    from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
     from api.errors.fingerprinting import ErrorFingerprinter
     from api.errors.schema import ErrorPayload
-    from sqlalchemy import select, func
+    from config import settings
+    from sqlalchemy import select, update, func, insert, literal, literal_column, case, true, bindparam, LargeBinary, and_, or_
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from db.hll import hll_cardinality, hll_merge, hll_sketch
     from db.models.errors import RawError, ErrorEvent
     from db.models.groups import ErrorGroup
+    from db.models.rollups import ErrorGroupRollup, RollupGranularity
+    from db.repositories.errors import ErrorRepository
+    from db.repositories.rollups import truncate_bucket
+    from db.repositories.tag_values import TagValueRepository
     from db.session import async_session
+    from workflows import batching
 
-@activity.defn
-async def process_error_activity(error_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Process a single error and generate its fingerprint."""
+def _user_key(payload: ErrorPayload) -> Optional[str]:
+    """Identify the affected user by ID, falling back to the IP address"""
+    if payload.user is None:
+        return None
+    if payload.user.id:
+        return f"id:{payload.user.id}"
+    if payload.user.ip_address:
+        return f"ip:{payload.user.ip_address}"
+    return None
+
+def _user_values(users: Iterable[str], last_user_seen: Optional[datetime]) -> Dict[str, Any]:
+    """User columns of a group row for the distinct users of its events"""
+    users = set(users)
+    return {
+        "users_sketch": hll_sketch(users),
+        "users_affected": len(users),
+        "unique_users_count": len(users),
+        "last_user_seen": last_user_seen,
+    }
+
+def _upsert_groups_statement(rows: List[Dict[str, Any]]):
+    """
+    Build a multi-row error group upsert returning each group's ID,
+    fingerprint, whether it was created and its users sketch. Rows must
+    have distinct fingerprints and carry first_seen, last_seen,
+    occurrences and the columns of _user_values. The users sketch of an
+    existing group is left as stored; the caller merges the new users
+    into it with _merge_users_sketches.
+    """
+    group_insert = pg_insert(ErrorGroup).values(rows)
+    return group_insert.on_conflict_do_update(
+        index_elements=[ErrorGroup.fingerprint],
+        set_={
+            "occurrences": ErrorGroup.occurrences + group_insert.excluded.occurrences,
+            "last_seen": func.greatest(ErrorGroup.last_seen, group_insert.excluded.last_seen),
+            "last_user_seen": func.greatest(ErrorGroup.last_user_seen, group_insert.excluded.last_user_seen),
+            "updated_at": func.now(),
+        },
+    ).returning(
+        ErrorGroup.id,
+        # xmax is only zero for rows created by this statement
+        literal_column("xmax = 0").label("inserted"),
+        ErrorGroup.fingerprint,
+        ErrorGroup.users_sketch,
+    )
+
+async def _merge_users_sketches(
+    session: AsyncSession,
+    groups: List[Tuple[int, Optional[bytes], Optional[bytes]]],
+    rollups: List[Tuple[int, Optional[bytes], Optional[bytes]]],
+) -> None:
+    """
+    Merge new users into stored sketches, without committing. Takes
+    (ID, stored sketch, new sketch) of groups and rollup buckets whose
+    rows the caller's upsert has locked, so no concurrent update is lost.
+    Only sketches the new users change are written back, with the
+    group's user counts re-estimated from its merged sketch.
+    """
+    group_rows = []
+    for group_id, stored, new in groups:
+        merged = hll_merge(stored, new)
+        if merged != stored:
+            users = hll_cardinality(merged)
+            group_rows.append({"b_id": group_id, "b_sketch": merged, "b_users": users})
+    if group_rows:
+        groups_table = ErrorGroup.__table__
+        await session.execute(
+            update(groups_table)
+            .where(groups_table.c.id == bindparam("b_id"))
+            .values(
+                users_sketch=bindparam("b_sketch"),
+                users_affected=bindparam("b_users"),
+                unique_users_count=bindparam("b_users"),
+                # Keep last_seen as recorded by the upsert instead of its onupdate default
+                last_seen=groups_table.c.last_seen,
+            ),
+            group_rows,
+        )
+    
+    rollup_rows = []
+    for rollup_id, stored, new in rollups:
+        merged = hll_merge(stored, new)
+        if merged != stored:
+            rollup_rows.append({"b_id": rollup_id, "b_sketch": merged})
+    if rollup_rows:
+        rollups_table = ErrorGroupRollup.__table__
+        await session.execute(
+            update(rollups_table)
+            .where(rollups_table.c.id == bindparam("b_id"))
+            .values(users_sketch=bindparam("b_sketch")),
+            rollup_rows,
+        )
+
+def _group_values(payload: ErrorPayload, fingerprinter: ErrorFingerprinter) -> Dict[str, Any]:
+    """Map a payload onto the ErrorGroup columns set on insert"""
+    return {
+        "project_id": payload.project_id,
+        "fingerprint": fingerprinter.generate_fingerprint(payload),
+        "grouping_key": fingerprinter.get_grouping_key(payload),
+        "service": payload.service,
+        "environment": payload.environment,
+        "title": fingerprinter.generate_title(payload),
+        "culprit": fingerprinter.generate_culprit(payload),
+        "level": payload.level.value,
+        "example_message": payload.message,
+    }
+
+def _received_between(received_ats: Iterable[Optional[str]]) -> Optional[List[str]]:
+    """Earliest and latest of ISO received_at values, None when any is unknown"""
+    moments = [datetime.fromisoformat(received_at) if received_at else None for received_at in received_ats]
+    if not moments or None in moments:
+        return None
+    return [min(moments).isoformat(), max(moments).isoformat()]
+
+async def _raw_error_received_at(session: AsyncSession, errors: List[Dict[str, Any]]) -> List[Optional[datetime]]:
+    """
+    received_at of each error's raw error, the partition key of
+    raw_errors. Errors queued before it was passed along are looked up.
+    """
+    received_ats = [
+        datetime.fromisoformat(error["raw_error_received_at"]) if error.get("raw_error_received_at") else None
+        for error in errors
+    ]
+    missing = [error["raw_error_id"] for error, received_at in zip(errors, received_ats) if received_at is None]
+    if missing:
+        found = await ErrorRepository(session=session).get_received_at(missing)
+        received_ats = [
+            received_at or found.get(error["raw_error_id"])
+            for error, received_at in zip(errors, received_ats)
+        ]
+    return received_ats
+
+def _record_event_statement(
+    group_values: Dict[str, Any],
+    raw_error_id: int,
+    raw_error_received_at: Optional[datetime],
+    seen_at: datetime,
+    user: Optional[str] = None,
+):
+    """
+    Build one statement that upserts the error group, inserts the error
+    event for it and bumps the group's per-minute rollup bucket. New rows
+    get the user's sketch; existing ones return their stored sketch for
+    _merge_users_sketches:
+
+        WITH upserted_group AS (
+            INSERT INTO error_groups ... ON CONFLICT (fingerprint) DO UPDATE
+            SET occurrences = occurrences + 1, last_seen = GREATEST(...)
+            RETURNING id, xmax = 0 AS inserted, users_sketch
+        ), inserted_event AS (
+            INSERT INTO error_events ... SELECT ... FROM upserted_group
+            RETURNING id
+        ), upserted_rollup AS (
+            INSERT INTO error_group_rollups ... SELECT ... FROM upserted_group
+            ON CONFLICT (group_id, granularity, bucket_start) DO UPDATE
+            SET count = count + 1
+            RETURNING id, users_sketch
+        )
+        SELECT ... FROM upserted_group, inserted_event, upserted_rollup
+    """
+    upserted_group = _upsert_groups_statement([{
+        **group_values,
+        "first_seen": seen_at,
+        "last_seen": seen_at,
+        "occurrences": 1,
+        **_user_values([user] if user else [], seen_at if user else None),
+    }]).cte("upserted_group")
+    
+    inserted_event = insert(ErrorEvent).from_select(
+        ["raw_error_id", "raw_error_received_at", "group_fingerprint", "event_type", "timestamp"],
+        select(
+            literal(raw_error_id),
+            literal(raw_error_received_at, ErrorEvent.raw_error_received_at.type),
+            literal(group_values["fingerprint"]),
+            case((upserted_group.c.inserted, "new"), else_="reoccurrence"),
+            literal(seen_at, ErrorEvent.timestamp.type),
+        ).select_from(upserted_group),
+    ).returning(ErrorEvent.id).cte("inserted_event")
+    
+    rollup_insert = pg_insert(ErrorGroupRollup).from_select(
+        ["group_id", "project_id", "granularity", "bucket_start", "count", "users_sketch"],
+        select(
+            upserted_group.c.id,
+            literal(group_values["project_id"]),
+            literal(RollupGranularity.MINUTE.value),
+            literal(truncate_bucket(seen_at, RollupGranularity.MINUTE), ErrorGroupRollup.bucket_start.type),
+            literal(1, ErrorGroupRollup.count.type),
+            literal(hll_sketch([user] if user else []), LargeBinary),
+        ).select_from(upserted_group),
+    )
+    upserted_rollup = rollup_insert.on_conflict_do_update(
+        constraint="uq_error_group_rollups_bucket",
+        set_={"count": ErrorGroupRollup.count + rollup_insert.excluded.count},
+    ).returning(ErrorGroupRollup.id, ErrorGroupRollup.users_sketch).cte("upserted_rollup")
+    
+    return select(
+        upserted_group.c.id,
+        upserted_group.c.inserted,
+        inserted_event.c.id.label("event_id"),
+        upserted_group.c.users_sketch,
+        upserted_rollup.c.id.label("rollup_id"),
+        upserted_rollup.c.users_sketch.label("rollup_users_sketch"),
+    ).select_from(
+        upserted_group.join(inserted_event, true()).join(upserted_rollup, true())
+    )
+
+async def _record_events(
+    session: AsyncSession,
+    events: List[Tuple[Dict[str, Any], int, Optional[datetime], datetime, ErrorPayload]],
+) -> Dict[str, Tuple[int, bool]]:
+    """
+    Record (group values, raw error ID, raw error received at, seen at,
+    payload) events for any number of groups with one multi-row group
+    upsert, one event insert, one rollup upsert and one tag value upsert,
+    without committing. Returns the group ID and whether the group was
+    created for each fingerprint.
+    """
+    events = sorted(events, key=lambda event: event[3])
+    
+    groups: Dict[str, Dict[str, Any]] = {}
+    group_users: Dict[str, List[str]] = {}
+    last_user_seen: Dict[str, datetime] = {}
+    for group_values, _, _, seen_at, payload in events:
+        fingerprint = group_values["fingerprint"]
+        group = groups.get(fingerprint)
+        if group is None:
+            groups[fingerprint] = {
+                **group_values,
+                "first_seen": seen_at,
+                "last_seen": seen_at,
+                "occurrences": 1,
+            }
+        else:
+            # The newest payload supplies the group's title and example message
+            group.update(group_values, last_seen=seen_at, occurrences=group["occurrences"] + 1)
+        user = _user_key(payload)
+        if user:
+            group_users.setdefault(fingerprint, []).append(user)
+            last_user_seen[fingerprint] = seen_at
+    
+    # Sorted so concurrent batches lock shared groups in the same order
+    group_rows = {
+        fingerprint: {
+            **groups[fingerprint],
+            **_user_values(group_users.get(fingerprint, []), last_user_seen.get(fingerprint)),
+        }
+        for fingerprint in sorted(groups)
+    }
+    result = await session.execute(_upsert_groups_statement(list(group_rows.values())))
+    upserted = {}
+    group_sketches = []
+    for group_id, inserted, fingerprint, users_sketch in result.all():
+        upserted[fingerprint] = (group_id, inserted)
+        if not inserted:
+            group_sketches.append((group_id, users_sketch, group_rows[fingerprint]["users_sketch"]))
+    
+    event_rows = []
+    recorded = set()
+    bucket_counts: Counter = Counter()
+    bucket_users: Dict[Tuple[int, int, datetime], List[str]] = {}
+    for group_values, raw_error_id, raw_error_received_at, seen_at, payload in events:
+        fingerprint = group_values["fingerprint"]
+        group_id, inserted = upserted[fingerprint]
+        # Only the first event of a newly created group is new
+        is_new = inserted and fingerprint not in recorded
+        recorded.add(fingerprint)
+        event_rows.append({
+            "raw_error_id": raw_error_id,
+            "raw_error_received_at": raw_error_received_at,
+            "group_fingerprint": fingerprint,
+            "event_type": "new" if is_new else "reoccurrence",
+            "timestamp": seen_at,
+        })
+        bucket = (group_id, group_values["project_id"], truncate_bucket(seen_at, RollupGranularity.MINUTE))
+        bucket_counts[bucket] += 1
+        user = _user_key(payload)
+        if user:
+            bucket_users.setdefault(bucket, []).append(user)
+    await session.execute(insert(ErrorEvent), event_rows)
+    
+    bucket_sketches = {
+        (group_id, bucket_start): hll_sketch(bucket_users.get((group_id, project_id, bucket_start), []))
+        for group_id, project_id, bucket_start in bucket_counts
+    }
+    rollup_insert = pg_insert(ErrorGroupRollup).values([
+        {
+            "group_id": group_id,
+            "project_id": project_id,
+            "granularity": RollupGranularity.MINUTE.value,
+            "bucket_start": bucket_start,
+            "count": count,
+            "users_sketch": bucket_sketches[(group_id, bucket_start)],
+        }
+        for (group_id, project_id, bucket_start), count in sorted(bucket_counts.items())
+    ])
+    result = await session.execute(
+        rollup_insert.on_conflict_do_update(
+            constraint="uq_error_group_rollups_bucket",
+            set_={"count": ErrorGroupRollup.count + rollup_insert.excluded.count},
+        ).returning(
+            ErrorGroupRollup.id,
+            literal_column("xmax = 0").label("inserted"),
+            ErrorGroupRollup.group_id,
+            ErrorGroupRollup.bucket_start,
+            ErrorGroupRollup.users_sketch,
+        )
+    )
+    rollup_sketches = [
+        (rollup_id, users_sketch, bucket_sketches[(group_id, bucket_start)])
+        for rollup_id, inserted, group_id, bucket_start, users_sketch in result.all()
+        if not inserted
+    ]
+    await _merge_users_sketches(session, group_sketches, rollup_sketches)
+    
+    await TagValueRepository(session=session).record(
+        [
+            (upserted[group_values["fingerprint"]][0], group_values["project_id"], payload.tags, seen_at)
+            for group_values, _, _, seen_at, payload in events
+            if payload.tags
+        ],
+        values_per_key=settings.group_tag_values_per_key,
+    )
+    
+    return upserted
+
+async def _process_error(session: AsyncSession, error_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Fingerprint an error and record it against its group, without committing"""
     fingerprinter = ErrorFingerprinter()
     payload = ErrorPayload(**error_data["payload"])
     
     # Generate fingerprint and grouping information
-    fingerprint = fingerprinter.generate_fingerprint(payload)
-    title = fingerprinter.generate_title(payload)
-    culprit = fingerprinter.generate_culprit(payload)
-    grouping_key = fingerprinter.get_grouping_key(payload)
+    group_values = _group_values(payload, fingerprinter)
     
-    session = async_session()
-    try:
-        # Find or create error group
-        group_query = select(ErrorGroup).where(
-            ErrorGroup.fingerprint == fingerprint,
-            ErrorGroup.project_id == payload.project_id
+    # Upsert the group and record the event in a single round trip
+    seen_at = datetime.utcnow()
+    user = _user_key(payload)
+    raw_error_received_at, = await _raw_error_received_at(session, [error_data])
+    statement = _record_event_statement(
+        group_values,
+        raw_error_id=error_data["raw_error_id"],
+        raw_error_received_at=raw_error_received_at,
+        seen_at=seen_at,
+        user=user,
+    )
+    result = await session.execute(statement)
+    group_id, is_new_group, _, users_sketch, rollup_id, rollup_users_sketch = result.one()
+    if not is_new_group:
+        user_sketch = hll_sketch([user] if user else [])
+        await _merge_users_sketches(
+            session,
+            [(group_id, users_sketch, user_sketch)],
+            [(rollup_id, rollup_users_sketch, user_sketch)],
         )
-        result = await session.execute(group_query)
-        group = result.scalar_one_or_none()
-        
-        if not group:
-            group = ErrorGroup(
-                project_id=payload.project_id,  # Add project_id here
-                fingerprint=fingerprint,
-                grouping_key=grouping_key,
-                service=payload.service,
-                environment=payload.environment,
-                title=title,
-                culprit=culprit,
-                level=payload.level.value,
-                first_seen=datetime.utcnow(),
-                last_seen=datetime.utcnow(),
-                occurrences=1,
-                example_message=payload.message
+    
+    if payload.tags:
+        await TagValueRepository(session=session).record(
+            [(group_id, payload.project_id, payload.tags, seen_at)],
+            values_per_key=settings.group_tag_values_per_key,
+        )
+    
+    return {
+        "raw_error_id": error_data["raw_error_id"],
+        "raw_error_received_at": raw_error_received_at.isoformat() if raw_error_received_at else None,
+        "group_id": group_id,
+        "is_new_group": is_new_group,
+        "fingerprint": group_values["fingerprint"],
+        "title": group_values["title"],
+        "culprit": group_values["culprit"],
+        "grouping_key": group_values["grouping_key"],
+    }
+
+async def _deduplicate_errors(
+    session: AsyncSession,
+    group_fingerprint: str,
+    raw_error_ids: Optional[List[int]] = None,
+    received_between: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Deduplicate newly processed errors of a group, without committing.
+    Each error is compared by content hash against earlier errors of the
+    same project from the last hour in one set-based UPDATE, so the work is
+    proportional to the new errors rather than to the group's history.
+    Without ``raw_error_ids`` the group's errors of the last hour are
+    checked, as tasks scheduled before the IDs were passed expect.
+    ``received_between`` bounds the errors' received_at, see
+    ErrorRepository.mark_duplicates.
+    """
+    repo = ErrorRepository(session=session)
+    if raw_error_ids is None:
+        result = await session.execute(
+            select(ErrorEvent.raw_error_id).where(
+                ErrorEvent.group_fingerprint == group_fingerprint,
+                ErrorEvent.timestamp >= datetime.utcnow() - timedelta(hours=1),
             )
-            session.add(group)
-        else:
-            group.last_seen = datetime.utcnow()
-            group.occurrences += 1
-        
-        # Create error event
-        event = ErrorEvent(
-            raw_error_id=error_data["raw_error_id"],
-            group_fingerprint=fingerprint,
-            event_type="new" if not group else "reoccurrence",
-            timestamp=datetime.utcnow()
         )
-        session.add(event)
+        raw_error_ids = list(result.scalars().all())
+    duplicate_ids = await repo.mark_duplicates(
+        raw_error_ids,
+        window=timedelta(hours=1),
+        received_between=tuple(map(datetime.fromisoformat, received_between)) if received_between else None,
+    )
+    
+    return {
+        "group_fingerprint": group_fingerprint,
+        "duplicates_found": len(duplicate_ids),
+        "total_errors_processed": len(raw_error_ids)
+    }
+
+async def _update_group_statistics(session: AsyncSession, group_fingerprint: str) -> Dict[str, Any]:
+    """
+    Update error group statistics, without committing.
+    Occurrences, first_seen and last_seen are maintained by the group
+    upsert; the 24h frequency is summed from the group's recent minute and
+    hourly rollup buckets, so the cost does not grow with the group. User
+    counts are kept by _merge_users_sketches.
+    """
+    day_ago = datetime.utcnow() - timedelta(days=1)
+    # Compaction moves minute counts into hour buckets, so each granularity
+    # gets its own range and day buckets, which may reach past the window,
+    # are left out
+    recent_count = (
+        select(func.coalesce(func.sum(ErrorGroupRollup.count), 0))
+        .where(
+            ErrorGroupRollup.group_id == ErrorGroup.id,
+            or_(
+                and_(
+                    ErrorGroupRollup.granularity == RollupGranularity.MINUTE.value,
+                    ErrorGroupRollup.bucket_start >= truncate_bucket(day_ago, RollupGranularity.MINUTE),
+                ),
+                and_(
+                    ErrorGroupRollup.granularity == RollupGranularity.HOUR.value,
+                    ErrorGroupRollup.bucket_start >= truncate_bucket(day_ago, RollupGranularity.HOUR),
+                ),
+            ),
+        )
+        .scalar_subquery()
+    )
+    
+    # Store the last 24h event count as the daily rate
+    result = await session.execute(
+        update(ErrorGroup)
+        .where(ErrorGroup.fingerprint == group_fingerprint)
+        .values(
+            avg_events_per_day=recent_count,
+            # Keep last_seen as recorded by the upsert instead of its onupdate default
+            last_seen=ErrorGroup.last_seen,
+        )
+        .returning(ErrorGroup.occurrences, ErrorGroup.avg_events_per_day)
+    )
+    row = result.one_or_none()
+    
+    if row is None:
+        return {"group_fingerprint": group_fingerprint, "updated": False, "error": "Group not found"}
+    
+    occurrences, events_last_day = row
+    frequency = events_last_day / 24  # events per hour
+    
+    # Classify by frequency
+    if frequency > 10:  # More than 10 events per hour
+        status = 'critical'
+    elif frequency > 1:  # More than 1 event per hour
+        status = 'warning'
+    else:
+        status = 'stable'
+    
+    return {
+        "group_fingerprint": group_fingerprint,
+        "updated": True,
+        "total_occurrences": occurrences,
+        "frequency": frequency,
+        "status": status
+    }
+
+@activity.defn
+async def process_error_activity(error_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Process a single error and generate its fingerprint."""
+    if batching.process_error_batcher is not None:
+        return await batching.process_error_batcher.submit(error_data)
+    
+    session = async_session()
+    try:
+        result = await _process_error(session, error_data)
+        await session.commit()
+        return result
+    finally:
+        await session.close()
+
+@activity.defn
+async def record_group_events_activity(group_fingerprint: str, errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Record a window of coalesced errors for one group.
+    The group is upserted once with the window's event count, the events
+    are inserted in one executemany and every touched minute bucket is
+    bumped once, so the cost is per window rather than per event.
+    """
+    fingerprinter = ErrorFingerprinter()
+    seen_at = datetime.utcnow()
+    
+    session = async_session()
+    try:
+        # Errors whose raw error retention already removed are skipped
+        received_ats = await _raw_error_received_at(session, errors)
+        kept = [(error, received_at) for error, received_at in zip(errors, received_ats) if received_at is not None]
+        if not kept:
+            return {
+                "group_id": None,
+                "is_new_group": False,
+                "fingerprint": group_fingerprint,
+                "raw_error_ids": [],
+                "received_between": None,
+            }
         
+        events = []
+        for error, received_at in kept:
+            payload = ErrorPayload(**error["payload"])
+            events.append((_group_values(payload, fingerprinter), error["raw_error_id"], received_at, seen_at, payload))
+        upserted = await _record_events(session, events)
         await session.commit()
         
+        group_id, is_new_group = upserted[group_fingerprint]
         return {
-            "raw_error_id": error_data["raw_error_id"],
-            "group_id": group.id,
-            "fingerprint": fingerprint,
-            "title": title,
-            "culprit": culprit,
-            "grouping_key": grouping_key,
+            "group_id": group_id,
+            "is_new_group": is_new_group,
+            "fingerprint": group_fingerprint,
+            "raw_error_ids": [error["raw_error_id"] for error, _ in kept],
+            "received_between": _received_between(received_at.isoformat() for _, received_at in kept),
         }
     finally:
         await session.close()
 
-@activity.defn
-async def deduplicate_errors_activity(group_fingerprint: str) -> Dict[str, Any]:
-    """Deduplicate errors within a group."""
+async def _process_error_batch(session: AsyncSession, errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Record several errors together, without committing.
+    Results are returned in input order with the same shape as
+    _process_error.
+    """
+    fingerprinter = ErrorFingerprinter()
+    seen_at = datetime.utcnow()
+    payloads = [ErrorPayload(**error["payload"]) for error in errors]
+    group_values = [_group_values(payload, fingerprinter) for payload in payloads]
+    
+    received_ats = await _raw_error_received_at(session, errors)
+    upserted = await _record_events(
+        session,
+        [
+            (values, error["raw_error_id"], received_at, seen_at, payload)
+            for values, payload, error, received_at in zip(group_values, payloads, errors, received_ats)
+        ],
+    )
+    
+    results = []
+    for values, error, received_at in zip(group_values, errors, received_ats):
+        group_id, inserted = upserted[values["fingerprint"]]
+        results.append({
+            "raw_error_id": error["raw_error_id"],
+            "raw_error_received_at": received_at.isoformat() if received_at else None,
+            "group_id": group_id,
+            "is_new_group": inserted,
+            "fingerprint": values["fingerprint"],
+            "title": values["title"],
+            "culprit": values["culprit"],
+            "grouping_key": values["grouping_key"],
+        })
+    return results
+
+async def process_error_batch(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Record the errors of concurrent process_error_activity calls together.
+    Used as the flush of the worker's micro-batcher; results are returned
+    in input order with the same shape as process_error_activity.
+    """
     session = async_session()
     try:
-        # Get all error events in this group from the last hour
-        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-        events_query = select(ErrorEvent).where(
-            ErrorEvent.group_fingerprint == group_fingerprint,
-            ErrorEvent.timestamp >= one_hour_ago
-        ).order_by(ErrorEvent.timestamp.desc())
-        
-        result = await session.execute(events_query)
-        events = result.scalars().all()
-        
-        # Get the raw errors for these events
-        raw_error_ids = [event.raw_error_id for event in events]
-        raw_errors_query = select(RawError).where(RawError.id.in_(raw_error_ids))
-        result = await session.execute(raw_errors_query)
-        raw_errors = result.scalars().all()
-        
-        # Group errors by their exact stack trace and message
-        duplicates: Dict[str, List[RawError]] = {}
-        for error in raw_errors:
-            key = f"{error.stack_trace}:{error.message}"
-            if key not in duplicates:
-                duplicates[key] = []
-            duplicates[key].append(error)
-        
-        # Mark errors as duplicates if they share the same key
-        duplicate_count = 0
-        for errors in duplicates.values():
-            if len(errors) > 1:
-                # Keep the first error as primary, mark others as duplicates
-                primary = errors[0]
-                for duplicate in errors[1:]:
-                    duplicate.is_duplicate = True
-                    duplicate.duplicate_of_id = primary.id
-                    duplicate_count += 1
-        
+        results = await _process_error_batch(session, errors)
         await session.commit()
+        return results
+    finally:
+        await session.close()
+
+async def process_error_pipeline_batch(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Process, deduplicate and count several errors in a single transaction.
+    The errors are recorded together, then each affected group is
+    deduplicated and counted once, in fingerprint order. Results are
+    returned in input order with the same shape as
+    process_error_pipeline_activity.
+    """
+    session = async_session()
+    try:
+        process_results = await _process_error_batch(session, errors)
         
-        return {
-            "group_fingerprint": group_fingerprint,
-            "duplicates_found": duplicate_count,
-            "total_errors_processed": len(raw_errors)
+        results_by_group: Dict[str, List[Dict[str, Any]]] = {}
+        for result in process_results:
+            results_by_group.setdefault(result["fingerprint"], []).append(result)
+        group_results = {}
+        for fingerprint in sorted(results_by_group):
+            group = results_by_group[fingerprint]
+            dedupe_result = await _deduplicate_errors(
+                session,
+                fingerprint,
+                [result["raw_error_id"] for result in group],
+                _received_between(result["raw_error_received_at"] for result in group),
+            )
+            stats_result = await _update_group_statistics(session, fingerprint)
+            group_results[fingerprint] = (dedupe_result, stats_result)
+        await session.commit()
+    finally:
+        await session.close()
+    
+    return [
+        {
+            "process": result,
+            "deduplication": group_results[result["fingerprint"]][0],
+            "statistics": group_results[result["fingerprint"]][1],
         }
+        for result in process_results
+    ]
+
+@activity.defn
+async def deduplicate_errors_activity(
+    group_fingerprint: str,
+    raw_error_ids: Optional[List[int]] = None,
+    received_between: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Deduplicate newly processed errors of a group.
+    ``raw_error_ids`` and ``received_between`` are optional so tasks
+    scheduled with an earlier signature still run after a deploy.
+    """
+    session = async_session()
+    try:
+        result = await _deduplicate_errors(session, group_fingerprint, raw_error_ids, received_between)
+        await session.commit()
+        return result
     finally:
         await session.close()
 
@@ -129,93 +663,263 @@ async def update_group_statistics_activity(group_fingerprint: str) -> Dict[str,
     """Update error group statistics."""
     session = async_session()
     try:
-        # Get the error group
-        group_query = select(ErrorGroup).where(ErrorGroup.fingerprint == group_fingerprint)
-        result = await session.execute(group_query)
-        group = result.scalar_one_or_none()
-        
-        if not group:
-            return {"group_fingerprint": group_fingerprint, "updated": False, "error": "Group not found"}
-        
-        # Calculate statistics
-        stats_query = select(
-            func.count(ErrorEvent.id).label('total_events'),
-            func.min(ErrorEvent.timestamp).label('first_seen'),
-            func.max(ErrorEvent.timestamp).label('last_seen')
-        ).where(ErrorEvent.group_fingerprint == group_fingerprint)
-        
-        result = await session.execute(stats_query)
-        stats = result.mappings().first()
-        
-        # Update group statistics
-        group.occurrences = stats['total_events']
-        group.first_seen = stats['first_seen']
-        group.last_seen = stats['last_seen']
-        
-        # Calculate frequency (events per hour) over the last 24 hours
-        day_ago = datetime.utcnow() - timedelta(days=1)
-        recent_count_query = select(
-            func.count(ErrorEvent.id)
-        ).where(
-            ErrorEvent.group_fingerprint == group_fingerprint,
-            ErrorEvent.timestamp >= day_ago
+        result = await _update_group_statistics(session, group_fingerprint)
+        await session.commit()
+        return result
+    finally:
+        await session.close()
+
+@activity.defn
+async def process_error_pipeline_activity(error_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Process, deduplicate and count one error in a single transaction.
+    Fast path for ErrorProcessingWorkflow: one task round trip and one
+    session instead of three.
+    """
+    if batching.process_error_pipeline_batcher is not None:
+        return await batching.process_error_pipeline_batcher.submit(error_data)
+    
+    session = async_session()
+    try:
+        process_result = await _process_error(session, error_data)
+        dedupe_result = await _deduplicate_errors(
+            session,
+            process_result["fingerprint"],
+            [process_result["raw_error_id"]],
+            _received_between([process_result["raw_error_received_at"]]),
         )
-        result = await session.execute(recent_count_query)
-        recent_count = result.scalar()
-        
-        group.frequency = recent_count / 24  # events per hour
-        
-        # Update status based on frequency
-        if group.frequency > 10:  # More than 10 events per hour
-            group.status = 'critical'
-        elif group.frequency > 1:  # More than 1 event per hour
-            group.status = 'warning'
-        else:
-            group.status = 'stable'
-        
+        stats_result = await _update_group_statistics(session, process_result["fingerprint"])
         await session.commit()
         
         return {
-            "group_fingerprint": group_fingerprint,
-            "updated": True,
-            "total_occurrences": group.occurrences,
-            "frequency": group.frequency,
-            "status": group.status
+            "process": process_result,
+            "deduplication": dedupe_result,
+            "statistics": stats_result,
         }
     finally:
         await session.close()
 
+@activity.defn
+async def process_error_batch_pipeline_activity(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Process, deduplicate and count a batch of errors in a single transaction."""
+    return await process_error_pipeline_batch(errors)
+
 @workflow.defn
 class ErrorProcessingWorkflow:
+    """
+    Processes one ingested error. ``error_data["mode"]`` selects how:
+
+    - ``single``: one activity runs all three steps in one transaction
+    - ``local``: the three steps run as local activities on this worker
+    - ``split``: three regular activities, each visible in history
+    """
+
     @workflow.run
     async def run(self, error_data: Dict[str, Any]) -> Dict[str, Any]:
-        # Process the error
-        process_result = await workflow.execute_activity(
-            process_error_activity,
-            error_data,
-            start_to_close_timeout=timedelta(minutes=5)
-        )
+        mode = error_data.get("mode", "split")
+        
+        if mode == "single":
+            result = await workflow.execute_activity(
+                process_error_pipeline_activity,
+                error_data,
+                start_to_close_timeout=timedelta(minutes=5)
+            )
+            process_result = result["process"]
+            dedupe_result = result["deduplication"]
+            stats_result = result["statistics"]
+        else:
+            execute = workflow.execute_local_activity if mode == "local" else workflow.execute_activity
+            
+            # Process the error
+            process_result = await execute(
+                process_error_activity,
+                error_data,
+                start_to_close_timeout=timedelta(minutes=5)
+            )
+            
+            # Run deduplication after a delay
+            dedupe_result = await execute(
+                deduplicate_errors_activity,
+                args=[
+                    process_result["fingerprint"],
+                    [process_result["raw_error_id"]],
+                    _received_between([process_result.get("raw_error_received_at")]),
+                ],
+                start_to_close_timeout=timedelta(minutes=5),
+                schedule_to_start_timeout=timedelta(minutes=5)
+            )
+            
+            # Update group statistics
+            stats_result = await execute(
+                update_group_statistics_activity,
+                process_result["fingerprint"],
+                start_to_close_timeout=timedelta(minutes=5)
+            )
+        
+        return {
+            "error_id": process_result["raw_error_id"],
+            "group_id": process_result["group_id"],
+            "fingerprint": process_result["fingerprint"],
+            "deduplication_result": dedupe_result,
+            "statistics_updated": stats_result["updated"],
+            "status": stats_result.get("status")
+        }
+
+
+@workflow.defn
+class ErrorBatchProcessingWorkflow:
+    """
+    Processes a batch of ingested errors. ``batch_data["mode"]`` selects
+    how, as for ErrorProcessingWorkflow:
+
+    - ``single``: one activity records the whole batch and deduplicates
+      and counts each affected group in one transaction
+    - ``local``: every step runs as a local activity on this worker
+    - ``split``: regular activities, one per error and two per group
+    """
+
+    @workflow.run
+    async def run(self, batch_data: Dict[str, Any]) -> Dict[str, Any]:
+        mode = batch_data.get("mode", "split")
+        
+        if mode == "single":
+            results = await workflow.execute_activity(
+                process_error_batch_pipeline_activity,
+                batch_data["errors"],
+                start_to_close_timeout=timedelta(minutes=5)
+            )
+            group_results = {}
+            for result in results:
+                group_results[result["process"]["fingerprint"]] = {
+                    "fingerprint": result["process"]["fingerprint"],
+                    "deduplication_result": result["deduplication"],
+                    "statistics_updated": result["statistics"]["updated"],
+                    "status": result["statistics"].get("status")
+                }
+            return {
+                "error_ids": [result["process"]["raw_error_id"] for result in results],
+                "groups": [group_results[fingerprint] for fingerprint in sorted(group_results)],
+            }
+        
+        execute = workflow.execute_local_activity if mode == "local" else workflow.execute_activity
+        
+        # Process every error of the batch concurrently
+        process_results = await asyncio.gather(*[
+            execute(
+                process_error_activity,
+                error_data,
+                start_to_close_timeout=timedelta(minutes=5)
+            )
+            for error_data in batch_data["errors"]
+        ])
+        
+        # Deduplicate and update statistics once per affected group
+        results_by_group: Dict[str, List[Dict[str, Any]]] = {}
+        for result in process_results:
+            results_by_group.setdefault(result["fingerprint"], []).append(result)
+        group_results = await asyncio.gather(*[
+            self._update_group(
+                execute,
+                fingerprint,
+                [result["raw_error_id"] for result in results_by_group[fingerprint]],
+                _received_between(result.get("raw_error_received_at") for result in results_by_group[fingerprint]),
+            )
+            for fingerprint in sorted(results_by_group)
+        ])
         
-        # Run deduplication after a delay
-        dedupe_result = await workflow.execute_activity(
+        return {
+            "error_ids": [result["raw_error_id"] for result in process_results],
+            "groups": group_results,
+        }
+
+    async def _update_group(
+        self,
+        execute: Callable[..., Awaitable[Any]],
+        fingerprint: str,
+        raw_error_ids: List[int],
+        received_between: Optional[List[str]],
+    ) -> Dict[str, Any]:
+        dedupe_result = await execute(
             deduplicate_errors_activity,
-            process_result["fingerprint"],
+            args=[fingerprint, raw_error_ids, received_between],
             start_to_close_timeout=timedelta(minutes=5),
             schedule_to_start_timeout=timedelta(minutes=5)
         )
         
-        # Update group statistics
-        stats_result = await workflow.execute_activity(
+        stats_result = await execute(
             update_group_statistics_activity,
-            process_result["fingerprint"],
+            fingerprint,
             start_to_close_timeout=timedelta(minutes=5)
         )
         
         return {
-            "error_id": process_result["raw_error_id"],
-            "group_id": process_result["group_id"],
-            "fingerprint": process_result["fingerprint"],
+            "fingerprint": fingerprint,
             "deduplication_result": dedupe_result,
             "statistics_updated": stats_result["updated"],
             "status": stats_result.get("status")
-        } 
\ No newline at end of file
+        }
+
+
+@workflow.defn
+class ErrorGroupProcessingWorkflow:
+    """
+    Long-lived processing workflow for one error group.
+    Ingest signals errors into it with signal-with-start; they are recorded,
+    deduplicated and counted together at most once per window, and the
+    workflow continues as new after a number of windows to keep its history
+    bounded. It completes once no errors arrived for the idle timeout.
+    """
+
+    def __init__(self):
+        self._pending: List[Dict[str, Any]] = []
+
+    @workflow.signal
+    def add_errors(self, errors: List[Dict[str, Any]]) -> None:
+        self._pending.extend(errors)
+
+    @workflow.run
+    async def run(self, group_data: Dict[str, Any]) -> Dict[str, Any]:
+        fingerprint = group_data["fingerprint"]
+        # Errors signalled to the previous run but not yet processed
+        self._pending[:0] = group_data.get("pending", [])
+        processed = group_data.get("processed", 0)
+        
+        for _ in range(group_data["windows_per_run"]):
+            try:
+                await workflow.wait_condition(
+                    lambda: bool(self._pending),
+                    timeout=timedelta(seconds=group_data["idle_timeout_seconds"]),
+                )
+            except asyncio.TimeoutError:
+                return {"fingerprint": fingerprint, "errors_processed": processed}
+            
+            # Let the window fill up before processing it as one batch
+            await workflow.sleep(timedelta(seconds=group_data["window_seconds"]))
+            errors, self._pending = self._pending, []
+            
+            record_result = await workflow.execute_activity(
+                record_group_events_activity,
+                args=[fingerprint, errors],
+                start_to_close_timeout=timedelta(minutes=5)
+            )
+            await workflow.execute_activity(
+                deduplicate_errors_activity,
+                args=[fingerprint, record_result["raw_error_ids"], record_result.get("received_between")],
+                start_to_close_timeout=timedelta(minutes=5),
+                schedule_to_start_timeout=timedelta(minutes=5)
+            )
+            await workflow.execute_activity(
+                update_group_statistics_activity,
+                fingerprint,
+                start_to_close_timeout=timedelta(minutes=5)
+            )
+            processed += len(errors)
+            
+            if workflow.info().is_continue_as_new_suggested():
+                break
+        
+        workflow.continue_as_new({
+            **group_data,
+            "pending": self._pending,
+            "processed": processed,
+        })
@@ -0,0 +1,208 @@
+from temporalio import workflow, activity
+
+with workflow.unsafe.imports_passed_through():
+    import asyncio
+    from datetime import timedelta, datetime, timezone
+    from typing import Callable, Dict, Any, List
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from temporalio.exceptions import WorkflowAlreadyStartedError
+    from config import settings
+    from db.models.rollups import RollupGranularity
+    from db.repositories.partitions import PARTITIONED_TABLES, PartitionRepository
+    from db.repositories.retention import RetentionRepository
+    from db.repositories.rollups import RollupRepository
+    from db.repositories.workflows import PendingWorkflowStartRepository
+    from db.session import async_session
+
+@activity.defn
+async def compact_rollups_activity() -> Dict[str, Any]:
+    """Downsample old minute buckets into hours and old hour buckets into days."""
+    now = datetime.utcnow()
+    stages = [
+        (RollupGranularity.MINUTE, RollupGranularity.HOUR, now - timedelta(hours=settings.rollup_minute_retention_hours)),
+        (RollupGranularity.HOUR, RollupGranularity.DAY, now - timedelta(days=settings.rollup_hour_retention_days)),
+    ]
+    batch_size = settings.rollup_compaction_batch_size
+    
+    session = async_session()
+    try:
+        repo = RollupRepository(session=session)
+        moved: Dict[str, int] = {}
+        for source, target, older_than in stages:
+            stage = f"{source.value}_to_{target.value}"
+            moved[stage] = 0
+            # Work in bounded batches so locks and WAL stay small
+            while True:
+                count = await repo.compact(source, target, older_than, batch_size)
+                moved[stage] += count
+                activity.heartbeat(moved)
+                if count < batch_size:
+                    break
+        return moved
+    finally:
+        await session.close()
+
+@workflow.defn
+class RollupCompactionWorkflow:
+    @workflow.run
+    async def run(self) -> Dict[str, Any]:
+        return await workflow.execute_activity(
+            compact_rollups_activity,
+            start_to_close_timeout=timedelta(minutes=30),
+            heartbeat_timeout=timedelta(minutes=2)
+        )
+
+@activity.defn
+async def ensure_partitions_activity() -> Dict[str, List[str]]:
+    """Create the daily partitions for today and the configured days ahead."""
+    today = datetime.utcnow().date()
+    
+    session = async_session()
+    try:
+        repo = PartitionRepository(session=session)
+        created: Dict[str, List[str]] = {}
+        for table in PARTITIONED_TABLES:
+            created[table] = await repo.create_daily_partitions(table, today, settings.partition_precreate_days)
+        return created
+    finally:
+        await session.close()
+
+@workflow.defn
+class PartitionMaintenanceWorkflow:
+    @workflow.run
+    async def run(self) -> Dict[str, List[str]]:
+        return await workflow.execute_activity(
+            ensure_partitions_activity,
+            start_to_close_timeout=timedelta(minutes=5)
+        )
+
+async def sweep_retention(session: AsyncSession, now: datetime, on_batch: Callable[[str, int], None]):
+    """
+    Delete expired data, cheapest first: raw_errors partitions whose rows
+    have all expired, error_events partitions older than every raw error
+    left, then expired raw errors with their events one batch at a time,
+    then groups left without events. on_batch gets the stage and count of
+    every step; batches are paced by retention_batch_pause_ms.
+    """
+    partitions = PartitionRepository(session=session)
+    retention = RetentionRepository(session=session)
+    batch_size = settings.retention_batch_size
+    pause = settings.retention_batch_pause_ms / 1000
+    
+    # Events are written just after their raw error is received, so an
+    # events partition can go a day after the raw partitions before the
+    # oldest one kept
+    oldest_kept = None
+    for partition in await partitions.list_partitions("raw_errors"):
+        if partition.upper is not None and partition.upper <= now and await retention.partition_expired(partition.name, now):
+            await partitions.drop_partition("raw_errors", partition.name)
+            on_batch("raw_errors_partitions", 1)
+        elif oldest_kept is None:
+            oldest_kept = partition
+    if oldest_kept is not None and oldest_kept.lower is not None:
+        for partition in await partitions.list_partitions("error_events"):
+            if partition.upper is None or partition.upper + timedelta(days=1) > oldest_kept.lower:
+                break
+            await partitions.drop_partition("error_events", partition.name)
+            on_batch("error_events_partitions", 1)
+    
+    after = None
+    while True:
+        raw_count, event_count, after = await retention.delete_expired_raw_errors(now, batch_size, after)
+        on_batch("raw_errors", raw_count)
+        on_batch("error_events", event_count)
+        if after is None:
+            break
+        await asyncio.sleep(pause)
+    
+    after = None
+    while True:
+        count, after = await retention.delete_orphaned_groups(now, batch_size, after)
+        on_batch("error_groups", count)
+        if after is None:
+            break
+        await asyncio.sleep(pause)
+
+@activity.defn
+async def sweep_retention_activity() -> Dict[str, int]:
+    """Delete raw errors, events and groups past their project's retention."""
+    deleted_counter = activity.metric_meter().create_counter(
+        "retention_deleted", "Rows or partitions deleted by the retention sweep, by stage"
+    )
+    deleted: Dict[str, int] = {}
+    
+    def on_batch(stage: str, count: int):
+        deleted[stage] = deleted.get(stage, 0) + count
+        deleted_counter.add(count, {"stage": stage})
+        activity.heartbeat(deleted)
+    
+    session = async_session()
+    try:
+        await sweep_retention(session, datetime.now(timezone.utc), on_batch)
+        return deleted
+    finally:
+        await session.close()
+
+@workflow.defn
+class RetentionSweepWorkflow:
+    @workflow.run
+    async def run(self) -> Dict[str, int]:
+        return await workflow.execute_activity(
+            sweep_retention_activity,
+            start_to_close_timeout=timedelta(hours=2),
+            heartbeat_timeout=timedelta(minutes=5)
+        )
+
+@activity.defn
+async def redrive_workflow_starts_activity() -> Dict[str, int]:
+    """Start the processing workflows the API saved when it could not start them."""
+    client = activity.client()
+    batch_size = settings.workflow_start_redrive_batch_size
+    counts = {"started": 0, "failed": 0}
+    
+    session = async_session()
+    try:
+        repo = PendingWorkflowStartRepository(session=session)
+        while True:
+            pending = await repo.claim(batch_size)
+            started_ids = []
+            failed = 0
+            for start in pending:
+                try:
+                    await client.start_workflow(
+                        start.workflow,
+                        start.arg,
+                        id=start.workflow_id,
+                        task_queue=start.task_queue,
+                        start_signal=start.start_signal,
+                        start_signal_args=start.start_signal_args or [],
+                    )
+                except WorkflowAlreadyStartedError:
+                    # An earlier attempt reached the server after all
+                    pass
+                except Exception as e:
+                    await repo.record_failure(start.id, repr(e), datetime.now(timezone.utc))
+                    failed += 1
+                    continue
+                started_ids.append(start.id)
+            await repo.delete(started_ids)
+            await session.commit()
+            counts["started"] += len(started_ids)
+            counts["failed"] += failed
+            activity.heartbeat(counts)
+            # Failed starts are left for the next run
+            if len(pending) < batch_size or failed:
+                break
+        return counts
+    finally:
+        await session.close()
+
+@workflow.defn
+class WorkflowStartRedriveWorkflow:
+    @workflow.run
+    async def run(self) -> Dict[str, int]:
+        return await workflow.execute_activity(
+            redrive_workflow_starts_activity,
+            start_to_close_timeout=timedelta(minutes=10),
+            heartbeat_timeout=timedelta(minutes=2)
+        )